@@ -0,0 +1,23 @@
+# إعداد gunicorn للإنتاج: يُحمَّل التطبيق مرة في العملية الأم (preload) ثم يُنسخ بـ fork
+# إلى العمليات العاملة، فلا تدفع كل عملية ثمن الاستيراد من جديد.
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+# يُقرأ عند إنشاء التطبيق لتقسيم الأنوية على مجمعات تشفير كلمات المرور
+os.environ['WEB_CONCURRENCY'] = str(workers)
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+preload_app = True
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+keepalive = 5
+# إعادة تدوير العمليات العاملة تدريجياً للحد من تراكم الذاكرة
+max_requests = 2000
+max_requests_jitter = 200
+accesslog = '-'
+
+
+def post_fork(server, worker):
+    from src.main import start_worker
+    start_worker(worker.app.wsgi())
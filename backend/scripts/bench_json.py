@@ -0,0 +1,107 @@
+"""مقارنة زمن تسلسل قوائم كبيرة بين مزوّد JSON الافتراضي في Flask و FastJSONProvider.
+
+الاستخدام (من مجلد backend):
+    python scripts/bench_json.py --rows 10000 --repeat 5
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask.json.provider import DefaultJSONProvider
+from src.main import create_app
+from src.models.user import User
+from src.models.place import Place
+from src.models.advertisement import Advertisement
+from src.utils import json_provider
+from src.utils.json_provider import FastJSONProvider
+from src.utils.fields import place_fields, advertisement_fields
+
+app = create_app()
+
+
+def make_data(rows):
+    now = datetime(2025, 1, 1)
+    owner = User(id=1, username='owner', email='owner@example.com')
+    places, ads, place_rows, ad_rows = [], [], [], []
+    place_names = tuple(place_fields().fields)
+    ad_names = tuple(advertisement_fields().fields)
+    for i in range(rows):
+        place = Place(
+            id=i, name=f'مكان {i}', description='وصف طويل للمكان ' * 10, address='شارع الملك فهد',
+            phone='0500000000', website='https://example.com', category='restaurant', user_id=1,
+            status='approved', is_featured=i % 10 == 0, image_url='https://example.com/image.jpg',
+            latitude=24.7, longitude=46.7, created_at=now + timedelta(minutes=i), updated_at=now
+        )
+        place.owner = owner
+        places.append(place)
+        place_rows.append(tuple(
+            owner.username if name == 'owner' else getattr(place, name) for name in place_names
+        ))
+
+        ad = Advertisement(
+            id=i, user_id=1, place_id=i, title=f'إعلان {i}', content='محتوى الإعلان ' * 5,
+            image_url='https://example.com/ad.jpg', start_date=now, end_date=now + timedelta(days=30),
+            is_active=True, created_at=now, updated_at=now
+        )
+        ad.place = place
+        ad.user = owner
+        ads.append(ad)
+        ad_rows.append(tuple(
+            place.name if name == 'place_name' else owner.username if name == 'user_name' else getattr(ad, name)
+            for name in ad_names
+        ))
+    return places, ads, (place_names, place_rows), (ad_names, ad_rows)
+
+
+def best_of(repeat, func):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--no-orjson', action='store_true', help='قياس مسار json القياسية الاحتياطي')
+    args = parser.parse_args()
+
+    if args.no_orjson:
+        json_provider.orjson = None
+
+    places, ads, (place_names, place_rows), (ad_names, ad_rows) = make_data(args.rows)
+    default_provider = DefaultJSONProvider(app)
+    fast_provider = FastJSONProvider(app)
+
+    print(f'orjson: {"yes" if json_provider.orjson is not None else "no (stdlib fallback)"}; rows: {args.rows}')
+    print(f'{"payload":<10} {"path":<40} {"ms":>8}')
+
+    with app.test_request_context():
+        for label, objects, names, rows, spec in (
+            ('places', places, place_names, place_rows, place_fields()),
+            ('ads', ads, ad_names, ad_rows, advertisement_fields()),
+        ):
+            cases = [
+                ('to_dict + DefaultJSONProvider (current)',
+                 lambda: default_provider.response([obj.to_dict() for obj in objects]).get_data()),
+                ('to_dict + FastJSONProvider',
+                 lambda: fast_provider.response([obj.to_dict() for obj in objects]).get_data()),
+            ]
+            app.json = fast_provider
+            serialize = spec.serializer(names)
+            cases.append(('projected rows + FastJSONProvider',
+                          lambda: fast_provider.response([serialize(row) for row in rows]).get_data()))
+
+            for name, func in cases:
+                print(f'{label:<10} {name:<40} {best_of(args.repeat, func) * 1000:>8.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""قياس معدل تسجيل الدخول لكل إعداد من خوارزميات التشفير وأحجام مجمع العمليات.
+
+الاستخدام (من مجلد backend):
+    python scripts/bench_password_hashing.py --threads 8 --duration 5
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+METHODS = [
+    'pbkdf2:sha256:600000',
+    'pbkdf2:sha256:200000',
+    'scrypt:32768:8:1',
+    'scrypt:16384:8:1',
+]
+
+USERNAME = 'bench_login_user'
+PASSWORD = 'bench-password'
+
+
+def run_logins(app, threads, duration):
+    counts = [0] * threads
+    deadline = time.perf_counter() + duration
+
+    def worker(index):
+        client = app.test_client()
+        while time.perf_counter() < deadline:
+            response = client.post('/api/auth/login', json={'username': USERNAME, 'password': PASSWORD})
+            assert response.status_code == 200, response.get_data(as_text=True)
+            counts[index] += 1
+
+    pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    started = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return sum(counts) / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=5.0)
+    parser.add_argument('--workers', type=int, nargs='+', default=[0, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    # قاعدة بيانات مؤقتة لكل تشغيل حتى لا يُكتب مستخدم القياس في قاعدة التطبيق
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+
+        from src.main import create_app, db
+        from src.models.user import User
+        from src.utils.passwords import password_hasher
+        from src.utils.commands import init_database
+
+        app = create_app()
+        with app.app_context():
+            init_database(app)
+
+        print(f'{"method":<24} {"workers":>7} {"logins/s":>10}')
+        for method in METHODS:
+            for workers in args.workers:
+                password_hasher.shutdown()
+                password_hasher.method = method
+                password_hasher.workers = workers
+                password_hasher._method_prefix = None
+
+                with app.app_context():
+                    user = User.query.filter_by(username=USERNAME).first()
+                    if user is None:
+                        user = User(username=USERNAME, email=f'{USERNAME}@example.com')
+                        db.session.add(user)
+                    user.set_password(PASSWORD)
+                    db.session.commit()
+
+                rate = run_logins(app, args.threads, args.duration)
+                print(f'{method:<24} {workers:>7} {rate:>10.1f}')
+
+        password_hasher.shutdown()
+        with app.app_context():
+            db.engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""قياس زمن الاستيراد والإقلاع البارد لعملية عاملة واحدة.
+
+يقارن في عمليات Python جديدة بين:
+  - legacy: الاستيراد ثم create_all والترقية والفهارس وبذر المسؤول عند كل إقلاع (السلوك السابق)
+  - factory: الاستيراد ثم create_app فقط؛ المخطط والبذر يتمّان مرة واحدة بـ flask init-db / seed-admin
+ويقيس أيضاً زمن أول طلب بعد الإقلاع.
+
+الاستخدام (من مجلد backend):
+    python scripts/bench_startup.py --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = '''
+import json, sys, time
+started = time.perf_counter()
+sys.path.insert(0, {backend!r})
+from src.main import create_app
+imported = time.perf_counter()
+app = create_app()
+if {legacy!r}:
+    from src.utils.commands import init_database, seed_admin
+    with app.app_context():
+        init_database(app)
+        seed_admin()
+booted = time.perf_counter()
+response = app.test_client().get('/api/packages/')
+assert response.status_code == 200, response.status_code
+first = time.perf_counter()
+print(json.dumps({{
+    'import_ms': (imported - started) * 1000,
+    'boot_ms': (booted - imported) * 1000,
+    'first_request_ms': (first - booted) * 1000,
+    'ready_ms': (booted - started) * 1000,
+}}))
+'''
+
+
+def run_probe(legacy, env):
+    code = PROBE.format(backend=BACKEND_DIR, legacy=legacy)
+    output = subprocess.run([sys.executable, '-c', code], env=env, capture_output=True, text=True, check=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def summarize(samples):
+    return {key: round(statistics.median(sample[key] for sample in samples), 1) for key in samples[0]}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, DATABASE_URL=f"sqlite:///{os.path.join(tmp, 'bench.db')}", PASSWORD_HASH_WORKERS='0')
+        # قاعدة مهيأة مسبقاً كما في النشر: الفرق المقاس هو عمل الإقلاع المتكرر فقط
+        run_probe(True, env)
+        results = {}
+        for name, legacy in (('legacy', True), ('factory', False)):
+            results[name] = summarize([run_probe(legacy, env) for _ in range(args.runs)])
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
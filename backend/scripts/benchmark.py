@@ -0,0 +1,322 @@
+"""مجموعة قياس أداء قابلة للتكرار لنقاط النهاية في جميع المخططات.
+
+تنشئ قاعدة مؤقتة وتملؤها ببيانات تجريبية (generate_synthetic_data) ثم تقيس:
+  - client: كل نقطة نهاية عبر Flask test client بشكل متسلسل (زمن الاستجابة وعدد استعلامات SQL)
+  - http: حمل متوازٍ عبر HTTP على خادم werkzeug متعدد الخيوط لمزيج من نقاط القراءة العامة
+وتحفظ النتائج بصيغة JSON لمقارنتها بتشغيل سابق عبر --baseline.
+
+الاستخدام (من مجلد backend):
+    python scripts/benchmark.py --places 20000 --output bench.json
+    python scripts/benchmark.py --places 20000 --baseline bench.json
+"""
+import argparse
+import http.client
+import json
+import logging
+import os
+import platform
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from urllib.parse import quote
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+# (الاسم، الطريقة، المسار، دور الجلسة، جسم الطلب)؛ {place_id} يُستبدل بمكان معتمد عشوائي
+ENDPOINTS = [
+    ('places.list', 'GET', '/api/places/', None, None),
+    ('places.list_category', 'GET', '/api/places/?category=restaurant', None, None),
+    ('places.list_featured', 'GET', '/api/places/?featured=true', None, None),
+    ('places.list_fields', 'GET', '/api/places/?fields=id,name,category', None, None),
+    ('places.list_all', 'GET', '/api/places/?all=true&category=hotel', None, None),
+    ('places.search', 'GET', '/api/places/search?q=مطعم الأمل', None, None),
+    ('places.nearby', 'GET', '/api/places/nearby?lat=24.7136&lng=46.6753&radius=5', None, None),
+    ('places.detail', 'GET', '/api/places/{place_id}', None, None),
+    ('places.categories', 'GET', '/api/places/categories', None, None),
+    ('places.pending', 'GET', '/api/places/pending', 'admin', None),
+    ('places.export', 'GET', '/api/places/export?status=approved', 'admin', None),
+    ('places.create', 'POST', '/api/places/', 'admin', {'name': 'مكان القياس', 'category': 'restaurant'}),
+    ('places.update', 'PUT', '/api/places/{place_id}', 'admin', {'description': 'وصف محدث'}),
+    ('packages.list', 'GET', '/api/packages/', None, None),
+    ('packages.my_subscriptions', 'GET', '/api/packages/my-subscriptions', 'admin', None),
+    ('packages.check_subscription', 'GET', '/api/packages/check-subscription', 'admin', None),
+    ('advertisements.list', 'GET', '/api/advertisements/', None, None),
+    ('advertisements.my_ads', 'GET', '/api/advertisements/my-ads', 'admin', None),
+    ('sync.initial', 'GET', '/api/sync/?limit=100', None, None),
+    ('batch.home', 'GET', '/api/batch/?path=/api/places/%3Fstatus%3Dapproved&path=/api/advertisements/', None, None),
+    ('users.list', 'GET', '/api/users', 'admin', None),
+    ('users.detail', 'GET', '/api/users/1', 'admin', None),
+    ('auth.me', 'GET', '/api/auth/me', 'admin', None),
+    ('auth.login', 'POST', '/api/auth/login', None, {'username': 'admin', 'password': 'admin123'}),
+]
+
+# مزيج الحمل عبر HTTP: (الاسم، الوزن) من نقاط القراءة العامة
+HTTP_MIX = [
+    ('places.list', 30),
+    ('places.list_category', 15),
+    ('places.detail', 20),
+    ('places.search', 10),
+    ('places.nearby', 10),
+    ('advertisements.list', 10),
+    ('packages.list', 5),
+]
+
+
+class QueryCounter:
+    """عدّ استعلامات SQL لكل خيط عبر before_cursor_execute."""
+
+    def __init__(self):
+        self._local = threading.local()
+        self.total = 0
+        self._lock = threading.Lock()
+
+    def install(self, engines):
+        from sqlalchemy import event
+        for engine in engines:
+            event.listen(engine, 'before_cursor_execute', self._on_execute)
+
+    def _on_execute(self, *args):
+        self._local.count = getattr(self._local, 'count', 0) + 1
+        with self._lock:
+            self.total += 1
+
+    def take(self):
+        count = getattr(self._local, 'count', 0)
+        self._local.count = 0
+        return count
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarize(latencies_ms, elapsed, queries=None, errors=0):
+    values = sorted(latencies_ms)
+    summary = {
+        'requests': len(values),
+        'errors': errors,
+        'p50_ms': round(percentile(values, 0.50), 3) if values else None,
+        'p95_ms': round(percentile(values, 0.95), 3) if values else None,
+        'p99_ms': round(percentile(values, 0.99), 3) if values else None,
+        'max_ms': round(values[-1], 3) if values else None,
+        'throughput_rps': round(len(values) / elapsed, 1) if elapsed else None,
+    }
+    if queries is not None:
+        summary['queries_per_request'] = round(sum(queries) / len(queries), 2) if queries else 0
+        summary['max_queries'] = max(queries) if queries else 0
+    return summary
+
+
+def resolve(path, place_ids, rng):
+    return path.format(place_id=rng.choice(place_ids))
+
+
+def run_client(app, counter, place_ids, iterations, warmup, rng):
+    clients = {None: app.test_client(), 'admin': app.test_client()}
+    with clients['admin'].session_transaction() as session:
+        session['user_id'] = 1
+        session['user_role'] = 'admin'
+
+    results = {}
+    for name, method, path, role, body in ENDPOINTS:
+        client = clients[role]
+        # تسجيل الدخول بطيء عمداً (scrypt)؛ عدد أقل من التكرارات يكفي
+        count = max(1, iterations // 10) if name == 'auth.login' else iterations
+        latencies, queries, errors = [], [], 0
+        started = time.perf_counter()
+        for i in range(warmup + count):
+            url = resolve(path, place_ids, rng)
+            counter.take()
+            begin = time.perf_counter()
+            response = client.open(url, method=method, json=body)
+            response.get_data()
+            took = (time.perf_counter() - begin) * 1000
+            executed = counter.take()
+            if i == warmup:
+                started = begin
+            if i < warmup:
+                continue
+            latencies.append(took)
+            queries.append(executed)
+            if response.status_code >= 400:
+                errors += 1
+        results[name] = summarize(latencies, time.perf_counter() - started, queries, errors)
+        print(f"{name:<30} p50 {results[name]['p50_ms']:>8.2f} ms  p95 {results[name]['p95_ms']:>8.2f} ms  "
+              f"{results[name]['queries_per_request']:>5} q/req", file=sys.stderr)
+    return results
+
+
+def run_http(app, counter, place_ids, threads, duration, seed):
+    from werkzeug.serving import make_server
+
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+    server_thread.start()
+    port = server.server_port
+
+    paths = {name: path for name, _, path, _, _ in ENDPOINTS}
+    names, weights = zip(*HTTP_MIX)
+    samples = {name: [] for name in names}
+    errors = {name: 0 for name in names}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker(index):
+        rng = random.Random(seed + index)
+        connection = http.client.HTTPConnection('127.0.0.1', port)
+        local = {name: [] for name in names}
+        failed = {name: 0 for name in names}
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, weights)[0]
+            url = quote(resolve(paths[name], place_ids, rng), safe='/?=&,.%')
+            begin = time.perf_counter()
+            try:
+                connection.request('GET', url, headers={'Accept-Encoding': 'gzip'})
+                response = connection.getresponse()
+                response.read()
+                status = response.status
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                connection = http.client.HTTPConnection('127.0.0.1', port)
+                status = 599
+            local[name].append((time.perf_counter() - begin) * 1000)
+            if status >= 400:
+                failed[name] += 1
+        connection.close()
+        with lock:
+            for name in names:
+                samples[name].extend(local[name])
+                errors[name] += failed[name]
+
+    queries_before = counter.total
+    started = time.perf_counter()
+    pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    server.shutdown()
+
+    everything = [value for values in samples.values() for value in values]
+    overall = summarize(everything, elapsed, errors=sum(errors.values()))
+    overall['queries_per_request'] = round((counter.total - queries_before) / len(everything), 2) if everything else 0
+    return {
+        'threads': threads,
+        'duration_s': round(elapsed, 2),
+        'overall': overall,
+        'endpoints': {name: summarize(samples[name], elapsed, errors=errors[name]) for name in names},
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BACKEND_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current, baseline):
+    print(f"\n{'endpoint':<30} {'p50 base':>10} {'p50 now':>10} {'change':>8}   {'p95 base':>10} {'p95 now':>10} {'change':>8}")
+    for name, stats in current['client'].items():
+        before = baseline.get('client', {}).get(name)
+        if not before:
+            continue
+        row = [name]
+        for key in ('p50_ms', 'p95_ms'):
+            change = (stats[key] - before[key]) / before[key] * 100 if before[key] else 0
+            row += [before[key], stats[key], f'{change:+.0f}%']
+        print('{:<30} {:>10.2f} {:>10.2f} {:>8}   {:>10.2f} {:>10.2f} {:>8}'.format(*row))
+    before = baseline.get('http', {}).get('overall', {}).get('throughput_rps')
+    now = current.get('http', {}).get('overall', {}).get('throughput_rps')
+    if before and now:
+        print(f'\nHTTP throughput: {before} -> {now} req/s ({(now - before) / before * 100:+.0f}%)')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--places', type=int, default=5000)
+    parser.add_argument('--advertisements', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--iterations', type=int, default=200, help='عدد الطلبات لكل نقطة نهاية في مرحلة client')
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--threads', type=int, default=8, help='عدد خيوط مولّد الحمل عبر HTTP')
+    parser.add_argument('--duration', type=float, default=10.0, help='مدة مرحلة HTTP بالثواني؛ 0 لتخطيها')
+    parser.add_argument('--no-cache', action='store_true', help='تعطيل ذاكرة الاستجابات المؤقتة')
+    parser.add_argument('--output', help='ملف JSON لحفظ النتائج')
+    parser.add_argument('--baseline', help='ملف JSON من تشغيل سابق للمقارنة')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tmp, 'benchmark.db')}"
+        os.environ.setdefault('PASSWORD_HASH_WORKERS', '0')
+        if args.no_cache:
+            os.environ['RESPONSE_CACHE_ENABLED'] = 'false'
+
+        from src.main import create_app, db
+        from src.models.place import Place
+        from src.utils.commands import init_database, seed_admin
+        from src.utils.database import analyze_database
+        from src.utils.synthetic import generate_synthetic_data
+
+        app = create_app()
+        app.logger.disabled = True
+        with app.app_context():
+            init_database(app)
+            seed_admin()
+            started = time.perf_counter()
+            counts = generate_synthetic_data(users=args.users, places=args.places,
+                                             advertisements=args.advertisements, seed=args.seed)
+            analyze_database(db)
+            seeded = time.perf_counter() - started
+            place_ids = [row.id for row in db.session.query(Place.id).filter(Place.status == 'approved')]
+            counter = QueryCounter()
+            counter.install(db.engines.values())
+
+        rng = random.Random(args.seed)
+        print(f'Seeded {counts} in {seeded:.1f}s', file=sys.stderr)
+        results = {
+            'meta': {
+                'timestamp': datetime.utcnow().isoformat(timespec='seconds'),
+                'git_revision': git_revision(),
+                'python': platform.python_version(),
+                'sqlite': sqlite3.sqlite_version,
+                'cpu_count': os.cpu_count(),
+                'response_cache': not args.no_cache,
+                'args': vars(args),
+                'rows': counts,
+                'seed_seconds': round(seeded, 2),
+            },
+            'client': run_client(app, counter, place_ids, args.iterations, args.warmup, rng),
+        }
+        if args.duration > 0:
+            results['http'] = run_http(app, counter, place_ids, args.threads, args.duration, args.seed)
+            overall = results['http']['overall']
+            print(f"HTTP {args.threads} threads: {overall['throughput_rps']} req/s, p50 {overall['p50_ms']} ms, "
+                  f"p95 {overall['p95_ms']} ms, p99 {overall['p99_ms']} ms", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            json.dump(results, output, ensure_ascii=False, indent=2)
+    else:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as baseline:
+            compare(results, json.load(baseline))
+
+
+if __name__ == '__main__':
+    main()
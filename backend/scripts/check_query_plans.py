@@ -0,0 +1,93 @@
+"""تشغيل EXPLAIN QUERY PLAN على استعلامات نقاط القوائم والتأكد من عدم وجود مسح كامل للجداول.
+
+الاستخدام (من مجلد backend):
+    python scripts/check_query_plans.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event
+from src.main import create_app, db
+from src.utils.commands import init_database, seed_admin
+from src.utils.pagination import encode_cursor
+from src.utils.sync import EPOCH, FEEDS
+
+app = create_app()
+with app.app_context():
+    init_database(app)
+    seed_admin()
+
+# نقاط النهاية المراد فحصها مع دور المستخدم في الجلسة
+ENDPOINTS = [
+    ('/api/places/', None),
+    ('/api/places/?all=true', None),
+    ('/api/places/?category=restaurant', None),
+    ('/api/places/?featured=true', None),
+    ('/api/places/?sort=trending', None),
+    ('/api/places/pending', 'admin'),
+    ('/api/places/my-places', 'premium'),
+    ('/api/places/my-places?status=approved', 'premium'),
+    ('/api/advertisements/', None),
+    ('/api/advertisements/my-ads', 'premium'),
+    ('/api/packages/my-subscriptions', 'premium'),
+    ('/api/packages/check-subscription', 'premium'),
+    ('/api/sync/', None),
+    # مزامنة تزايدية من البداية: تشمل سجلات الحذف والإعلانات المنتهية
+    ('/api/sync/?since=' + encode_cursor([EPOCH, 0] * len(FEEDS) + [False]), None),
+]
+
+
+def capture_statements(client, url, role):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            statements.append((statement, parameters))
+
+    with client.session_transaction() as session:
+        session.clear()
+        if role:
+            session['user_id'] = 1
+            session['user_role'] = role
+
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        client.get(url)
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+    return statements
+
+
+def full_scans(plan_rows):
+    # "SCAN table" بدون فهرس يعني قراءة الجدول كاملاً؛ SCAN CONSTANT ROW هو SELECT بلا FROM
+    return [
+        detail for detail in (row[-1] for row in plan_rows)
+        if detail.startswith('SCAN') and 'INDEX' not in detail and detail != 'SCAN CONSTANT ROW'
+    ]
+
+
+def main():
+    client = app.test_client()
+    failures = 0
+
+    with app.app_context():
+        for url, role in ENDPOINTS:
+            for statement, parameters in capture_statements(client, url, role):
+                with db.engine.connect() as conn:
+                    plan = conn.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters).fetchall()
+                scans = full_scans(plan)
+                status = 'FAIL' if scans else 'OK'
+                failures += bool(scans)
+                print(f'[{status}] {url}')
+                for row in plan:
+                    print(f'    {row[-1]}')
+
+    if failures:
+        print(f'{failures} statement(s) scan a full table')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
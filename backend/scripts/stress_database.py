@@ -0,0 +1,127 @@
+"""اختبار ضغط للقراءة والكتابة المتزامنة على SQLite عبر عدة عمليات وخيوط.
+
+يشغّل نفس الحمل مرتين: بدون ضبط المحرك (SQLITE_TUNING=false) ثم بالإعداد الحالي،
+ويعدّ أخطاء "database is locked" في كل مرة.
+
+الاستخدام (من مجلد backend):
+    python scripts/stress_database.py --processes 4 --threads 4 --duration 10
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_app(env):
+    os.environ.update(env)
+    sys.path.insert(0, BACKEND_DIR)
+    from src.main import create_app
+    return create_app()
+
+
+def worker(env, threads, duration, queue):
+    app = load_app(env)
+    results = {'requests': 0, 'locked': 0, 'other_errors': 0}
+    lock = threading.Lock()
+    deadline = time.time() + duration
+
+    def run():
+        client = app.test_client()
+        with client.session_transaction() as session:
+            session['user_id'] = 1
+            session['user_role'] = 'admin'
+        rng = random.Random()
+        while time.time() < deadline:
+            roll = rng.random()
+            if roll < 0.5:
+                response = client.get('/api/places/?all=true&status=pending')
+            elif roll < 0.75:
+                response = client.post('/api/places/', json={
+                    'name': f'stress {rng.random()}', 'category': 'restaurant', 'description': 'x' * 200
+                })
+            else:
+                response = client.put(f'/api/places/{rng.randint(1, 50)}', json={'description': f'y {rng.random()}'})
+            body = response.get_data(as_text=True)
+            with lock:
+                results['requests'] += 1
+                if response.status_code >= 500:
+                    if 'locked' in body:
+                        results['locked'] += 1
+                    else:
+                        results['other_errors'] += 1
+
+    pool = [threading.Thread(target=run) for _ in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    queue.put(results)
+
+
+def run_profile(name, env, processes, threads, duration):
+    # تهيئة قاعدة البيانات وبذرها في عملية منفصلة قبل بدء الحمل
+    ctx = multiprocessing.get_context('spawn')
+    seed = ctx.Process(target=seed_database, args=(env,))
+    seed.start()
+    seed.join()
+
+    queue = ctx.Queue()
+    pool = [ctx.Process(target=worker, args=(env, threads, duration, queue)) for _ in range(processes)]
+    for process in pool:
+        process.start()
+    totals = {'requests': 0, 'locked': 0, 'other_errors': 0}
+    for _ in pool:
+        for key, value in queue.get().items():
+            totals[key] += value
+    for process in pool:
+        process.join()
+
+    totals['profile'] = name
+    totals['requests_per_second'] = round(totals['requests'] / duration, 1)
+    return totals
+
+
+def seed_database(env):
+    # الاستيراد بعد load_app التي تضيف مجلد backend إلى sys.path في العملية الجديدة
+    app = load_app(env)
+    from src.utils.commands import init_database, seed_admin
+    with app.app_context():
+        init_database(app)
+        seed_admin()
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['user_id'] = 1
+        session['user_role'] = 'admin'
+    for i in range(50):
+        client.post('/api/places/', json={'name': f'seed {i}', 'category': 'restaurant'})
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--processes', type=int, default=4)
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--duration', type=float, default=10)
+    args = parser.parse_args()
+
+    base_env = {
+        'RESPONSE_CACHE_ENABLED': 'false',
+        'PASSWORD_HASH_WORKERS': '0',
+    }
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, tuning in (('untuned', 'false'), ('tuned', 'true')):
+            env = dict(base_env, SQLITE_TUNING=tuning, DATABASE_URL=f"sqlite:///{os.path.join(tmp, name + '.db')}")
+            results.append(run_profile(name, env, args.processes, args.threads, args.duration))
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,37 @@
+"""نسخ قاعدة SQLite الرئيسية إلى النسخ المتماثلة المعرّفة في DATABASE_REPLICA_URLS.
+
+خطوة التكرار المحلية لتجربة توجيه القراءات؛ في الإنتاج يتولاها خادم قاعدة البيانات.
+
+الاستخدام (من مجلد backend):
+    DATABASE_REPLICA_URLS=sqlite:////tmp/replica.db python scripts/sync_replicas.py --interval 5
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.main import create_app, db
+from src.utils.database import sync_replicas
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--interval', type=float, default=0,
+                        help='إعادة النسخ كل N ثانية؛ 0 للنسخ مرة واحدة')
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        while True:
+            started = time.perf_counter()
+            synced = sync_replicas(app, db)
+            print(f"synced {', '.join(synced) or 'nothing'} in {time.perf_counter() - started:.3f}s")
+            if not args.interval:
+                break
+            time.sleep(args.interval)
+
+
+if __name__ == '__main__':
+    main()
@@ -3,64 +3,115 @@ import sys
 # DON'T CHANGE THIS !!!
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-from flask import Flask, send_from_directory
+from flask import Flask
 from flask_cors import CORS
 from src.models.user import db
+from src.utils.cache import response_cache
+from src.utils.http import compress
+from src.utils.static import static_manifest
+from src.utils.metrics import metrics
+from src.utils.subscriptions import subscription_sweeper
+from src.utils.trending import place_views
+from src.utils.ad_stats import ad_events
+from src.utils.batch import batch_executor
+from src.utils.passwords import password_hasher
+from src.utils.json_provider import init_json_provider
+from src.utils.database import configure_database, install_engine_events
+from src.utils.commands import register_commands, init_database, seed_admin
 from src.models.place import Place
 from src.models.package import Package, UserSubscription
 from src.models.advertisement import Advertisement
+from src.models.tombstone import Tombstone
 from src.routes.user import user_bp
 from src.routes.auth import auth_bp
 from src.routes.place import place_bp
 from src.routes.package import package_bp
 from src.routes.advertisement import advertisement_bp
+from src.routes.batch import batch_bp
+from src.routes.sync import sync_bp
 
-app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
-app.config['SECRET_KEY'] = 'asdf#FGSgvasgf$5$WGT'
 
-# تمكين CORS للسماح بالطلبات من الواجهة الأمامية
-CORS(app)
+def create_app(config=None):
+    """إنشاء التطبيق دون أي اتصال بقاعدة البيانات.
 
-# تسجيل المسارات
-app.register_blueprint(user_bp, url_prefix='/api')
-app.register_blueprint(auth_bp, url_prefix='/api/auth')
-app.register_blueprint(place_bp, url_prefix='/api/places')
-app.register_blueprint(package_bp, url_prefix='/api/packages')
-app.register_blueprint(advertisement_bp, url_prefix='/api/advertisements')
+    إنشاء الجداول وبذر المسؤول يتمّان بأوامر منفصلة (flask init-db / flask seed-admin)
+    مرة واحدة قبل تشغيل العمليات العاملة.
+    """
+    app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
+    app.config['SECRET_KEY'] = 'asdf#FGSgvasgf$5$WGT'
+    if config:
+        app.config.update(config)
+    init_json_provider(app)
 
-# إعداد قاعدة البيانات
-app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(os.path.dirname(__file__), 'database', 'app.db')}"
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-db.init_app(app)
+    # تمكين CORS للسماح بالطلبات من الواجهة الأمامية
+    CORS(app)
 
-with app.app_context():
-    db.create_all()
-    
-    # إنشاء مستخدم مسؤول افتراضي
-    from src.models.user import User
-    admin = User.query.filter_by(username='admin').first()
-    if not admin:
-        admin = User(username='admin', email='admin@tourism.com', role='admin')
-        admin.set_password('admin123')
-        db.session.add(admin)
-        db.session.commit()
+    # تسجيل المسارات
+    app.register_blueprint(user_bp, url_prefix='/api')
+    app.register_blueprint(auth_bp, url_prefix='/api/auth')
+    app.register_blueprint(place_bp, url_prefix='/api/places')
+    app.register_blueprint(package_bp, url_prefix='/api/packages')
+    app.register_blueprint(advertisement_bp, url_prefix='/api/advertisements')
+    app.register_blueprint(batch_bp, url_prefix='/api/batch')
+    app.register_blueprint(sync_bp, url_prefix='/api/sync')
 
-@app.route('/', defaults={'path': ''})
-@app.route('/<path:path>')
-def serve(path):
-    static_folder_path = app.static_folder
-    if static_folder_path is None:
-            return "Static folder not configured", 404
+    # إعداد قاعدة البيانات (DATABASE_URL أو ملف SQLite المحلي افتراضياً)
+    configure_database(app, os.path.join(os.path.dirname(__file__), 'database', 'app.db'))
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    metrics.init_app(app)
+    response_cache.init_app(app)
+    compress.init_app(app)
+    subscription_sweeper.init_app(app)
+    place_views.init_app(app)
+    ad_events.init_app(app)
+    batch_executor.init_app(app)
+    password_hasher.init_app(app)
+    static_manifest.init_app(app)
+    register_commands(app)
 
-    if path != "" and os.path.exists(os.path.join(static_folder_path, path)):
-        return send_from_directory(static_folder_path, path)
-    else:
-        index_path = os.path.join(static_folder_path, 'index.html')
-        if os.path.exists(index_path):
-            return send_from_directory(static_folder_path, 'index.html')
-        else:
-            return "index.html not found", 404
+    # المحركات تُنشأ هنا دون فتح اتصالات، فيبقى التطبيق آمناً للتحميل المسبق قبل fork
+    with app.app_context():
+        for engine in db.engines.values():
+            install_engine_events(app, engine)
+            metrics.install(app, engine)
+
+    @app.route('/', defaults={'path': ''})
+    @app.route('/<path:path>')
+    def serve(path):
+        if app.static_folder is None:
+                return "Static folder not configured", 404
+
+        # البحث في الفهرس المبني عند الإقلاع؛ المسارات غير المعروفة روابط داخلية للتطبيق
+        asset = static_manifest.get(path) if path != "" else None
+        if asset is None:
+            asset = static_manifest.get('index.html')
+            if asset is None:
+                return "index.html not found", 404
+        return static_manifest.send(asset)
+
+    return app
+
+
+def start_worker(app):
+    """تهيئة عملية عاملة بعد fork: اتصالات جديدة وتشغيل المهام الخلفية."""
+    with app.app_context():
+        # لا تُشارك اتصالات المجمع الموروثة من العملية الأم
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+    # إلغاء الاشتراكات المنتهية دورياً وكتابة عدادات المشاهدة في الخلفية
+    subscription_sweeper.start()
+    place_views.start()
+    ad_events.start()
 
 
 if __name__ == '__main__':
+    # خادم التطوير: ينشئ الجداول ويبذر المسؤول ثم يعمل بعملية واحدة
+    app = create_app()
+    with app.app_context():
+        init_database(app)
+        seed_admin()
+    subscription_sweeper.start()
+    place_views.start()
+    ad_events.start()
     app.run(host='0.0.0.0', port=5000, debug=True)
@@ -1,5 +1,6 @@
 from src.models.user import db
 from datetime import datetime
+from src.utils.json_provider import datetime_encoder
 
 class Advertisement(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -14,6 +15,14 @@ class Advertisement(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # فهارس الإعلانات النشطة ضمن نافذة العرض وإعلانات المستخدم
+    __table_args__ = (
+        db.Index('ix_advertisement_active_window', 'is_active', 'end_date', 'start_date', 'created_at'),
+        db.Index('ix_advertisement_user_created', 'user_id', 'created_at'),
+        db.Index('ix_advertisement_place_id', 'place_id'),
+        db.Index('ix_advertisement_updated', 'updated_at', 'id'),
+    )
+
     # العلاقة مع الأماكن
     place = db.relationship('Place', backref='advertisements', lazy=True)
 
@@ -21,6 +30,7 @@ class Advertisement(db.Model):
         return f'<Advertisement {self.title}>'
 
     def to_dict(self):
+        iso = datetime_encoder()
         return {
             'id': self.id,
             'user_id': self.user_id,
@@ -28,12 +38,45 @@ class Advertisement(db.Model):
             'title': self.title,
             'content': self.content,
             'image_url': self.image_url,
-            'start_date': self.start_date.isoformat() if self.start_date else None,
-            'end_date': self.end_date.isoformat() if self.end_date else None,
+            'start_date': iso(self.start_date),
+            'end_date': iso(self.end_date),
             'is_active': self.is_active,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'created_at': iso(self.created_at),
+            'updated_at': iso(self.updated_at),
             'place_name': self.place.name if self.place else None,
             'user_name': self.user.username if self.user else None
         }
 
+
+
+class AdStatsHourly(db.Model):
+    """مرات الظهور والنقرات لكل إعلان في كل ساعة، تُكتب على دفعات من ذاكرة العملية."""
+
+    __tablename__ = 'ad_stats_hourly'
+
+    advertisement_id = db.Column(db.Integer, db.ForeignKey('advertisement.id'), primary_key=True)
+    hour = db.Column(db.DateTime, primary_key=True)
+    impressions = db.Column(db.Integer, nullable=False, default=0)
+    clicks = db.Column(db.Integer, nullable=False, default=0)
+
+    # حذف الساعات الأقدم من مدة الاحتفاظ دون مسح الجدول كاملاً
+    __table_args__ = (
+        db.Index('ix_ad_stats_hourly_hour', 'hour'),
+    )
+
+    def __repr__(self):
+        return f'<AdStatsHourly {self.advertisement_id} {self.hour}>'
+
+
+class AdStatsDaily(db.Model):
+    """تجميع يومي لمرات الظهور والنقرات يُحتفظ به دائماً؛ مصدر إجماليات الإعلان."""
+
+    __tablename__ = 'ad_stats_daily'
+
+    advertisement_id = db.Column(db.Integer, db.ForeignKey('advertisement.id'), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    impressions = db.Column(db.Integer, nullable=False, default=0)
+    clicks = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<AdStatsDaily {self.advertisement_id} {self.day}>'
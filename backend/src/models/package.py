@@ -1,5 +1,6 @@
 from src.models.user import db
 from datetime import datetime
+from src.utils.json_provider import datetime_encoder
 
 class Package(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -10,6 +11,11 @@ class Package(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # المزامنة التزايدية (/api/sync)
+    __table_args__ = (
+        db.Index('ix_package_updated', 'updated_at', 'id'),
+    )
+    
     # العلاقات
     subscriptions = db.relationship('UserSubscription', backref='package', lazy=True)
 
@@ -17,14 +23,15 @@ class Package(db.Model):
         return f'<Package {self.name}>'
 
     def to_dict(self):
+        iso = datetime_encoder()
         return {
             'id': self.id,
             'name': self.name,
             'description': self.description,
             'price': self.price,
             'duration': self.duration,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+            'created_at': iso(self.created_at),
+            'updated_at': iso(self.updated_at)
         }
 
 class UserSubscription(db.Model):
@@ -36,18 +43,26 @@ class UserSubscription(db.Model):
     is_active = db.Column(db.Boolean, default=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    # فهارس التحقق من الاشتراك النشط وقائمة اشتراكات المستخدم
+    __table_args__ = (
+        db.Index('ix_subscription_user_active_end', 'user_id', 'is_active', 'end_date'),
+        db.Index('ix_subscription_user_created', 'user_id', 'created_at'),
+        db.Index('ix_subscription_active_end', 'is_active', 'end_date'),
+    )
+
     def __repr__(self):
         return f'<UserSubscription {self.user_id}-{self.package_id}>'
 
     def to_dict(self):
+        iso = datetime_encoder()
         return {
             'id': self.id,
             'user_id': self.user_id,
             'package_id': self.package_id,
-            'start_date': self.start_date.isoformat() if self.start_date else None,
-            'end_date': self.end_date.isoformat() if self.end_date else None,
+            'start_date': iso(self.start_date),
+            'end_date': iso(self.end_date),
             'is_active': self.is_active,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'created_at': iso(self.created_at),
             'package_name': self.package.name if self.package else None
         }
 
@@ -1,5 +1,6 @@
 from src.models.user import db
 from datetime import datetime
+from src.utils.json_provider import datetime_encoder
 
 class Place(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -13,13 +14,30 @@ class Place(db.Model):
     status = db.Column(db.String(20), default='pending')  # pending, approved, rejected
     is_featured = db.Column(db.Boolean, default=False)  # للمستخدمين المدفوعين
     image_url = db.Column(db.String(300))
+    latitude = db.Column(db.Float)  # اختياري
+    longitude = db.Column(db.Float)  # اختياري
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # فهارس مطابقة لفلاتر وترتيب استعلامات القوائم
+    __table_args__ = (
+        db.Index('ix_place_status_featured_created', 'status', 'is_featured', 'created_at', 'id'),
+        db.Index('ix_place_status_category_featured_created', 'status', 'category', 'is_featured', 'created_at', 'id'),
+        db.Index('ix_place_status_created', 'status', 'created_at'),
+        db.Index('ix_place_user_id', 'user_id'),
+        db.Index('ix_place_user_created', 'user_id', 'created_at', 'id'),
+        # المزامنة التزايدية (/api/sync)
+        db.Index('ix_place_updated', 'updated_at', 'id'),
+    )
+
+    # عدادات المشاهدة تُحذف مع المكان
+    stats = db.relationship('PlaceStats', uselist=False, lazy=True, cascade='all, delete-orphan')
+
     def __repr__(self):
         return f'<Place {self.name}>'
 
     def to_dict(self):
+        iso = datetime_encoder()
         return {
             'id': self.id,
             'name': self.name,
@@ -32,8 +50,29 @@ class Place(db.Model):
             'status': self.status,
             'is_featured': self.is_featured,
             'image_url': self.image_url,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'latitude': self.latitude,
+            'longitude': self.longitude,
+            'created_at': iso(self.created_at),
+            'updated_at': iso(self.updated_at),
             'owner': self.owner.username if self.owner else None
         }
 
+
+
+class PlaceStats(db.Model):
+    """عدادات مشاهدة المكان ودرجة الرواج، تُكتب على دفعات من ذاكرة العملية (write-behind)."""
+
+    __tablename__ = 'place_stats'
+
+    place_id = db.Column(db.Integer, db.ForeignKey('place.id'), primary_key=True)
+    views = db.Column(db.Integer, nullable=False, default=0)
+    # log2 لمجموع المشاهدات المضاعفة بـ 2^(t / نصف العمر)؛ الترتيب به يساوي الترتيب بالدرجة المتناقصة مع الزمن
+    trending_score = db.Column(db.Float, nullable=False, default=0.0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_place_stats_trending', 'trending_score', 'place_id'),
+    )
+
+    def __repr__(self):
+        return f'<PlaceStats {self.place_id}>'
@@ -0,0 +1,22 @@
+from src.models.user import db
+from datetime import datetime
+
+class Tombstone(db.Model):
+    """سجل حذف كيان لتتمكن عملاء المزامنة التزايدية من إزالته من نسختها المحلية."""
+
+    id = db.Column(db.Integer, primary_key=True)
+    entity = db.Column(db.String(50), nullable=False)  # place, advertisement
+    entity_id = db.Column(db.Integer, nullable=False)
+    deleted_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_tombstone_deleted', 'deleted_at', 'id'),
+    )
+
+    def __repr__(self):
+        return f'<Tombstone {self.entity} {self.entity_id}>'
+
+    @classmethod
+    def record(cls, entity, entity_id):
+        # يُضاف إلى معاملة الحذف نفسها قبل commit
+        db.session.add(cls(entity=entity, entity_id=entity_id, deleted_at=datetime.utcnow()))
@@ -1,8 +1,11 @@
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
 from werkzeug.security import generate_password_hash, check_password_hash
+from src.utils.passwords import password_hasher
+from src.utils.database import RoutingSession
+from src.utils.json_provider import datetime_encoder
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -19,7 +22,7 @@ class User(db.Model):
     advertisements = db.relationship('Advertisement', backref='user', lazy=True)
 
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = generate_password_hash(password, password_hasher.method)
 
     def check_password(self, password):
         return check_password_hash(self.password_hash, password)
@@ -28,11 +31,12 @@ class User(db.Model):
         return f'<User {self.username}>'
 
     def to_dict(self):
+        iso = datetime_encoder()
         return {
             'id': self.id,
             'username': self.username,
             'email': self.email,
             'role': self.role,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+            'created_at': iso(self.created_at),
+            'updated_at': iso(self.updated_at)
         }
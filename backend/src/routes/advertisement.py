@@ -1,22 +1,68 @@
-from flask import Blueprint, request, jsonify, session
+from flask import Blueprint, request, jsonify, session, current_app
 from datetime import datetime, timedelta
+from sqlalchemy.orm import joinedload
 from src.models.user import db
 from src.models.advertisement import Advertisement
+from src.models.tombstone import Tombstone
+from src.utils.cache import response_cache
+from src.utils.http import matching_etag
+from src.utils.ad_index import active_ads
+from src.utils.ad_stats import EVENT_KINDS, ad_events, ad_totals, delete_ad_stats
+from src.utils.fields import advertisement_fields
 
 advertisement_bp = Blueprint('advertisement', __name__)
 
+# أقصى عدد إعلانات لكل نوع في إشارة واحدة
+MAX_EVENT_IDS = 50
+
 @advertisement_bp.route('/', methods=['GET'])
 def get_advertisements():
     try:
-        # عرض الإعلانات النشطة فقط
-        current_time = datetime.utcnow()
-        advertisements = Advertisement.query.filter(
-            Advertisement.is_active == True,
-            Advertisement.start_date <= current_time,
-            Advertisement.end_date >= current_time
-        ).order_by(Advertisement.created_at.desc()).all()
+        try:
+            fields = advertisement_fields().parse(request.args.get('fields'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        # الإعلانات النشطة تُقرأ من الفهرس في الذاكرة دون استعلام
+        body, etag = active_ads.payload(fields)
+        
+        matched = matching_etag(etag, None)
+        if matched:
+            response = current_app.response_class(status=304)
+            response.set_etag(matched)
+            return response
         
-        return jsonify([ad.to_dict() for ad in advertisements]), 200
+        response = current_app.response_class(body, mimetype='application/json')
+        response.set_etag(etag)
+        response.cache_control.no_cache = True
+        return response
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@advertisement_bp.route('/events', methods=['POST'])
+def record_advertisement_events():
+    try:
+        # تُرسل عبر navigator.sendBeacon فقد يصل الجسم بنوع text/plain
+        data = request.get_json(force=True, silent=True)
+        if not isinstance(data, dict):
+            return jsonify({'error': 'يجب إرسال كائن JSON'}), 400
+        
+        events = {}
+        for kind in EVENT_KINDS:
+            ids = data.get(kind) or []
+            if not isinstance(ids, list) or len(ids) > MAX_EVENT_IDS:
+                return jsonify({'error': f'{kind} يجب أن تكون قائمة بحد أقصى {MAX_EVENT_IDS} معرفاً'}), 400
+            events[kind] = ids
+        
+        if current_app.config['AD_STATS_ENABLED']:
+            for kind, ids in events.items():
+                for ad_id in ids:
+                    # تُحسب الأحداث للإعلانات المعروضة حالياً فقط
+                    if isinstance(ad_id, int) and active_ads.is_live(ad_id):
+                        ad_events.record(ad_id, kind)
+        
+        return '', 204
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -64,6 +110,8 @@ def create_advertisement():
         
         db.session.add(advertisement)
         db.session.commit()
+        response_cache.bump('advertisement')
+        active_ads.upsert(advertisement)
         
         return jsonify({
             'message': 'تم إنشاء الإعلان بنجاح',
@@ -80,8 +128,33 @@ def get_my_advertisements():
         if not user_id:
             return jsonify({'error': 'يجب تسجيل الدخول أولاً'}), 401
         
-        advertisements = Advertisement.query.filter_by(user_id=user_id).order_by(Advertisement.created_at.desc()).all()
-        return jsonify([ad.to_dict() for ad in advertisements]), 200
+        try:
+            fields = advertisement_fields().parse(request.args.get('fields'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        query = Advertisement.query.filter_by(user_id=user_id).order_by(Advertisement.created_at.desc())
+        if fields:
+            query = advertisement_fields().project(query, fields, extra=(Advertisement.id,))
+            serialize = advertisement_fields().serializer(fields)
+        else:
+            query = query.options(
+                joinedload(Advertisement.place),
+                joinedload(Advertisement.user)
+            )
+            serialize = Advertisement.to_dict
+        
+        advertisements = query.all()
+        # الإجماليات من التجميع اليومي دون قراءة الأحداث
+        totals = ad_totals([ad.id for ad in advertisements])
+        empty = {'impressions': 0, 'clicks': 0}
+        
+        items = []
+        for ad in advertisements:
+            item = serialize(ad)
+            item['stats'] = totals.get(ad.id, empty)
+            items.append(item)
+        return jsonify(items), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -121,6 +194,8 @@ def update_advertisement(ad_id):
                 return jsonify({'error': 'تنسيق تاريخ الانتهاء غير صحيح'}), 400
         
         db.session.commit()
+        response_cache.bump('advertisement')
+        active_ads.upsert(advertisement)
         
         return jsonify({
             'message': 'تم تحديث الإعلان بنجاح',
@@ -145,8 +220,12 @@ def delete_advertisement(ad_id):
         if advertisement.user_id != user_id and user_role != 'admin':
             return jsonify({'error': 'ليس لديك صلاحية لحذف هذا الإعلان'}), 403
         
+        delete_ad_stats(ad_id)
+        Tombstone.record('advertisement', ad_id)
         db.session.delete(advertisement)
         db.session.commit()
+        response_cache.bump('advertisement')
+        active_ads.remove(ad_id)
         
         return jsonify({'message': 'تم حذف الإعلان بنجاح'}), 200
         
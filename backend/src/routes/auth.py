@@ -1,5 +1,6 @@
 from flask import Blueprint, request, jsonify, session
 from src.models.user import User, db
+from src.utils.passwords import password_hasher
 
 auth_bp = Blueprint('auth', __name__)
 
@@ -12,6 +13,9 @@ def register():
         if not data or not data.get('username') or not data.get('email') or not data.get('password'):
             return jsonify({'error': 'جميع الحقول مطلوبة'}), 400
         
+        # التشفير بطيء عمداً فيتم قبل أول استعلام حتى لا يُحجز قفل الكتابة أثناءه
+        password_hash = password_hasher.hash(data['password'])
+        
         # التحقق من عدم وجود المستخدم مسبقاً
         if User.query.filter_by(username=data['username']).first():
             return jsonify({'error': 'اسم المستخدم موجود مسبقاً'}), 400
@@ -25,7 +29,7 @@ def register():
             email=data['email'],
             role=data.get('role', 'user')
         )
-        user.set_password(data['password'])
+        user.password_hash = password_hash
         
         db.session.add(user)
         db.session.commit()
@@ -47,8 +51,16 @@ def login():
             return jsonify({'error': 'اسم المستخدم وكلمة المرور مطلوبان'}), 400
         
         user = User.query.filter_by(username=data['username']).first()
+        password_hash = user.password_hash if user else None
+        # إنهاء معاملة الكتابة قبل التحقق البطيء من كلمة المرور حتى لا يبقى قفلها محجوزاً
+        db.session.commit()
         
-        if user and user.check_password(data['password']):
+        if user and password_hasher.verify(password_hash, data['password']):
+            # إعادة التشفير بالمعاملات الحالية إذا تغيرت الخوارزمية أو الكلفة
+            if password_hasher.needs_rehash(password_hash):
+                user.password_hash = password_hasher.hash(data['password'])
+                db.session.commit()
+            
             session['user_id'] = user.id
             session['user_role'] = user.role
             return jsonify({
@@ -0,0 +1,87 @@
+from flask import Blueprint, request, jsonify, current_app
+from urllib.parse import urlsplit
+from werkzeug.exceptions import HTTPException
+from werkzeug.routing import RequestRedirect
+from werkzeug.test import EnvironBuilder
+from src.utils.json_provider import dumps_bytes
+from src.utils.batch import batch_executor
+
+batch_bp = Blueprint('batch', __name__)
+
+# رؤوس الطلب الأصلي التي تُمرَّر للطلبات الفرعية (الجلسة والمصادقة)
+FORWARDED_HEADERS = ('Cookie', 'Authorization', 'Accept-Language', 'User-Agent')
+
+
+def subrequest_environ(path):
+    headers = {name: request.headers[name] for name in FORWARDED_HEADERS if name in request.headers}
+    builder = EnvironBuilder(
+        path=path, method='GET', headers=headers, base_url=request.host_url,
+        environ_base={'REMOTE_ADDR': request.remote_addr},
+    )
+    try:
+        return builder.get_environ()
+    finally:
+        builder.close()
+
+
+def run_subrequest(app, environ):
+    """تنفيذ مسار GET داخل سياق طلب فرعي دون خطافات before/after_request.
+
+    يعيد (الحالة، ETag، نوع المحتوى، جسم الاستجابة). عند الاستدعاء داخل سياق
+    طلب الدفعة يُعاد استخدام سياق التطبيق نفسه فتشترك الطلبات الفرعية في جلسة
+    قاعدة البيانات ونسخة القراءة.
+    """
+    with app.request_context(environ):
+        # إعادة التوجيه الداخلية (مثل إضافة / في نهاية المسار) تُتبع مباشرة
+        redirect = request.routing_exception
+        if isinstance(redirect, RequestRedirect):
+            target = urlsplit(redirect.new_url)
+            return run_subrequest(app, dict(environ, PATH_INFO=target.path, QUERY_STRING=target.query))
+        # مسارات API فقط؛ المسار العام لملفات الواجهة الأمامية يطابق أي مسار آخر
+        if request.routing_exception is None and request.blueprint is None:
+            return 404, None, 'application/json', dumps_bytes({'error': 'المسار غير موجود'})
+        # الدفعة داخل دفعة تضاعف العمل مع كل مستوى؛ الفحص بعد المطابقة لا على نص المسار
+        if request.blueprint == batch_bp.name:
+            return 400, None, 'application/json', dumps_bytes({'error': 'لا يمكن تضمين /api/batch داخل دفعة'})
+        try:
+            response = app.make_response(app.dispatch_request())
+        except HTTPException as e:
+            response = app.make_response(app.handle_user_exception(e))
+        if response.is_streamed:
+            return 400, None, 'application/json', dumps_bytes({'error': 'المسارات المتدفقة غير مدعومة في الدفعة'})
+        etag, _ = response.get_etag()
+        return response.status_code, etag, response.mimetype, response.get_data()
+
+
+@batch_bp.route('/', methods=['GET'])
+def get_batch():
+    try:
+        paths = request.args.getlist('path')
+        max_requests = current_app.config['BATCH_MAX_REQUESTS']
+        if not paths:
+            return jsonify({'error': 'يجب تحديد مسار واحد على الأقل عبر path'}), 400
+        if len(paths) > max_requests:
+            return jsonify({'error': f'الحد الأقصى {max_requests} مسارات في الدفعة'}), 400
+        for path in paths:
+            if not path.startswith('/api/'):
+                return jsonify({'error': f'مسار غير مسموح: {path}'}), 400
+
+        app = current_app._get_current_object()
+        results = batch_executor.run(app, run_subrequest, [subrequest_environ(path) for path in paths])
+
+        # أجسام JSON تُدرج كما هي دون إعادة تحليلها وترميزها
+        parts = []
+        for path, (status, etag, mimetype, body) in zip(paths, results):
+            if mimetype != 'application/json':
+                body = dumps_bytes(body.decode('utf-8', 'replace'))
+            head = dumps_bytes({'path': path, 'status': status, 'etag': etag})
+            parts.append(head[:-1] + b',"body":' + (body or b'null') + b'}')
+
+        response = current_app.response_class(
+            b'{"responses":[' + b','.join(parts) + b']}', mimetype='application/json'
+        )
+        response.cache_control.no_cache = True
+        return response
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
@@ -1,15 +1,34 @@
 from flask import Blueprint, request, jsonify, session
 from datetime import datetime, timedelta
+from sqlalchemy.orm import joinedload
 from src.models.user import db
 from src.models.package import Package, UserSubscription
+from src.utils.cache import response_cache
+from src.utils.http import conditional
+from src.utils.fields import package_fields
 
 package_bp = Blueprint('package', __name__)
 
+def all_packages_query():
+    return Package.query
+
 @package_bp.route('/', methods=['GET'])
+@conditional(all_packages_query, Package.updated_at)
+@response_cache.cached('package')
 def get_packages():
     try:
-        packages = Package.query.all()
-        return jsonify([package.to_dict() for package in packages]), 200
+        try:
+            fields = package_fields().parse(request.args.get('fields'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        if fields:
+            packages = package_fields().project(Package.query, fields).all()
+            serialize = package_fields().serializer(fields)
+        else:
+            packages = Package.query.all()
+            serialize = Package.to_dict
+        return jsonify([serialize(package) for package in packages]), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -36,6 +55,7 @@ def create_package():
         
         db.session.add(package)
         db.session.commit()
+        response_cache.bump('package')
         
         return jsonify({
             'message': 'تم إنشاء الباقة بنجاح',
@@ -59,11 +79,11 @@ def subscribe_to_package():
         
         package = Package.query.get_or_404(data['package_id'])
         
-        # التحقق من عدم وجود اشتراك نشط
+        # التحقق من عدم وجود اشتراك نشط (المنتهي ولم يُلغَ بعد لا يُحتسب)
         active_subscription = UserSubscription.query.filter_by(
             user_id=user_id,
             is_active=True
-        ).first()
+        ).filter(UserSubscription.end_date > datetime.utcnow()).first()
         
         if active_subscription:
             return jsonify({'error': 'لديك اشتراك نشط بالفعل'}), 400
@@ -104,7 +124,9 @@ def get_my_subscriptions():
         if not user_id:
             return jsonify({'error': 'يجب تسجيل الدخول أولاً'}), 401
         
-        subscriptions = UserSubscription.query.filter_by(user_id=user_id).order_by(UserSubscription.created_at.desc()).all()
+        subscriptions = UserSubscription.query.options(
+            joinedload(UserSubscription.package)
+        ).filter_by(user_id=user_id).order_by(UserSubscription.created_at.desc()).all()
         return jsonify([subscription.to_dict() for subscription in subscriptions]), 200
         
     except Exception as e:
@@ -117,31 +139,14 @@ def check_subscription():
         if not user_id:
             return jsonify({'error': 'يجب تسجيل الدخول أولاً'}), 401
         
-        # التحقق من الاشتراكات المنتهية الصلاحية
-        expired_subscriptions = UserSubscription.query.filter(
-            UserSubscription.user_id == user_id,
-            UserSubscription.is_active == True,
-            UserSubscription.end_date < datetime.utcnow()
-        ).all()
-        
-        # إلغاء الاشتراكات المنتهية
-        for subscription in expired_subscriptions:
-            subscription.is_active = False
-        
-        # تحديث دور المستخدم إذا لم يعد لديه اشتراك نشط
-        active_subscription = UserSubscription.query.filter_by(
+        # قراءة فقط؛ إلغاء الاشتراكات المنتهية وتخفيض الدور يتمان في subscription_sweeper
+        active_subscription = UserSubscription.query.options(
+            joinedload(UserSubscription.package)
+        ).filter_by(
             user_id=user_id,
             is_active=True
         ).filter(UserSubscription.end_date > datetime.utcnow()).first()
         
-        from src.models.user import User
-        user = User.query.get(user_id)
-        
-        if not active_subscription and user.role == 'premium':
-            user.role = 'user'
-        
-        db.session.commit()
-        
         return jsonify({
             'has_active_subscription': active_subscription is not None,
             'subscription': active_subscription.to_dict() if active_subscription else None
@@ -1,37 +1,231 @@
-from flask import Blueprint, request, jsonify, session
+from flask import Blueprint, request, jsonify, session, Response, stream_with_context
+from datetime import datetime
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import joinedload, contains_eager
 from src.models.user import db
-from src.models.place import Place
+from src.models.place import Place, PlaceStats
+from src.models.tombstone import Tombstone
+from src.utils.pagination import keyset_page, parse_limit
+from src.utils.cache import response_cache
+from src.utils.http import conditional
+from src.utils.streaming import wants_stream, stream_json_array
+from src.utils.fields import place_fields
+from src.utils.trending import place_views, place_stats_rows
+from src.utils.search import index_place, index_place_rows, remove_place, search_place_ids, is_search_available
+from src.utils.geo import (
+    DEFAULT_RADIUS_KM, MAX_RADIUS_KM, parse_coordinates, nearby_place_ids,
+    index_place_location, index_location_rows, remove_place_location, is_spatial_index_available
+)
+from src.utils.bulk import (
+    BATCH_SIZE, MAX_REPORTED_ERRORS, detect_format, iter_records, batched, iter_ndjson, iter_csv
+)
 
 place_bp = Blueprint('place', __name__)
 
+PLACE_STATUSES = ('pending', 'approved', 'rejected')
+
+# أقصى عدد أماكن في طلب مراجعة واحد
+MAX_MODERATION_IDS = 1000
+
+def read_coordinates(data):
+    # الإحداثيات اختيارية لكن يجب إرسالهما معاً
+    latitude = data.get('latitude')
+    longitude = data.get('longitude')
+    if latitude in (None, '') and longitude in (None, ''):
+        return None, None
+    return parse_coordinates(latitude, longitude)
+
+def validate_place_data(data):
+    # قواعد إضافة المكان المشتركة بين الإضافة الفردية والاستيراد الجماعي
+    if not data or not data.get('name') or not data.get('category'):
+        raise ValueError('الاسم والفئة مطلوبان')
+    
+    latitude, longitude = read_coordinates(data)
+    
+    return {
+        'name': data['name'],
+        'description': data.get('description', ''),
+        'address': data.get('address', ''),
+        'phone': data.get('phone', ''),
+        'website': data.get('website', ''),
+        'category': data['category'],
+        'image_url': data.get('image_url', ''),
+        'latitude': latitude,
+        'longitude': longitude
+    }
+
+def is_trending():
+    return request.args.get('sort') == 'trending'
+
+def filtered_places_query():
+    status = request.args.get('status', 'approved')
+    category = request.args.get('category')
+    featured = request.args.get('featured')
+    
+    query = Place.query
+    
+    if status:
+        query = query.filter_by(status=status)
+    
+    if category:
+        query = query.filter_by(category=category)
+        
+    if featured == 'true':
+        query = query.filter_by(is_featured=True)
+    
+    return query
+
+def places_etag_versions():
+    # درجات الرواج تتغير مع كل دفعة مشاهدات دون تغيّر updated_at للأماكن
+    return ('trending',) if is_trending() else ()
+
+# أعمدة ترتيب القائمة ومؤشر الترقيم
+PLACE_SORT_COLUMNS = (Place.is_featured, Place.created_at, Place.id)
+PENDING_SORT_COLUMNS = (Place.created_at, Place.id)
+OWNER_SORT_COLUMNS = (Place.created_at, Place.id)
+TRENDING_SORT_COLUMNS = (PlaceStats.trending_score, PlaceStats.place_id)
+
+def trending_row_key(place):
+    return [place.stats.trending_score, place.id]
+
+def place_list_query(query, extra=()):
+    # يعيد الاستعلام ودالة التسلسل؛ مع ?fields= تُجلب الأعمدة المطلوبة فقط
+    fields = place_fields().parse(request.args.get('fields'))
+    if fields:
+        return place_fields().project(query, fields, extra=extra), place_fields().serializer(fields)
+    # تحميل المالك مع الأماكن في نفس الاستعلام لتجنب استعلام لكل صف
+    return query.options(joinedload(Place.owner)), Place.to_dict
+
+def single_place_query(place_id):
+    return Place.query.filter_by(id=place_id)
+
 @place_bp.route('/', methods=['GET'])
+@conditional(filtered_places_query, Place.updated_at, versions=places_etag_versions)
+@response_cache.cached('place', 'user', 'trending')
 def get_places():
     try:
-        status = request.args.get('status', 'approved')
-        category = request.args.get('category')
-        featured = request.args.get('featured')
+        sort = request.args.get('sort')
+        if sort not in (None, '', 'trending'):
+            return jsonify({'error': 'قيمة sort غير صحيحة'}), 400
+        
+        sort_columns, cursor_types, row_key = PLACE_SORT_COLUMNS, (bool, datetime, int), None
+        if is_trending():
+            sort_columns, cursor_types = TRENDING_SORT_COLUMNS, (float, int)
+        
+        query = filtered_places_query()
+        if is_trending():
+            # لكل مكان صف إحصاءات (بدرجة صفرية قبل أول مشاهدة) فيشمل الترتيب كل الأماكن
+            query = query.join(Place.stats)
+        
+        try:
+            query, serialize = place_list_query(query, extra=sort_columns)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        if is_trending() and serialize is Place.to_dict:
+            # الصفوف كائنات Place؛ قيم المؤشر من الجدول المربوط
+            query, row_key = query.options(contains_eager(Place.stats)), trending_row_key
+        
+        # جلب القائمة كاملة دون ترقيم يتطلب طلباً صريحاً
+        if request.args.get('all') == 'true':
+            query = query.order_by(*[column.desc() for column in sort_columns])
+            if wants_stream():
+                return stream_json_array(query, serialize)
+            places = query.all()
+            return jsonify([serialize(place) for place in places]), 200
+        
+        try:
+            limit = parse_limit(request.args.get('limit'))
+            # ترتيب الأماكن المميزة أولاً، أو حسب درجة الرواج
+            places, next_cursor = keyset_page(
+                query,
+                sort_columns,
+                cursor_types,
+                cursor=request.args.get('cursor'),
+                limit=limit,
+                row_key=row_key
+            )
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
-        query = Place.query
+        return jsonify({
+            'places': [serialize(place) for place in places],
+            'next_cursor': next_cursor
+        }), 200
         
-        if status:
-            query = query.filter_by(status=status)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@place_bp.route('/search', methods=['GET'])
+def search_places():
+    try:
+        q = request.args.get('q', '').strip()
+        if not q:
+            return jsonify({'error': 'نص البحث مطلوب'}), 400
+        
+        if not is_search_available():
+            return jsonify({'error': 'البحث النصي غير متاح على قاعدة البيانات الحالية'}), 503
+        
+        try:
+            limit = parse_limit(request.args.get('limit'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
-        if category:
-            query = query.filter_by(category=category)
-            
-        if featured == 'true':
-            query = query.filter_by(is_featured=True)
+        place_ids = search_place_ids(q, limit, category=request.args.get('category'))
         
-        # ترتيب الأماكن المميزة أولاً
-        query = query.order_by(Place.is_featured.desc(), Place.created_at.desc())
+        places = Place.query.options(joinedload(Place.owner)).filter(Place.id.in_(place_ids)).all() if place_ids else []
+        # الحفاظ على ترتيب الصلة الناتج عن bm25
+        places_by_id = {place.id: place for place in places}
         
-        places = query.all()
-        return jsonify([place.to_dict() for place in places]), 200
+        return jsonify({
+            'places': [places_by_id[place_id].to_dict() for place_id in place_ids if place_id in places_by_id]
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@place_bp.route('/nearby', methods=['GET'])
+def get_nearby_places():
+    try:
+        if not is_spatial_index_available():
+            return jsonify({'error': 'البحث الجغرافي غير متاح على قاعدة البيانات الحالية'}), 503
+        
+        try:
+            latitude, longitude = parse_coordinates(request.args.get('lat'), request.args.get('lng'))
+            limit = parse_limit(request.args.get('limit'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        try:
+            radius = float(request.args.get('radius', DEFAULT_RADIUS_KM))
+        except ValueError:
+            radius = 0
+        if radius <= 0:
+            return jsonify({'error': 'نصف القطر غير صحيح'}), 400
+        radius = min(radius, MAX_RADIUS_KM)
+        
+        results = nearby_place_ids(latitude, longitude, radius, limit, category=request.args.get('category'))
+        place_ids = [place_id for place_id, _ in results]
+        
+        places = Place.query.options(joinedload(Place.owner)).filter(Place.id.in_(place_ids)).all() if place_ids else []
+        places_by_id = {place.id: place for place in places}
+        
+        # الترتيب حسب المسافة الفعلية على سطح الأرض
+        nearby = []
+        for place_id, distance in results:
+            if place_id in places_by_id:
+                place_data = places_by_id[place_id].to_dict()
+                place_data['distance_km'] = round(distance, 3)
+                nearby.append(place_data)
+        
+        return jsonify({'places': nearby}), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @place_bp.route('/<int:place_id>', methods=['GET'])
+@place_views.counted
+@conditional(single_place_query, Place.updated_at)
 def get_place(place_id):
     try:
         place = Place.query.get_or_404(place_id)
@@ -49,22 +243,19 @@ def create_place():
         
         data = request.get_json()
         
-        if not data or not data.get('name') or not data.get('category'):
-            return jsonify({'error': 'الاسم والفئة مطلوبان'}), 400
+        try:
+            values = validate_place_data(data)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
-        place = Place(
-            name=data['name'],
-            description=data.get('description', ''),
-            address=data.get('address', ''),
-            phone=data.get('phone', ''),
-            website=data.get('website', ''),
-            category=data['category'],
-            user_id=user_id,
-            image_url=data.get('image_url', '')
-        )
+        place = Place(user_id=user_id, **values)
+        place.stats = PlaceStats(views=0, trending_score=0.0)
         
         db.session.add(place)
+        index_place(place)
+        index_place_location(place)
         db.session.commit()
+        response_cache.bump('place')
         
         return jsonify({
             'message': 'تم إضافة المكان بنجاح وهو في انتظار الموافقة',
@@ -74,6 +265,136 @@ def create_place():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+EXPORT_COLUMNS = (
+    'id', 'name', 'description', 'address', 'phone', 'website', 'category', 'status',
+    'is_featured', 'image_url', 'latitude', 'longitude', 'user_id', 'created_at', 'updated_at'
+)
+
+def parse_bool(value):
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ('1', 'true', 'yes')
+
+@place_bp.route('/bulk', methods=['POST'])
+def bulk_import_places():
+    try:
+        user_id = session.get('user_id')
+        user_role = session.get('user_role')
+        
+        if user_role != 'admin':
+            return jsonify({'error': 'ليس لديك صلاحية لاستيراد الأماكن'}), 403
+        
+        fmt = detect_format(request.mimetype, request.args.get('format'))
+        if fmt is None:
+            return jsonify({'error': 'صيغة الملف يجب أن تكون NDJSON أو CSV'}), 415
+        
+        inserted = 0
+        failed = 0
+        errors = []
+        
+        def report(line_no, message):
+            if len(errors) < MAX_REPORTED_ERRORS:
+                errors.append({'line': line_no, 'error': message})
+        
+        def valid_rows():
+            nonlocal failed
+            for line_no, record, error in iter_records(request.stream, fmt):
+                if error is None:
+                    try:
+                        values = validate_place_data(record)
+                        status = record.get('status') or 'pending'
+                        if status not in PLACE_STATUSES:
+                            raise ValueError('الحالة غير صحيحة')
+                        values['status'] = status
+                        values['is_featured'] = parse_bool(record.get('is_featured', False))
+                        values['user_id'] = user_id
+                        yield line_no, values
+                        continue
+                    except ValueError as e:
+                        error = str(e)
+                failed += 1
+                report(line_no, error)
+        
+        def insert_rows(rows):
+            result = db.session.execute(
+                insert(Place).returning(Place.id, sort_by_parameter_order=True),
+                rows
+            )
+            for row, place_id in zip(rows, result.scalars()):
+                row['id'] = place_id
+            db.session.execute(insert(PlaceStats), place_stats_rows([row['id'] for row in rows]))
+            index_place_rows(rows)
+            index_location_rows(rows)
+        
+        # كل دفعة تُدرج بعملية executemany واحدة في معاملة مستقلة
+        for batch in batched(valid_rows()):
+            try:
+                insert_rows([values for _, values in batch])
+                db.session.commit()
+                inserted += len(batch)
+                continue
+            except Exception:
+                db.session.rollback()
+            # فشلت الدفعة: نعيدها صفاً صفاً، كل صف في نقطة حفظ، لنحدد الأسطر المسببة
+            # ونحفظ الباقي
+            for line_no, values in batch:
+                try:
+                    with db.session.begin_nested():
+                        insert_rows([values])
+                    inserted += 1
+                except Exception as e:
+                    failed += 1
+                    # رسالة قاعدة البيانات وحدها دون نص الاستعلام ومعاملاته
+                    report(line_no, str(getattr(e, 'orig', None) or e))
+            db.session.commit()
+        
+        if inserted:
+            response_cache.bump('place')
+        
+        return jsonify({
+            'inserted': inserted,
+            'failed': failed,
+            'errors': errors,
+            'errors_truncated': failed > len(errors)
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@place_bp.route('/export', methods=['GET'])
+def export_places():
+    try:
+        user_role = session.get('user_role')
+        
+        if user_role != 'admin':
+            return jsonify({'error': 'ليس لديك صلاحية لتصدير الأماكن'}), 403
+        
+        fmt = request.args.get('format', 'ndjson')
+        if fmt not in ('ndjson', 'csv'):
+            return jsonify({'error': 'صيغة التصدير يجب أن تكون ndjson أو csv'}), 400
+        
+        statement = select(*[getattr(Place, column) for column in EXPORT_COLUMNS]).order_by(Place.id)
+        status = request.args.get('status')
+        if status:
+            statement = statement.where(Place.status == status)
+        
+        def generate():
+            # مؤشر من جهة الخادم يجلب الصفوف على دفعات دون تحميل الجدول كاملاً
+            rows = db.session.execute(statement.execution_options(stream_results=True, yield_per=1000))
+            if fmt == 'csv':
+                yield from iter_csv(rows, EXPORT_COLUMNS)
+            else:
+                yield from iter_ndjson(rows, EXPORT_COLUMNS)
+        
+        mimetype = 'text/csv' if fmt == 'csv' else 'application/x-ndjson'
+        response = Response(stream_with_context(generate()), mimetype=mimetype)
+        response.headers['Content-Disposition'] = f'attachment; filename=places.{fmt}'
+        return response
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @place_bp.route('/<int:place_id>', methods=['PUT'])
 def update_place(place_id):
     try:
@@ -105,6 +426,11 @@ def update_place(place_id):
             place.category = data['category']
         if data.get('image_url'):
             place.image_url = data['image_url']
+        if 'latitude' in data or 'longitude' in data:
+            try:
+                place.latitude, place.longitude = read_coordinates(data)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
         
         # المسؤول فقط يمكنه تغيير الحالة والميزة
         if user_role == 'admin':
@@ -113,7 +439,10 @@ def update_place(place_id):
             if 'is_featured' in data:
                 place.is_featured = data['is_featured']
         
+        index_place(place)
+        index_place_location(place)
         db.session.commit()
+        response_cache.bump('place')
         
         return jsonify({
             'message': 'تم تحديث المكان بنجاح',
@@ -138,8 +467,12 @@ def delete_place(place_id):
         if place.user_id != user_id and user_role != 'admin':
             return jsonify({'error': 'ليس لديك صلاحية لحذف هذا المكان'}), 403
         
+        remove_place(place.id)
+        remove_place_location(place.id)
+        Tombstone.record('place', place.id)
         db.session.delete(place)
         db.session.commit()
+        response_cache.bump('place')
         
         return jsonify({'message': 'تم حذف المكان بنجاح'}), 200
         
@@ -154,13 +487,148 @@ def get_pending_places():
         if user_role != 'admin':
             return jsonify({'error': 'ليس لديك صلاحية للوصول لهذه البيانات'}), 403
         
-        places = Place.query.filter_by(status='pending').order_by(Place.created_at.desc()).all()
-        return jsonify([place.to_dict() for place in places]), 200
+        try:
+            query, serialize = place_list_query(Place.query.filter_by(status='pending'), extra=PENDING_SORT_COLUMNS)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        if request.args.get('all') == 'true':
+            query = query.order_by(*[column.desc() for column in PENDING_SORT_COLUMNS])
+            if wants_stream():
+                return stream_json_array(query, serialize)
+            places = query.all()
+            return jsonify([serialize(place) for place in places]), 200
+        
+        try:
+            # الأحدث أولاً عبر فهرس (status, created_at)
+            places, next_cursor = keyset_page(
+                query,
+                PENDING_SORT_COLUMNS,
+                (datetime, int),
+                cursor=request.args.get('cursor'),
+                limit=parse_limit(request.args.get('limit'))
+            )
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        return jsonify({
+            'places': [serialize(place) for place in places],
+            'next_cursor': next_cursor
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@place_bp.route('/my-places', methods=['GET'])
+def get_my_places():
+    try:
+        user_id = session.get('user_id')
+        if not user_id:
+            return jsonify({'error': 'يجب تسجيل الدخول أولاً'}), 401
+        
+        # أماكن المستخدم بكل حالاتها ما لم تُحدد status
+        query = Place.query.filter_by(user_id=user_id)
+        status = request.args.get('status')
+        if status:
+            if status not in PLACE_STATUSES:
+                return jsonify({'error': 'الحالة غير صحيحة'}), 400
+            query = query.filter_by(status=status)
+        
+        try:
+            query, serialize = place_list_query(query, extra=OWNER_SORT_COLUMNS)
+            # الأحدث أولاً عبر فهرس (user_id, created_at, id)
+            places, next_cursor = keyset_page(
+                query,
+                OWNER_SORT_COLUMNS,
+                (datetime, int),
+                cursor=request.args.get('cursor'),
+                limit=parse_limit(request.args.get('limit'))
+            )
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        return jsonify({
+            'places': [serialize(place) for place in places],
+            'next_cursor': next_cursor
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def apply_moderation(ids, values):
+    """تطبيق values على الأماكن ids بتحديث جماعي واحد لكل دفعة ضمن معاملة واحدة.
+
+    يعيد {id: 'updated' | 'unchanged'}؛ المعرفات غير الموجودة لا تظهر في النتيجة.
+    """
+    now = datetime.utcnow()
+    outcomes = {}
+    for batch in batched(sorted(set(ids)), BATCH_SIZE):
+        rows = db.session.execute(
+            select(Place.id, Place.status, Place.is_featured).where(Place.id.in_(batch))
+        ).all()
+        changed = []
+        for row in rows:
+            if any(getattr(row, name) != value for name, value in values.items()):
+                changed.append(row.id)
+                outcomes[row.id] = 'updated'
+            else:
+                outcomes[row.id] = 'unchanged'
+        if changed:
+            db.session.execute(
+                update(Place)
+                .where(Place.id.in_(changed))
+                .values(updated_at=now, **values)
+                .execution_options(synchronize_session=False)
+            )
+    db.session.commit()
+    return outcomes
+
+@place_bp.route('/moderate', methods=['POST'])
+def moderate_places():
+    try:
+        if session.get('user_role') != 'admin':
+            return jsonify({'error': 'ليس لديك صلاحية لمراجعة الأماكن'}), 403
+        
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({'error': 'يجب إرسال كائن JSON'}), 400
+        
+        ids = data.get('ids')
+        if (
+            not isinstance(ids, list) or not ids or len(ids) > MAX_MODERATION_IDS
+            or not all(isinstance(place_id, int) and not isinstance(place_id, bool) for place_id in ids)
+        ):
+            return jsonify({'error': f'ids يجب أن تكون قائمة أرقام بحد أقصى {MAX_MODERATION_IDS}'}), 400
+        
+        values = {}
+        if 'status' in data:
+            if data['status'] not in PLACE_STATUSES:
+                return jsonify({'error': 'قيمة status غير صحيحة'}), 400
+            values['status'] = data['status']
+        if 'is_featured' in data:
+            if not isinstance(data['is_featured'], bool):
+                return jsonify({'error': 'قيمة is_featured غير صحيحة'}), 400
+            values['is_featured'] = data['is_featured']
+        if not values:
+            return jsonify({'error': 'يجب تحديد status أو is_featured'}), 400
+        
+        outcomes = apply_moderation(ids, values)
+        updated = sum(1 for outcome in outcomes.values() if outcome == 'updated')
+        if updated:
+            response_cache.bump('place')
+        
+        return jsonify({
+            'message': f'تم تحديث {updated} مكان',
+            'updated': updated,
+            'results': [{'id': place_id, 'outcome': outcomes.get(place_id, 'not_found')} for place_id in ids]
+        }), 200
         
     except Exception as e:
+        db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
 @place_bp.route('/categories', methods=['GET'])
+@response_cache.cached()
 def get_categories():
     try:
         categories = [
@@ -0,0 +1,26 @@
+from flask import Blueprint, request, jsonify
+from src.utils.pagination import parse_limit
+from src.utils.sync import changes_since
+
+# لا يُضاف إلى REPLICA_BLUEPRINTS: تأخر النسخة قد يجعل المؤشر يتجاوز صفوفاً لم تصلها بعد
+sync_bp = Blueprint('sync', __name__)
+
+# عدد الصفوف لكل نوع في الصفحة الواحدة
+SYNC_PAGE_SIZE = 500
+MAX_SYNC_PAGE_SIZE = 2000
+
+@sync_bp.route('/', methods=['GET'])
+def get_changes():
+    try:
+        try:
+            limit = parse_limit(request.args.get('limit'), default=SYNC_PAGE_SIZE, maximum=MAX_SYNC_PAGE_SIZE)
+            changes = changes_since(request.args.get('since'), limit)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        response = jsonify(changes)
+        response.cache_control.no_cache = True
+        return response, 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
@@ -1,12 +1,36 @@
 from flask import Blueprint, jsonify, request
 from src.models.user import User, db
+from src.utils.cache import response_cache
+from src.utils.http import conditional
+from src.utils.streaming import wants_stream, stream_json_array
+from src.utils.fields import user_fields
 
 user_bp = Blueprint('user', __name__)
 
+def all_users_query():
+    return User.query
+
+def single_user_query(user_id):
+    return User.query.filter_by(id=user_id)
+
 @user_bp.route('/users', methods=['GET'])
+@conditional(all_users_query, User.updated_at)
 def get_users():
-    users = User.query.all()
-    return jsonify([user.to_dict() for user in users])
+    try:
+        fields = user_fields().parse(request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    query = User.query.order_by(User.id)
+    serialize = User.to_dict
+    if fields:
+        query = user_fields().project(query, fields)
+        serialize = user_fields().serializer(fields)
+    
+    if wants_stream():
+        return stream_json_array(query, serialize)
+    users = query.all()
+    return jsonify([serialize(user) for user in users])
 
 @user_bp.route('/users', methods=['POST'])
 def create_user():
@@ -18,6 +42,7 @@ def create_user():
     return jsonify(user.to_dict()), 201
 
 @user_bp.route('/users/<int:user_id>', methods=['GET'])
+@conditional(single_user_query, User.updated_at)
 def get_user(user_id):
     user = User.query.get_or_404(user_id)
     return jsonify(user.to_dict())
@@ -29,6 +54,7 @@ def update_user(user_id):
     user.username = data.get('username', user.username)
     user.email = data.get('email', user.email)
     db.session.commit()
+    response_cache.bump('user')
     return jsonify(user.to_dict())
 
 @user_bp.route('/users/<int:user_id>', methods=['DELETE'])
@@ -36,4 +62,5 @@ def delete_user(user_id):
     user = User.query.get_or_404(user_id)
     db.session.delete(user)
     db.session.commit()
+    response_cache.bump('user')
     return '', 204
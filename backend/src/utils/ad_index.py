@@ -0,0 +1,219 @@
+import hashlib
+import heapq
+import threading
+import time
+from datetime import datetime
+from sqlalchemy import select, func
+from sqlalchemy.orm import joinedload
+from src.models.user import db
+from src.models.place import Place
+from src.models.advertisement import Advertisement
+from src.models.tombstone import Tombstone
+from src.utils.cache import response_cache
+from src.utils.fields import project_dict
+from src.utils.json_provider import dumps_bytes
+
+# الكيانات التي تظهر بياناتها في الإعلان المسلسل (اسم المكان واسم المستخدم)
+DEPENDENCIES = ('advertisement', 'place', 'user')
+
+
+class ActiveAdIndex:
+    """فهرس في الذاكرة للإعلانات المعروضة حالياً، مسلسلة ومرتبة مسبقاً.
+
+    مؤقت واحد يوقظ الفهرس عند أقرب start_date أو end_date فيضيف الإعلان أو يحذفه
+    في لحظته دون أي استعلام. الكتابات عبر advertisement.py تحدّث الفهرس تدريجياً،
+    وأي تغيّر آخر في أرقام إصدارات response_cache (تعديل مكان أو مستخدم، أو كتابة
+    من عملية أخرى) يؤدي لإعادة البناء، مع إعادة بناء دورية كل max_age ثانية.
+
+    أرقام الإصدارات تعبر العمليات افتراضياً (ملف RESPONSE_CACHE_PATH)؛ إذا عُطّل ذلك
+    بـ RESPONSE_CACHE_SHARED_VERSIONS=false يُقرأ كل check_interval ثانية ختم من القاعدة (آخر إعلان مضاف وآخر تعديل
+    للإعلانات والأماكن وآخر حذف) فتظهر كتابات العمليات الأخرى خلال هذه المدة.
+    تعديل اسم المستخدم وحده يظهر مع إعادة البناء الدورية.
+    """
+
+    def __init__(self, max_age=300, check_interval=1.0):
+        self.max_age = max_age
+        self.check_interval = check_interval
+        self._lock = threading.RLock()
+        self._ads = {}          # id -> (start_date, end_date, created_at, data)
+        self._live = set()
+        self._starts = []       # heap of (start_date, id)
+        self._ends = []         # heap of (end_date, id)
+        self._timer = None
+        self._versions = None
+        self._loaded_at = 0
+        self._stamp = None
+        self._checked_at = 0
+        self._payloads = {}
+
+    # ---- القراءة ----
+
+    def payload(self, fields=None):
+        """يعيد (JSON bytes, etag) للإعلانات المعروضة الآن، مسلسلة مرة واحدة لكل مجموعة حقول."""
+        with self._lock:
+            if self._needs_reload():
+                self.reload()
+            self._advance(datetime.utcnow())
+            payload = self._payloads.get(fields)
+            if payload is None:
+                items = sorted(
+                    (self._ads[ad_id] for ad_id in self._live),
+                    key=lambda entry: (entry[2] or datetime.min, entry[3]['id']),
+                    reverse=True
+                )
+                data = [entry[3] for entry in items]
+                if fields:
+                    data = [project_dict(item, fields) for item in data]
+                body = dumps_bytes(data)
+                payload = self._payloads[fields] = (body, hashlib.sha1(body).hexdigest())
+            return payload
+
+    def is_live(self, ad_id):
+        # للتحقق من إشارات الظهور والنقر دون استعلام
+        with self._lock:
+            if self._needs_reload():
+                self.reload()
+            self._advance(datetime.utcnow())
+            return ad_id in self._live
+
+    def _current_versions(self):
+        if response_cache.backend is None:
+            return None
+        return tuple(response_cache.backend.get_version(name) for name in DEPENDENCIES)
+
+    def _database_stamp(self):
+        # استعلام واحد تخدمه فهارس updated_at والمفاتيح الأساسية دون مسح أي جدول؛
+        # حذف الإعلانات والأماكن يسجّل Tombstone فيكفي آخر معرف فيه
+        return db.session.execute(select(
+            select(func.max(Advertisement.id)).scalar_subquery(),
+            select(func.max(Advertisement.updated_at)).scalar_subquery(),
+            select(func.max(Place.updated_at)).scalar_subquery(),
+            select(func.max(Tombstone.id)).scalar_subquery(),
+        )).one()
+
+    def _needs_reload(self):
+        if self._versions is None or time.monotonic() - self._loaded_at > self.max_age:
+            return True
+        if self._current_versions() != self._versions:
+            return True
+        if response_cache.backend is not None and response_cache.backend.shared:
+            return False
+        if time.monotonic() - self._checked_at < self.check_interval:
+            return False
+        self._checked_at = time.monotonic()
+        return self._database_stamp() != self._stamp
+
+    # ---- البناء والتحديث ----
+
+    def reload(self):
+        # يتطلب سياق تطبيق؛ يحمّل الإعلانات النشطة والمجدولة مستقبلاً فقط
+        now = datetime.utcnow()
+        # الختم قبل القراءة: أي كتابة بينهما تظهر في الفحص التالي
+        stamp = self._database_stamp()
+        advertisements = Advertisement.query.options(
+            joinedload(Advertisement.place),
+            joinedload(Advertisement.user)
+        ).filter(
+            Advertisement.is_active == True,
+            Advertisement.end_date >= now
+        ).all()
+
+        with self._lock:
+            self._ads.clear()
+            self._live.clear()
+            self._starts = []
+            self._ends = []
+            for advertisement in advertisements:
+                self._add(advertisement, now)
+            self._versions = self._current_versions()
+            self._loaded_at = time.monotonic()
+            self._stamp = stamp
+            self._checked_at = self._loaded_at
+            self._payloads = {}
+            self._schedule()
+
+    def upsert(self, advertisement):
+        # يُستدعى بعد commit وبعد response_cache.bump
+        now = datetime.utcnow()
+        with self._lock:
+            self._discard(advertisement.id)
+            if advertisement.is_active and advertisement.end_date and advertisement.end_date >= now:
+                self._add(advertisement, now)
+            self._sync_versions()
+            self._schedule()
+
+    def remove(self, ad_id):
+        with self._lock:
+            self._discard(ad_id)
+            self._sync_versions()
+            self._schedule()
+
+    def _sync_versions(self):
+        # نعتمد إصدار الإعلانات الجديد فقط إذا لم يتغير المكان أو المستخدم منذ آخر بناء
+        current = self._current_versions()
+        if self._versions is not None and current is not None and current[1:] == self._versions[1:]:
+            self._versions = current
+
+    def _add(self, advertisement, now):
+        start_date = advertisement.start_date or now
+        data = advertisement.to_dict()
+        self._ads[advertisement.id] = (start_date, advertisement.end_date, advertisement.created_at, data)
+        heapq.heappush(self._ends, (advertisement.end_date, advertisement.id))
+        if start_date <= now:
+            self._live.add(advertisement.id)
+        else:
+            heapq.heappush(self._starts, (start_date, advertisement.id))
+        self._payloads = {}
+
+    def _discard(self, ad_id):
+        # المدخلات القديمة في الـ heap تُتجاهل عند خروجها لأنها لا تطابق _ads
+        if self._ads.pop(ad_id, None) is not None:
+            self._live.discard(ad_id)
+            self._payloads = {}
+
+    def _advance(self, now):
+        changed = False
+        while self._starts and self._starts[0][0] <= now:
+            start_date, ad_id = heapq.heappop(self._starts)
+            entry = self._ads.get(ad_id)
+            if entry and entry[0] == start_date and entry[1] >= now:
+                self._live.add(ad_id)
+                changed = True
+        while self._ends and self._ends[0][0] < now:
+            end_date, ad_id = heapq.heappop(self._ends)
+            entry = self._ads.get(ad_id)
+            if entry and entry[1] == end_date:
+                del self._ads[ad_id]
+                self._live.discard(ad_id)
+                changed = True
+        if changed:
+            self._payloads = {}
+
+    # ---- المؤقت ----
+
+    def _schedule(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        candidates = []
+        if self._starts:
+            candidates.append(self._starts[0][0])
+        if self._ends:
+            candidates.append(self._ends[0][0])
+        if not candidates:
+            return
+
+        delay = max((min(candidates) - datetime.utcnow()).total_seconds(), 0) + 0.001
+        self._timer = threading.Timer(delay, self._on_timer)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _on_timer(self):
+        with self._lock:
+            self._timer = None
+            self._advance(datetime.utcnow())
+            self._schedule()
+
+
+active_ads = ActiveAdIndex()
@@ -0,0 +1,186 @@
+import atexit
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import select, update, insert, delete, func
+from src.models.user import db
+from src.models.advertisement import Advertisement, AdStatsHourly, AdStatsDaily
+from src.utils.bulk import BATCH_SIZE, batched
+
+EVENT_KINDS = ('impressions', 'clicks')
+
+
+def _merge(model, bucket_column, totals, ad_ids):
+    """إضافة {(ad_id, bucket): [impressions, clicks]} إلى جدول تجميع بتحديث/إدخال جماعي لكل دفعة."""
+    key = bucket_column.key
+    for batch in batched(sorted(item for item in totals.items() if item[0][0] in ad_ids), BATCH_SIZE):
+        rows = db.session.execute(
+            select(model.advertisement_id, bucket_column, model.impressions, model.clicks).where(
+                model.advertisement_id.in_({ad_id for (ad_id, _), _ in batch}),
+                bucket_column.in_({bucket for (_, bucket), _ in batch})
+            ).with_for_update()
+        ).all()
+        existing = {(row[0], row[1]): row for row in rows}
+
+        updates, inserts = [], []
+        for (ad_id, bucket), (impressions, clicks) in batch:
+            row = existing.get((ad_id, bucket))
+            if row is None:
+                inserts.append({'advertisement_id': ad_id, key: bucket,
+                                'impressions': impressions, 'clicks': clicks})
+            else:
+                updates.append({'advertisement_id': ad_id, key: bucket,
+                                'impressions': row.impressions + impressions, 'clicks': row.clicks + clicks})
+        if inserts:
+            db.session.execute(insert(model), inserts)
+        if updates:
+            # تحديث جماعي بالمفتاح الأساسي (executemany)
+            db.session.execute(update(model), updates)
+
+
+def flush_ad_events(counts):
+    """كتابة أحداث الإعلانات المجمعة {(ad_id, دقيقة epoch): [impressions, clicks]}.
+
+    الدقائق تُجمع في الذاكرة إلى ساعات وأيام ثم يُحدَّث كل جدول بدفعات؛ الإعلانات
+    المحذوفة منذ تسجيل الحدث تُتجاهل. يعيد عدد الإعلانات المحدثة.
+    """
+    hourly, daily = {}, {}
+    for (ad_id, minute), (impressions, clicks) in counts.items():
+        moment = datetime.utcfromtimestamp(minute * 60)
+        for totals, bucket in ((hourly, moment.replace(minute=0)), (daily, moment.date())):
+            current = totals.setdefault((ad_id, bucket), [0, 0])
+            current[0] += impressions
+            current[1] += clicks
+
+    ad_ids = set()
+    for batch in batched(sorted({ad_id for ad_id, _ in counts}), BATCH_SIZE):
+        ad_ids.update(db.session.scalars(select(Advertisement.id).where(Advertisement.id.in_(batch))))
+
+    _merge(AdStatsHourly, AdStatsHourly.hour, hourly, ad_ids)
+    _merge(AdStatsDaily, AdStatsDaily.day, daily, ad_ids)
+    db.session.commit()
+    return len(ad_ids)
+
+
+def prune_hourly_ad_stats(retention_days, now=None):
+    # التجميع اليومي يبقى دائماً؛ التفصيل بالساعة للفترة الأخيرة فقط
+    cutoff = (now or datetime.utcnow()) - timedelta(days=retention_days)
+    result = db.session.execute(delete(AdStatsHourly).where(AdStatsHourly.hour < cutoff))
+    db.session.commit()
+    return result.rowcount
+
+
+def delete_ad_stats(ad_id):
+    # يُستدعى قبل حذف الإعلان ضمن نفس المعاملة
+    db.session.execute(delete(AdStatsHourly).where(AdStatsHourly.advertisement_id == ad_id))
+    db.session.execute(delete(AdStatsDaily).where(AdStatsDaily.advertisement_id == ad_id))
+
+
+def ad_totals(ad_ids):
+    """إجمالي مرات الظهور والنقرات لكل إعلان من التجميع اليومي: {ad_id: {'impressions', 'clicks'}}."""
+    totals = {}
+    for batch in batched(ad_ids, BATCH_SIZE):
+        rows = db.session.execute(
+            select(
+                AdStatsDaily.advertisement_id,
+                func.sum(AdStatsDaily.impressions),
+                func.sum(AdStatsDaily.clicks)
+            ).where(AdStatsDaily.advertisement_id.in_(batch)).group_by(AdStatsDaily.advertisement_id)
+        ).all()
+        for ad_id, impressions, clicks in rows:
+            totals[ad_id] = {'impressions': impressions, 'clicks': clicks}
+    return totals
+
+
+class AdEventCounter:
+    """تجميع مرات ظهور الإعلانات والنقرات عليها في الذاكرة لكل إعلان ودقيقة وكتابتها كل فترة."""
+
+    def __init__(self, app=None):
+        self.app = None
+        self._counts = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        self._pruned_at = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('AD_STATS_ENABLED', os.environ.get('AD_STATS_ENABLED', 'true') == 'true')
+        app.config.setdefault('AD_STATS_FLUSH_INTERVAL', float(os.environ.get('AD_STATS_FLUSH_INTERVAL', 60)))
+        app.config.setdefault('AD_STATS_HOURLY_RETENTION_DAYS', int(os.environ.get('AD_STATS_HOURLY_RETENTION_DAYS', 90)))
+        self.app = app
+        app.extensions['ad_events'] = self
+
+    def record(self, ad_id, kind, count=1):
+        minute = int(time.time() // 60)
+        with self._lock:
+            current = self._counts.get((ad_id, minute))
+            if current is None:
+                current = self._counts[(ad_id, minute)] = [0, 0]
+            current[EVENT_KINDS.index(kind)] += count
+
+    def flush(self):
+        with self._lock:
+            counts, self._counts = self._counts, {}
+        if not counts:
+            return 0
+        with self.app.app_context():
+            try:
+                return flush_ad_events(counts)
+            except Exception:
+                db.session.rollback()
+                # إعادة الأحداث لتُكتب في الدورة التالية
+                with self._lock:
+                    for key, (impressions, clicks) in counts.items():
+                        current = self._counts.setdefault(key, [0, 0])
+                        current[0] += impressions
+                        current[1] += clicks
+                self.app.logger.exception('Flushing advertisement events failed')
+                return 0
+            finally:
+                db.session.remove()
+
+    def prune(self):
+        with self.app.app_context():
+            try:
+                return prune_hourly_ad_stats(self.app.config['AD_STATS_HOURLY_RETENTION_DAYS'])
+            except Exception:
+                db.session.rollback()
+                self.app.logger.exception('Pruning hourly advertisement stats failed')
+                return 0
+            finally:
+                db.session.remove()
+
+    def start(self):
+        if self._thread is not None or not self.app.config['AD_STATS_ENABLED']:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='ad-event-flusher', daemon=True)
+        self._thread.start()
+        # كتابة ما تبقى في الذاكرة عند إيقاف العملية
+        atexit.register(self.stop)
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def _run(self):
+        interval = self.app.config['AD_STATS_FLUSH_INTERVAL']
+        while not self._stop.wait(interval):
+            started = time.perf_counter()
+            flushed = self.flush()
+            if flushed:
+                self.app.logger.debug('Flushed events for %d advertisements in %.1f ms',
+                                      flushed, (time.perf_counter() - started) * 1000)
+            # حذف الساعات القديمة مرة كل ساعة
+            if time.monotonic() - self._pruned_at >= 3600:
+                self._pruned_at = time.monotonic()
+                self.prune()
+
+
+ad_events = AdEventCounter()
@@ -0,0 +1,56 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class BatchExecutor:
+    """تنفيذ الطلبات الفرعية لـ /api/batch بالتتابع أو في مجمع خيوط محدود الحجم.
+
+    بالتتابع (BATCH_WORKERS=0) تشترك الطلبات الفرعية في سياق طلب الدفعة وجلسة
+    قاعدة البيانات نفسها. مع المجمع يحصل كل طلب فرعي على سياق تطبيق وجلسة مستقلين،
+    وهذا آمن لأن الطلبات الفرعية قراءات GET لا تعتمد على بعضها.
+    """
+
+    def __init__(self, app=None):
+        self.workers = 0
+        self._executor = None
+        self._executor_pid = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('BATCH_MAX_REQUESTS', int(os.environ.get('BATCH_MAX_REQUESTS', 10)))
+        app.config.setdefault('BATCH_WORKERS', int(os.environ.get('BATCH_WORKERS', 0)))
+        self.workers = app.config['BATCH_WORKERS']
+        app.extensions['batch_executor'] = self
+
+    def _get_executor(self):
+        if self.workers <= 0:
+            return None
+        with self._lock:
+            # المجمع لا ينتقل عبر fork، فكل عملية عاملة تنشئ مجمعها الخاص
+            if self._executor is None or self._executor_pid != os.getpid():
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='batch')
+                self._executor_pid = os.getpid()
+            return self._executor
+
+    def run(self, app, func, environs):
+        executor = self._get_executor()
+        if executor is None or len(environs) < 2:
+            return [func(app, environ) for environ in environs]
+        return list(executor.map(lambda environ: self._run_isolated(app, func, environ), environs))
+
+    def _run_isolated(self, app, func, environ):
+        # خيوط المجمع بلا سياق؛ سياق التطبيق الجديد يعني جلسة قاعدة بيانات مستقلة
+        with app.app_context():
+            return func(app, environ)
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+
+batch_executor = BatchExecutor()
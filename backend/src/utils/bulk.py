@@ -0,0 +1,82 @@
+import csv
+import io
+import json
+from datetime import datetime
+
+BATCH_SIZE = 500
+
+# الحد الأقصى لأخطاء الصفوف المعادة في الاستجابة
+MAX_REPORTED_ERRORS = 1000
+
+
+def detect_format(mimetype, requested=None):
+    if requested in ('ndjson', 'csv'):
+        return requested
+    if mimetype == 'text/csv':
+        return 'csv'
+    if mimetype in ('application/x-ndjson', 'application/jsonl', 'application/json-seq'):
+        return 'ndjson'
+    return None
+
+
+def iter_records(stream, fmt):
+    """يقرأ المدخلات سطراً بسطر ويعيد (رقم السطر، القاموس أو None، رسالة الخطأ أو None)."""
+    text = io.TextIOWrapper(io.BufferedReader(stream), encoding='utf-8-sig', newline='')
+
+    if fmt == 'csv':
+        reader = csv.DictReader(text)
+        for record in reader:
+            yield reader.line_num, record, None
+        return
+
+    for line_no, line in enumerate(text, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            yield line_no, None, 'JSON غير صالح'
+            continue
+        if not isinstance(record, dict):
+            yield line_no, None, 'يجب أن يكون كل سطر كائن JSON'
+            continue
+        yield line_no, record, None
+
+
+def batched(iterable, size=BATCH_SIZE):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _export_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def iter_ndjson(rows, columns):
+    for row in rows:
+        yield json.dumps(
+            {column: _export_value(value) for column, value in zip(columns, row)},
+            ensure_ascii=False
+        ) + '\n'
+
+
+def iter_csv(rows, columns):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for row in rows:
+        writer.writerow([_export_value(value) for value in row])
+        if buffer.tell() > 64 * 1024:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
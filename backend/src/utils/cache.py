@@ -0,0 +1,252 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from flask import g, request, make_response, current_app
+
+
+class SQLiteVersionStore:
+    """أرقام إصدارات الكيانات في ملف SQLite محلي تتشاركها جميع العمليات على نفس الخادم."""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._connect().execute(
+            'CREATE TABLE IF NOT EXISTS cache_versions (name TEXT PRIMARY KEY, version INTEGER NOT NULL)'
+        )
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        # اتصال SQLite لا يُستخدم بعد fork؛ العملية العاملة (gunicorn --preload) تفتح اتصالها الخاص
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get_version(self, name):
+        row = self._connect().execute(
+            'SELECT version FROM cache_versions WHERE name = ?', (name,)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def bump_version(self, name):
+        self._connect().execute(
+            'INSERT INTO cache_versions (name, version) VALUES (?, 1) '
+            'ON CONFLICT(name) DO UPDATE SET version = version + 1',
+            (name,)
+        )
+
+
+class MemoryCacheBackend:
+    """ذاكرة مؤقتة داخل العملية بسياسة LRU ومدة صلاحية لكل مدخل.
+
+    الأجسام تبقى في ذاكرة العملية؛ أرقام الإصدارات تُقرأ من versions (SQLiteVersionStore)
+    إن أُعطي فيرى كل عامل bump من العمليات الأخرى، وبدونه تكون خاصة بالعملية.
+    """
+
+    def __init__(self, max_entries=1024, versions=None):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._versions = {}
+        self._version_store = versions
+        self.shared = versions is not None
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_version(self, name):
+        if self._version_store is not None:
+            return self._version_store.get_version(name)
+        with self._lock:
+            return self._versions.get(name, 0)
+
+    def bump_version(self, name):
+        if self._version_store is not None:
+            self._version_store.bump_version(name)
+            return
+        with self._lock:
+            self._versions[name] = self._versions.get(name, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteCacheBackend(SQLiteVersionStore):
+    """ذاكرة مؤقتة في ملف SQLite محلي تتشاركها جميع العمليات على نفس الخادم."""
+
+    shared = True
+
+    def __init__(self, path, max_entries=1024):
+        super().__init__(path)
+        self.max_entries = max_entries
+        self._writes = 0
+        self._connect().executescript(
+            'CREATE TABLE IF NOT EXISTS cache_entries ('
+            ' key TEXT PRIMARY KEY, expires_at REAL NOT NULL,'
+            ' body BLOB NOT NULL, status INTEGER NOT NULL, mimetype TEXT);'
+            'CREATE INDEX IF NOT EXISTS ix_cache_entries_expires_at ON cache_entries (expires_at);'
+        )
+
+    def get(self, key):
+        row = self._connect().execute(
+            'SELECT body, status, mimetype FROM cache_entries WHERE key = ? AND expires_at >= ?',
+            (key, time.time())
+        ).fetchone()
+        return tuple(row) if row else None
+
+    def set(self, key, value, ttl):
+        body, status, mimetype = value
+        conn = self._connect()
+        conn.execute(
+            'INSERT OR REPLACE INTO cache_entries (key, expires_at, body, status, mimetype) VALUES (?, ?, ?, ?, ?)',
+            (key, time.time() + ttl, body, status, mimetype)
+        )
+        self._writes += 1
+        if self._writes % 100 == 0:
+            self._trim(conn)
+
+    def _trim(self, conn):
+        # حذف المنتهية ثم الأقدم انتهاءً إذا تجاوز العدد الحد الأقصى
+        conn.execute('DELETE FROM cache_entries WHERE expires_at < ?', (time.time(),))
+        conn.execute(
+            'DELETE FROM cache_entries WHERE key IN ('
+            ' SELECT key FROM cache_entries ORDER BY expires_at DESC LIMIT -1 OFFSET ?)',
+            (self.max_entries,)
+        )
+
+    def clear(self):
+        self._connect().execute('DELETE FROM cache_entries')
+
+
+class ResponseCache:
+    """تخزين استجابات GET العامة بمفتاح يجمع المسار والمعاملات وأرقام إصدارات الكيانات.
+
+    معالجات الكتابة تستدعي bump() بعد commit فتتغير المفاتيح ولا تُقرأ نسخة قديمة أبداً.
+    أرقام الإصدارات في ملف RESPONSE_CACHE_PATH مع كلا الخلفيتين فتصل bump إلى كل عمليات
+    gunicorn على الخادم؛ RESPONSE_CACHE_SHARED_VERSIONS=false يبقيها في ذاكرة العملية
+    (مناسب لعملية واحدة فقط).
+    """
+
+    def __init__(self, app=None):
+        self.backend = None
+        self.ttl = 60
+        self.enabled = True
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('RESPONSE_CACHE_ENABLED', os.environ.get('RESPONSE_CACHE_ENABLED', 'true') == 'true')
+        app.config.setdefault('RESPONSE_CACHE_BACKEND', os.environ.get('RESPONSE_CACHE_BACKEND', 'memory'))
+        app.config.setdefault('RESPONSE_CACHE_TTL', int(os.environ.get('RESPONSE_CACHE_TTL', 60)))
+        app.config.setdefault('RESPONSE_CACHE_MAX_ENTRIES', int(os.environ.get('RESPONSE_CACHE_MAX_ENTRIES', 1024)))
+        app.config.setdefault('RESPONSE_CACHE_PATH', os.environ.get(
+            'RESPONSE_CACHE_PATH', os.path.join(app.instance_path, 'response_cache.db')
+        ))
+        app.config.setdefault('RESPONSE_CACHE_SHARED_VERSIONS',
+                              os.environ.get('RESPONSE_CACHE_SHARED_VERSIONS', 'true') == 'true')
+
+        self.enabled = app.config['RESPONSE_CACHE_ENABLED']
+        self.ttl = app.config['RESPONSE_CACHE_TTL']
+        max_entries = app.config['RESPONSE_CACHE_MAX_ENTRIES']
+
+        backend = app.config['RESPONSE_CACHE_BACKEND']
+        path = app.config['RESPONSE_CACHE_PATH']
+        if backend == 'memory':
+            versions = None
+            if app.config['RESPONSE_CACHE_SHARED_VERSIONS']:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                versions = SQLiteVersionStore(path)
+            self.backend = MemoryCacheBackend(max_entries, versions)
+        elif backend == 'sqlite':
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self.backend = SQLiteCacheBackend(path, max_entries)
+        else:
+            raise ValueError(f'Unknown RESPONSE_CACHE_BACKEND: {backend}')
+
+        app.extensions['response_cache'] = self
+
+    def versions(self, entities):
+        return ','.join(f'{name}:{self.backend.get_version(name)}' for name in entities)
+
+    def make_key(self, entities):
+        versions = self.versions(entities)
+        args = '&'.join(f'{k}={v}' for k, v in sorted(request.args.items(multi=True)))
+        # ETag الذي حسبه conditional من (أحدث updated_at، العدد) يربط الجسم المخزن بحالة القاعدة
+        etag = g.get('collection_etag', '')
+        return f'{request.path}?{args}|{versions}|{etag}'
+
+    def cached(self, *entities):
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                if not self.enabled or self.backend is None:
+                    return view(*args, **kwargs)
+
+                key = self.make_key(entities)
+                entry = self.backend.get(key)
+                if entry is not None:
+                    self._count(hit=True)
+                    body, status, mimetype = entry
+                    response = current_app.response_class(body, status=status, mimetype=mimetype)
+                    response.headers['X-Cache'] = 'HIT'
+                    return response
+
+                self._count(hit=False)
+                response = make_response(view(*args, **kwargs))
+                if response.status_code == 200 and not response.is_streamed:
+                    self.backend.set(key, (response.get_data(), response.status_code, response.mimetype), self.ttl)
+                response.headers['X-Cache'] = 'MISS'
+                return response
+            return wrapper
+        return decorator
+
+    def bump(self, *entities):
+        if self.backend is None:
+            return
+        for name in entities:
+            self.backend.bump_version(name)
+
+    def _count(self, hit):
+        with self._stats_lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def stats(self):
+        with self._stats_lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / total if total else 0.0,
+            }
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,82 @@
+import click
+from sqlalchemy.exc import IntegrityError
+from src.models.user import db, User
+from src.utils.database import analyze_database, sync_replicas
+
+
+def init_database(app):
+    """إنشاء الجداول وترقيتها وبناء فهرسي البحث والمكان ثم نسخ النسخ المتماثلة.
+
+    تُشغَّل مرة واحدة عند النشر بدلاً من كل إقلاع لعملية عاملة.
+    """
+    from src.utils.schema import upgrade_schema
+    from src.utils.search import ensure_search_index
+    from src.utils.geo import ensure_spatial_index
+    from src.utils.trending import ensure_place_stats
+
+    db.create_all()
+    # إضافة الأعمدة الاختيارية والفهارس الجديدة إلى الجداول الموجودة مسبقاً
+    upgrade_schema()
+    # إنشاء فهرسي البحث النصي والمكاني وتعبئتهما عند أول تشغيل
+    ensure_search_index()
+    ensure_spatial_index()
+    # صف إحصاءات لكل مكان حتى يظهر في ترتيب الرواج قبل أول مشاهدة
+    ensure_place_stats()
+    analyze_database(db)
+    # نسخ SQLite المتماثلة (DATABASE_REPLICA_URLS) تُملأ من القاعدة الرئيسية
+    sync_replicas(app, db)
+
+
+def seed_admin(username='admin', email='admin@tourism.com', password='admin123'):
+    """إنشاء مستخدم مسؤول افتراضي إن لم يكن موجوداً. يعيد True عند الإنشاء."""
+    if User.query.filter_by(username=username).first():
+        return False
+    admin = User(username=username, email=email, role='admin')
+    admin.set_password(password)
+    db.session.add(admin)
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # عملية أخرى أنشأته في نفس اللحظة
+        db.session.rollback()
+        return False
+    return True
+
+
+def register_commands(app):
+    @app.cli.command('init-db')
+    def init_db_command():
+        """إنشاء مخطط قاعدة البيانات وفهارسها."""
+        init_database(app)
+        click.echo('Database schema is up to date.')
+
+    @app.cli.command('seed-admin')
+    @click.option('--username', default='admin')
+    @click.option('--email', default='admin@tourism.com')
+    @click.option('--password', envvar='ADMIN_PASSWORD', default='admin123')
+    def seed_admin_command(username, email, password):
+        """إنشاء المستخدم المسؤول الافتراضي."""
+        if seed_admin(username, email, password):
+            click.echo(f'Created admin user {username}.')
+        else:
+            click.echo(f'Admin user {username} already exists.')
+
+    @app.cli.command('build-static')
+    def build_static_command():
+        """إنشاء نسخ .gz و.br لملفات static مسبقاً عند النشر."""
+        count = app.extensions['static_manifest'].build(write_siblings=True)
+        click.echo(f'Indexed {count} static files.')
+
+    @app.cli.command('seed-synthetic')
+    @click.option('--users', default=100, show_default=True)
+    @click.option('--places', default=1000, show_default=True)
+    @click.option('--packages', default=3, show_default=True)
+    @click.option('--subscriptions', type=int, default=None, help='الافتراضي ثلث عدد المستخدمين')
+    @click.option('--advertisements', default=200, show_default=True)
+    @click.option('--seed', default=42, show_default=True)
+    def seed_synthetic_command(users, places, packages, subscriptions, advertisements, seed):
+        """إضافة بيانات تجريبية بتوزيعات واقعية لاختبارات الأداء."""
+        from src.utils.synthetic import generate_synthetic_data
+        counts = generate_synthetic_data(users, places, packages, subscriptions, advertisements, seed)
+        analyze_database(db)
+        click.echo(', '.join(f'{count} {name}' for name, count in counts.items()))
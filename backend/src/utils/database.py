@@ -0,0 +1,209 @@
+import itertools
+import os
+import sqlite3
+import threading
+from flask import current_app, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event, text
+
+# طرق HTTP التي لا تكتب؛ معاملاتها تبدأ بـ BEGIN العادي فتقرأ بالتوازي مع الكاتب في وضع WAL
+READ_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# العبارات التي تبدأ معاملة الكتابة خارج طلبات القراءة (SAVEPOINT لأن begin_nested يسبق الكتابة)
+WRITE_STATEMENTS = ('INSERT', 'UPDATE', 'DELETE', 'REPLACE', 'SAVEPOINT')
+
+# المخططات التي تُوجَّه طلبات القراءة فيها إلى النسخ المتماثلة إن وُجدت
+REPLICA_BLUEPRINTS = frozenset({'place', 'package', 'advertisement', 'user'})
+
+REPLICA_PREFIX = 'replica_'
+
+_replica_counter = itertools.count()
+
+
+def _env_bool(name, default):
+    return os.environ.get(name, default).lower() in ('1', 'true', 'yes')
+
+
+def database_uri(default_path):
+    uri = os.environ.get('DATABASE_URL') or f'sqlite:///{default_path}'
+    # Render وHeroku يعطيان postgres:// بينما SQLAlchemy يتطلب postgresql://
+    if uri.startswith('postgres://'):
+        uri = 'postgresql://' + uri[len('postgres://'):]
+    return uri
+
+
+def configure_database(app, default_path):
+    """إعداد محرك قاعدة البيانات من متغيرات البيئة قبل db.init_app.
+
+    SQLite: وضع WAL وsynchronous=NORMAL وbusy_timeout وmmap_size وcache_size عند كل اتصال.
+    قواعد الخادم (PostgreSQL): حجم المجمع والفائض وpre-ping وrecycle.
+    """
+    uri = database_uri(default_path)
+    app.config['SQLALCHEMY_DATABASE_URI'] = uri
+
+    # النسخ المتماثلة للقراءة: روابط مفصولة بفواصل، كل منها bind باسم replica_<n>
+    replicas = [url.strip() for url in os.environ.get('DATABASE_REPLICA_URLS', '').split(',') if url.strip()]
+    binds = app.config.setdefault('SQLALCHEMY_BINDS', {})
+    for index, replica in enumerate(replicas):
+        binds[f'{REPLICA_PREFIX}{index}'] = replica
+    app.config['DATABASE_REPLICAS'] = [key for key in binds if key.startswith(REPLICA_PREFIX)]
+
+    if uri.startswith('sqlite'):
+        app.config.setdefault('SQLITE_TUNING', _env_bool('SQLITE_TUNING', 'true'))
+        app.config.setdefault('SQLITE_JOURNAL_MODE', os.environ.get('SQLITE_JOURNAL_MODE', 'WAL'))
+        app.config.setdefault('SQLITE_SYNCHRONOUS', os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL'))
+        app.config.setdefault('SQLITE_BUSY_TIMEOUT_MS', int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 10000)))
+        app.config.setdefault('SQLITE_MMAP_SIZE', int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)))
+        # القيمة السالبة بالكيلوبايت: 64 ميغابايت لكل اتصال
+        app.config.setdefault('SQLITE_CACHE_SIZE', int(os.environ.get('SQLITE_CACHE_SIZE', -64000)))
+        if app.config['SQLITE_TUNING']:
+            app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', {
+                'connect_args': {'timeout': app.config['SQLITE_BUSY_TIMEOUT_MS'] / 1000},
+            })
+    else:
+        app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', {
+            'pool_size': int(os.environ.get('DB_POOL_SIZE', 10)),
+            'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 20)),
+            'pool_timeout': int(os.environ.get('DB_POOL_TIMEOUT', 30)),
+            'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', 1800)),
+            'pool_pre_ping': _env_bool('DB_POOL_PRE_PING', 'true'),
+        })
+
+
+def install_engine_events(app, engine):
+    # يُستدعى بعد db.init_app داخل سياق التطبيق
+    if engine.dialect.name != 'sqlite' or not app.config.get('SQLITE_TUNING'):
+        return
+
+    pragmas = (
+        f"PRAGMA journal_mode={app.config['SQLITE_JOURNAL_MODE']}",
+        f"PRAGMA synchronous={app.config['SQLITE_SYNCHRONOUS']}",
+        f"PRAGMA busy_timeout={app.config['SQLITE_BUSY_TIMEOUT_MS']}",
+        f"PRAGMA mmap_size={app.config['SQLITE_MMAP_SIZE']}",
+        f"PRAGMA cache_size={app.config['SQLITE_CACHE_SIZE']}",
+    )
+
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        # نتولى BEGIN بأنفسنا بدلاً من pysqlite لنختار نوع المعاملة
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+    # busy_timeout في SQLite انتظار بفترات نوم متزايدة لا طابور: مع عشرات الاتصالات
+    # المتنافسة قد يتجاوز بعضها المهلة فيفشل بـ "database is locked" رغم قصر كل معاملة.
+    # خيوط العملية الواحدة تصطف إذن على قفل محلي فلا ينافس على قفل الملف إلا كاتب واحد
+    # من كل عملية
+    write_lock = threading.Lock()
+    lock_timeout = app.config['SQLITE_BUSY_TIMEOUT_MS'] / 1000
+
+    @event.listens_for(engine, 'begin')
+    def begin_transaction(conn):
+        # طلبات القراءة تبدأ معاملة عادية فتقرأ لقطة متسقة بالتوازي مع الكاتب في وضع WAL
+        if has_request_context() and request.method in READ_METHODS:
+            conn.exec_driver_sql('BEGIN')
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def begin_write(conn, cursor, statement, parameters, context, executemany):
+        # غير ذلك (POST وPUT والمهام الخلفية) تبقى القراءات بلا معاملة حتى أول كتابة، كما
+        # تفعل RoutingSession لتثبيت الكتابة على القاعدة الرئيسية: عندها فقط نحجز قفل الكتابة
+        # ونبدأ BEGIN IMMEDIATE فلا تنتظر الطلبات التي لا تكتب (مثل تسجيل الدخول) خلف الكتّاب،
+        # ولا تُرقّى معاملة قراءة قديمة فتفشل فوراً بـ "database is locked"
+        if cursor.connection.in_transaction or not statement.lstrip().upper().startswith(WRITE_STATEMENTS):
+            return
+        if not write_lock.acquire(timeout=lock_timeout):
+            raise sqlite3.OperationalError('database is locked')
+        conn.info['write_lock'] = True
+        try:
+            cursor.execute('BEGIN IMMEDIATE')
+        except Exception:
+            release_write_lock(conn.info)
+            raise
+
+    def release_write_lock(info):
+        if info.pop('write_lock', False):
+            write_lock.release()
+
+    @event.listens_for(engine, 'commit')
+    @event.listens_for(engine, 'rollback')
+    def end_transaction(conn):
+        release_write_lock(conn.info)
+
+    @event.listens_for(engine, 'checkin')
+    def release_on_checkin(dbapi_connection, connection_record):
+        # احتياط لاتصال أُعيد إلى المجمع دون commit أو rollback (مثل اتصال أُبطل)
+        release_write_lock(connection_record.info)
+
+
+class RoutingSession(Session):
+    """جلسة توجّه قراءات طلبات GET في المخططات العامة إلى نسخة متماثلة بالتناوب.
+
+    الكتابة، وكل ما يليها في نفس الطلب، تذهب إلى القاعدة الرئيسية حتى لا يقرأ
+    الطلب بيانات أقدم مما كتبه للتو.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None:
+            replica = self._replica_for(clause)
+            if replica is not None:
+                return self._db.engines[replica]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _replica_for(self, clause):
+        if self.info.get('primary'):
+            return None
+        if self._flushing or getattr(clause, 'is_dml', False):
+            self.info['primary'] = True
+            return None
+        if 'replica' in self.info:
+            return self.info['replica']
+        if not has_request_context() or request.method not in READ_METHODS:
+            return None
+        if request.blueprint not in REPLICA_BLUEPRINTS:
+            return None
+        replicas = current_app.config.get('DATABASE_REPLICAS')
+        if not replicas:
+            return None
+        # نسخة واحدة لكل طلب (الجلسة تُنشأ لكل طلب) حتى تكون قراءاته متسقة
+        self.info['replica'] = replicas[next(_replica_counter) % len(replicas)]
+        return self.info['replica']
+
+
+def sync_replicas(app, db):
+    """نسخ قاعدة SQLite الرئيسية إلى نسخ SQLite المتماثلة عبر واجهة backup.
+
+    بديل محلي للتكرار الذي يوفره خادم قاعدة البيانات في الإنتاج؛ آمن مع وجود
+    اتصالات مفتوحة على الطرفين. يُستدعى داخل سياق التطبيق.
+    """
+    if db.engine.dialect.name != 'sqlite':
+        return []
+    synced = []
+    source = sqlite3.connect(db.engine.url.database)
+    try:
+        for key in app.config.get('DATABASE_REPLICAS', []):
+            replica = db.engines[key]
+            if replica.dialect.name != 'sqlite':
+                continue
+            target = sqlite3.connect(replica.url.database)
+            try:
+                source.backup(target)
+            finally:
+                target.close()
+            synced.append(key)
+    finally:
+        source.close()
+    return synced
+
+
+def analyze_database(db):
+    """تحديث إحصاءات SQLite (ANALYZE) ليختار المخطِّط فهارس الترتيب في الاستعلامات المربوطة.
+
+    بدونها يبدأ استعلام ?sort=trending من جدول place ويرتب النتائج في B-tree مؤقت
+    بدلاً من قراءة فهرس درجات الرواج بالترتيب.
+    """
+    if db.engine.dialect.name != 'sqlite':
+        return
+    db.session.execute(text('ANALYZE'))
+    db.session.commit()
@@ -0,0 +1,159 @@
+from functools import lru_cache
+from sqlalchemy import DateTime
+from sqlalchemy.orm import configure_mappers
+from src.utils.json_provider import native_datetime
+
+
+def _iso(value):
+    return value.isoformat() if value is not None else None
+
+
+class FieldSpec:
+    """الحقول المتاحة لنموذج مع تعبير SQL لكل حقل، لدعم ?fields= بإسقاط الأعمدة في SELECT.
+
+    fields قاموس مرتب: الاسم -> (تعبير العمود، العلاقة المطلوب ربطها أو None).
+    """
+
+    def __init__(self, fields):
+        self.fields = fields
+        self._serializers = {}
+
+    def parse(self, value):
+        # None يعني عدم طلب إسقاط، فيستخدم المعالج to_dict كالمعتاد
+        if not value:
+            return None
+        names = []
+        for name in value.split(','):
+            name = name.strip()
+            if name and name not in names:
+                names.append(name)
+        unknown = [name for name in names if name not in self.fields]
+        if unknown:
+            raise ValueError(f"حقول غير معروفة: {', '.join(unknown)}")
+        if not names:
+            raise ValueError('قائمة الحقول فارغة')
+        return tuple(names)
+
+    def project(self, query, names, extra=()):
+        """يستبدل كيانات الاستعلام بالأعمدة المطلوبة فقط مع ربط العلاقات اللازمة.
+
+        extra أعمدة إضافية يحتاجها المعالج (مثل أعمدة مؤشر الترقيم) ولا تُسلسل.
+        """
+        columns = [self.fields[name][0].label(name) for name in names]
+        for column in extra:
+            if column.key not in names:
+                columns.append(column.label(column.key))
+
+        query = query.with_entities(*columns)
+        # نقارن بالمفتاح لأن == على علاقة SQLAlchemy تبني تعبير SQL
+        joined = set()
+        for name in names:
+            relationship = self.fields[name][1]
+            if relationship is not None and relationship.key not in joined:
+                query = query.outerjoin(relationship)
+                joined.add(relationship.key)
+        return query
+
+    def serializer(self, names):
+        # دالة تُبنى مرة واحدة لكل مجموعة حقول وتقرأ الصف بالترتيب دون أي بحث بالاسم
+        # إذا كان مزوّد JSON يرمّز datetime مباشرة تُترك التواريخ دون isoformat
+        native = native_datetime()
+        serialize = self._serializers.get((names, native))
+        if serialize is None:
+            converters = tuple(
+                _iso if not native and isinstance(getattr(self.fields[name][0], 'type', None), DateTime) else None
+                for name in names
+            )
+            # أعمدة extra في آخر الصف تُهمل لأن zip يتوقف عند آخر اسم
+            if any(converters):
+                pairs = tuple(zip(names, converters))
+
+                def serialize(row):
+                    return {name: convert(value) if convert else value
+                            for (name, convert), value in zip(pairs, row)}
+            else:
+                def serialize(row):
+                    return dict(zip(names, row))
+            self._serializers[(names, native)] = serialize
+        return serialize
+
+
+@lru_cache(maxsize=None)
+def place_fields():
+    from src.models.place import Place
+    from src.models.user import User
+    # علاقات backref مثل Place.owner لا تُنشأ قبل تهيئة المُخطِّطات
+    configure_mappers()
+    return FieldSpec({
+        'id': (Place.id, None),
+        'name': (Place.name, None),
+        'description': (Place.description, None),
+        'address': (Place.address, None),
+        'phone': (Place.phone, None),
+        'website': (Place.website, None),
+        'category': (Place.category, None),
+        'user_id': (Place.user_id, None),
+        'status': (Place.status, None),
+        'is_featured': (Place.is_featured, None),
+        'image_url': (Place.image_url, None),
+        'latitude': (Place.latitude, None),
+        'longitude': (Place.longitude, None),
+        'created_at': (Place.created_at, None),
+        'updated_at': (Place.updated_at, None),
+        'owner': (User.username, Place.owner),
+    })
+
+
+@lru_cache(maxsize=None)
+def advertisement_fields():
+    from src.models.advertisement import Advertisement
+    from src.models.place import Place
+    from src.models.user import User
+    configure_mappers()
+    return FieldSpec({
+        'id': (Advertisement.id, None),
+        'user_id': (Advertisement.user_id, None),
+        'place_id': (Advertisement.place_id, None),
+        'title': (Advertisement.title, None),
+        'content': (Advertisement.content, None),
+        'image_url': (Advertisement.image_url, None),
+        'start_date': (Advertisement.start_date, None),
+        'end_date': (Advertisement.end_date, None),
+        'is_active': (Advertisement.is_active, None),
+        'created_at': (Advertisement.created_at, None),
+        'updated_at': (Advertisement.updated_at, None),
+        'place_name': (Place.name, Advertisement.place),
+        'user_name': (User.username, Advertisement.user),
+    })
+
+
+@lru_cache(maxsize=None)
+def package_fields():
+    from src.models.package import Package
+    return FieldSpec({
+        'id': (Package.id, None),
+        'name': (Package.name, None),
+        'description': (Package.description, None),
+        'price': (Package.price, None),
+        'duration': (Package.duration, None),
+        'created_at': (Package.created_at, None),
+        'updated_at': (Package.updated_at, None),
+    })
+
+
+@lru_cache(maxsize=None)
+def user_fields():
+    from src.models.user import User
+    return FieldSpec({
+        'id': (User.id, None),
+        'username': (User.username, None),
+        'email': (User.email, None),
+        'role': (User.role, None),
+        'created_at': (User.created_at, None),
+        'updated_at': (User.updated_at, None),
+    })
+
+
+def project_dict(data, names):
+    # للبيانات المسلسلة مسبقاً في الذاكرة (مثل فهرس الإعلانات النشطة)
+    return {name: data.get(name) for name in names}
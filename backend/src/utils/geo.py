@@ -0,0 +1,137 @@
+import math
+from sqlalchemy import text
+from src.models.user import db
+
+EARTH_RADIUS_KM = 6371.0088
+
+DEFAULT_RADIUS_KM = 5.0
+MAX_RADIUS_KM = 50.0
+
+
+def parse_coordinates(latitude, longitude):
+    try:
+        latitude = float(latitude)
+        longitude = float(longitude)
+    except (TypeError, ValueError):
+        raise ValueError('الإحداثيات غير صحيحة')
+    if not -90 <= latitude <= 90 or not -180 <= longitude <= 180:
+        raise ValueError('الإحداثيات خارج النطاق المسموح')
+    return latitude, longitude
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def bounding_box(latitude, longitude, radius_km):
+    # مستطيل يحيط بدائرة البحث؛ الترشيح الدقيق بالمسافة يتم بعده
+    d_lat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    min_lat = max(latitude - d_lat, -90.0)
+    max_lat = min(latitude + d_lat, 90.0)
+
+    cos_lat = math.cos(math.radians(latitude))
+    if max_lat >= 90.0 or min_lat <= -90.0 or cos_lat <= 1e-9:
+        return min_lat, max_lat, -180.0, 180.0
+
+    d_lng = math.degrees(radius_km / (EARTH_RADIUS_KM * cos_lat))
+    min_lng = longitude - d_lng
+    max_lng = longitude + d_lng
+    if min_lng < -180.0 or max_lng > 180.0:
+        # الدائرة تعبر خط التاريخ الدولي: نبحث في كامل خطوط الطول
+        return min_lat, max_lat, -180.0, 180.0
+    return min_lat, max_lat, min_lng, max_lng
+
+
+def is_spatial_index_available():
+    return db.engine.dialect.name == 'sqlite'
+
+
+def ensure_spatial_index():
+    if not is_spatial_index_available():
+        return
+
+    exists = db.session.execute(text(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'place_rtree'"
+    )).first()
+    if exists:
+        return
+
+    db.session.execute(text(
+        'CREATE VIRTUAL TABLE place_rtree USING rtree(id, min_lat, max_lat, min_lng, max_lng)'
+    ))
+    db.session.execute(text(
+        'INSERT INTO place_rtree (id, min_lat, max_lat, min_lng, max_lng) '
+        'SELECT id, latitude, latitude, longitude, longitude FROM place '
+        'WHERE latitude IS NOT NULL AND longitude IS NOT NULL'
+    ))
+    db.session.commit()
+
+
+def index_place_location(place):
+    # يُستدعى داخل معاملة الكتابة نفسها قبل commit
+    if not is_spatial_index_available():
+        return
+    if place.id is None:
+        db.session.flush()
+    remove_place_location(place.id)
+    if place.latitude is None or place.longitude is None:
+        return
+    db.session.execute(
+        text('INSERT INTO place_rtree (id, min_lat, max_lat, min_lng, max_lng) VALUES (:id, :lat, :lat, :lng, :lng)'),
+        {'id': place.id, 'lat': place.latitude, 'lng': place.longitude}
+    )
+
+
+def index_location_rows(rows):
+    # فهرسة دفعة كاملة؛ الصفوف بدون إحداثيات تُتجاهل
+    if not is_spatial_index_available():
+        return
+    params = [
+        {'id': row['id'], 'lat': row['latitude'], 'lng': row['longitude']}
+        for row in rows
+        if row.get('latitude') is not None and row.get('longitude') is not None
+    ]
+    if params:
+        db.session.execute(
+            text('INSERT INTO place_rtree (id, min_lat, max_lat, min_lng, max_lng) VALUES (:id, :lat, :lat, :lng, :lng)'),
+            params
+        )
+
+
+def remove_place_location(place_id):
+    if not is_spatial_index_available():
+        return
+    db.session.execute(text('DELETE FROM place_rtree WHERE id = :id'), {'id': place_id})
+
+
+def nearby_place_ids(latitude, longitude, radius_km, limit, category=None, status='approved'):
+    min_lat, max_lat, min_lng, max_lng = bounding_box(latitude, longitude, radius_km)
+
+    sql = (
+        'SELECT place.id, place.latitude, place.longitude FROM place_rtree '
+        'JOIN place ON place.id = place_rtree.id '
+        'WHERE place_rtree.max_lat >= :min_lat AND place_rtree.min_lat <= :max_lat '
+        'AND place_rtree.max_lng >= :min_lng AND place_rtree.min_lng <= :max_lng '
+        'AND place.status = :status'
+    )
+    params = {
+        'min_lat': min_lat, 'max_lat': max_lat,
+        'min_lng': min_lng, 'max_lng': max_lng,
+        'status': status,
+    }
+    if category:
+        sql += ' AND place.category = :category'
+        params['category'] = category
+
+    results = []
+    for place_id, place_lat, place_lng in db.session.execute(text(sql), params):
+        distance = haversine_km(latitude, longitude, place_lat, place_lng)
+        if distance <= radius_km:
+            results.append((place_id, distance))
+
+    results.sort(key=lambda item: (item[1], item[0]))
+    return results[:limit]
@@ -0,0 +1,143 @@
+import gzip
+import hashlib
+from datetime import timezone
+from functools import wraps
+from flask import g, request, make_response, current_app
+from sqlalchemy import func
+from src.utils.cache import response_cache
+
+try:
+    import brotli
+except ImportError:  # brotli اختياري؛ نكتفي بـ gzip عند غيابه
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json',
+    'application/javascript',
+    'text/html',
+    'text/css',
+    'text/plain',
+    'text/javascript',
+    'image/svg+xml',
+}
+
+ENCODING_SUFFIXES = ('gzip', 'br')
+
+
+def collection_validators(query, updated_column):
+    # أحدث updated_at وعدد الصفوف للمجموعة المرشّحة في استعلام تجميعي واحد
+    return query.order_by(None).with_entities(func.max(updated_column), func.count()).one()
+
+
+def make_etag(last_modified, count, versions=''):
+    args = '&'.join(f'{k}={v}' for k, v in sorted(request.args.items(multi=True)))
+    stamp = last_modified.isoformat() if last_modified else ''
+    raw = f'{request.path}?{args}|{stamp}|{count}|{versions}'
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def matching_etag(etag, last_modified):
+    # يعيد ETag الذي طابقه العميل (بما في ذلك نسخه المضغوطة) أو None إذا تغيرت البيانات
+    # If-None-Match له الأولوية على If-Modified-Since
+    if request.if_none_match:
+        for candidate in (etag, *(f'{etag}-{suffix}' for suffix in ENCODING_SUFFIXES)):
+            if request.if_none_match.contains(candidate):
+                return candidate
+        return None
+    if request.if_modified_since and last_modified:
+        if last_modified.replace(tzinfo=timezone.utc, microsecond=0) <= request.if_modified_since:
+            return etag
+    return None
+
+
+def conditional(query_factory, updated_column, versions=None):
+    """يضيف ETag وLast-Modified ويعيد 304 دون بناء الاستجابة عندما لا تتغير البيانات.
+
+    query_factory يستقبل معاملات المسار نفسها ويعيد الاستعلام المرشّح بدون options.
+    versions دالة اختيارية تعيد أسماء كيانات تدخل أرقام إصداراتها في ذاكرة الاستجابات
+    ضمن ETag، لبيانات تتغير دون أن يتغير updated_column (مثل ترتيب الرواج).
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            try:
+                last_modified, count = collection_validators(query_factory(*args, **kwargs), updated_column)
+            except Exception:
+                return view(*args, **kwargs)
+
+            entities = versions() if versions else ()
+            etag = make_etag(last_modified, count, response_cache.versions(entities) if entities else '')
+            matched = matching_etag(etag, last_modified)
+            if matched:
+                response = current_app.response_class(status=304)
+                etag = matched
+            else:
+                # الذاكرة المؤقتة تضيف ETag إلى مفتاحها فلا يُقدَّم جسم أقدم من ETag المرسل معه
+                g.collection_etag = etag
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag)
+            if last_modified:
+                response.last_modified = last_modified.replace(tzinfo=timezone.utc)
+            response.cache_control.no_cache = True
+            return response
+        return wrapper
+    return decorator
+
+
+class Compress:
+    """ضغط الاستجابات النصية الأكبر من حد معين حسب Accept-Encoding."""
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('COMPRESS_MIN_SIZE', 1024)
+        app.config.setdefault('COMPRESS_GZIP_LEVEL', 6)
+        app.config.setdefault('COMPRESS_BROTLI_QUALITY', 5)
+        app.after_request(self.after_request)
+        app.extensions['compress'] = self
+
+    def available_encodings(self):
+        return ['br', 'gzip'] if brotli is not None else ['gzip']
+
+    def after_request(self, response):
+        if (
+            response.status_code < 200
+            or response.status_code in (204, 304)
+            or response.direct_passthrough
+            or response.is_streamed
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES
+        ):
+            return response
+
+        response.vary.add('Accept-Encoding')
+
+        data = response.get_data()
+        if len(data) < current_app.config['COMPRESS_MIN_SIZE']:
+            return response
+
+        encoding = request.accept_encodings.best_match(self.available_encodings())
+        if encoding is None:
+            return response
+
+        if encoding == 'br':
+            data = brotli.compress(data, quality=current_app.config['COMPRESS_BROTLI_QUALITY'])
+        else:
+            data = gzip.compress(data, compresslevel=current_app.config['COMPRESS_GZIP_LEVEL'])
+
+        response.set_data(data)
+        response.headers['Content-Encoding'] = encoding
+
+        # تمثيل مضغوط مختلف يحتاج ETag قوياً مختلفاً
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(f'{etag}-{encoding}')
+        return response
+
+
+compress = Compress()
@@ -0,0 +1,102 @@
+import decimal
+import json
+import os
+from datetime import date, datetime
+from flask import current_app, has_app_context
+from flask.json.provider import JSONProvider, DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # orjson اختياري؛ نستخدم json القياسية عند غيابه
+    orjson = None
+
+
+def _default(obj):
+    # أنواع لا يعرفها المُرمِّز: صفوف SQLAlchemy والأرقام العشرية والتواريخ (في مسار json القياسي)
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    mapping = getattr(obj, '_mapping', None)
+    if mapping is not None:
+        return dict(mapping)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
+class FastJSONProvider(JSONProvider):
+    """مزوّد JSON يكتب البايتات مباشرة ويرمّز التواريخ بصيغة ISO دون المرور بـ to_dict.
+
+    يستخدم orjson إن كان مثبتاً وإلا json القياسية بنفس المخرجات.
+    """
+
+    # المُسلسِلات يمكنها ترك كائنات datetime كما هي ليرمّزها المزوّد مباشرة
+    native_datetime = True
+
+    sort_keys = True
+    mimetype = 'application/json'
+
+    def dumps_bytes(self, obj):
+        if orjson is not None:
+            option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_SUBCLASS
+            if self.sort_keys:
+                option |= orjson.OPT_SORT_KEYS
+            return orjson.dumps(obj, default=_default, option=option)
+        return json.dumps(
+            obj, default=_default, ensure_ascii=False, separators=(',', ':'), sort_keys=self.sort_keys
+        ).encode('utf-8')
+
+    def dumps(self, obj, **kwargs):
+        return self.dumps_bytes(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if orjson is not None:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.dumps_bytes(obj), mimetype=self.mimetype)
+
+
+JSON_PROVIDERS = {
+    'fast': FastJSONProvider,
+    'default': DefaultJSONProvider,
+}
+
+
+def init_json_provider(app):
+    app.config.setdefault('JSON_PROVIDER', os.environ.get('JSON_PROVIDER', 'fast'))
+    name = app.config['JSON_PROVIDER']
+    if name not in JSON_PROVIDERS:
+        raise ValueError(f'Unknown JSON_PROVIDER: {name}')
+    app.json = JSON_PROVIDERS[name](app)
+
+
+def dumps_bytes(obj):
+    # للمسارات التي تبني الجسم بنفسها (التدفق وفهرس الإعلانات) بنفس مزوّد التطبيق
+    provider = current_app.json
+    if hasattr(provider, 'dumps_bytes'):
+        return provider.dumps_bytes(obj)
+    return provider.dumps(obj).encode('utf-8')
+
+
+def native_datetime():
+    return getattr(current_app.json, 'native_datetime', False)
+
+
+def _iso(value):
+    return value.isoformat() if value is not None else None
+
+
+def _native(value):
+    return value
+
+
+def datetime_encoder():
+    """دالة تحويل التواريخ في to_dict: تترك datetime كما هو لمزوّد يرمّزه بنفسه وإلا isoformat.
+
+    DefaultJSONProvider يرمّز datetime بصيغة HTTP، فمعه (وخارج سياق التطبيق) تبقى isoformat.
+    """
+    return _native if has_app_context() and native_datetime() else _iso
@@ -0,0 +1,202 @@
+import ipaddress
+import os
+import threading
+import time
+from bisect import bisect_left
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+from src.utils.cache import response_cache
+
+# حدود مدرجات زمن الطلب (ثوانٍ) وحجم الاستجابة (بايت)
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# أقصى طول لنص الاستعلام في سجل الطلبات البطيئة
+STATEMENT_PREVIEW = 500
+
+
+class Histogram:
+    __slots__ = ('buckets', 'counts', 'total', 'count')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+class Metrics:
+    """زمن الطلب وعدد استعلامات SQL وزمنها وحجم الاستجابة لكل مسار، بصيغة Prometheus على /metrics.
+
+    القيم خاصة بكل عملية؛ مع gunicorn يعرض كل عامل أرقامه فقط.
+    """
+
+    def __init__(self, app=None):
+        self._lock = threading.Lock()
+        self._requests = {}
+        self._durations = {}
+        self._sizes = {}
+        self._statements = {}
+        self._db_seconds = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('METRICS_ENABLED', os.environ.get('METRICS_ENABLED', 'true') == 'true')
+        app.config.setdefault('METRICS_TOKEN', os.environ.get('METRICS_TOKEN'))
+        app.config.setdefault('SLOW_REQUEST_MS', float(os.environ.get('SLOW_REQUEST_MS', 500)))
+        app.config.setdefault('SLOW_REQUEST_MAX_STATEMENTS', int(os.environ.get('SLOW_REQUEST_MAX_STATEMENTS', 20)))
+        app.extensions['metrics'] = self
+        if not app.config['METRICS_ENABLED']:
+            return
+        app.before_request(self._before_request)
+        # يُسجَّل قبل compress فيُنفَّذ بعده ويقيس الحجم المرسل فعلاً
+        app.after_request(self._after_request)
+        app.add_url_rule('/metrics', 'metrics', self.export)
+
+    def install(self, app, engine):
+        # يُستدعى لكل محرك بعد db.init_app
+        if not app.config['METRICS_ENABLED']:
+            return
+        event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+
+    def _before_request(self):
+        g.metrics_started = time.perf_counter()
+        g.metrics_statements = []
+
+    def _after_request(self, response):
+        started = g.pop('metrics_started', None)
+        if started is None:
+            return response
+        elapsed = time.perf_counter() - started
+        statements = g.pop('metrics_statements', [])
+        db_seconds = sum(duration for _, duration in statements)
+        route = request.url_rule.rule if request.url_rule else '<unmatched>'
+        size = None if response.is_streamed else response.calculate_content_length()
+
+        with self._lock:
+            key = (request.method, route, str(response.status_code))
+            self._requests[key] = self._requests.get(key, 0) + 1
+            route_key = (request.method, route)
+            histogram = self._durations.get(route_key)
+            if histogram is None:
+                histogram = self._durations[route_key] = Histogram(DURATION_BUCKETS)
+            histogram.observe(elapsed)
+            if size is not None:
+                histogram = self._sizes.get(route_key)
+                if histogram is None:
+                    histogram = self._sizes[route_key] = Histogram(SIZE_BUCKETS)
+                histogram.observe(size)
+            self._statements[route_key] = self._statements.get(route_key, 0) + len(statements)
+            self._db_seconds[route_key] = self._db_seconds.get(route_key, 0.0) + db_seconds
+
+        elapsed_ms = elapsed * 1000
+        if elapsed_ms >= current_app.config['SLOW_REQUEST_MS'] or response.status_code >= 500:
+            self._log_request(response, elapsed_ms, statements, db_seconds)
+        return response
+
+    def _log_request(self, response, elapsed_ms, statements, db_seconds):
+        limit = current_app.config['SLOW_REQUEST_MAX_STATEMENTS']
+        slowest = sorted(statements, key=lambda item: item[1], reverse=True)[:limit]
+        lines = [
+            f'{duration * 1000:8.1f} ms  {" ".join(statement.split())[:STATEMENT_PREVIEW]}'
+            for statement, duration in slowest
+        ]
+        current_app.logger.warning(
+            '%s request %s %s -> %d in %.1f ms (%d statements, %.1f ms in DB)%s',
+            'Failed' if response.status_code >= 500 else 'Slow',
+            request.method, request.full_path.rstrip('?'), response.status_code, elapsed_ms,
+            len(statements), db_seconds * 1000, ''.join(f'\n  {line}' for line in lines),
+        )
+
+    def export(self):
+        token = current_app.config['METRICS_TOKEN']
+        if token:
+            if request.headers.get('Authorization') != f'Bearer {token}':
+                return current_app.response_class('Unauthorized', status=401, mimetype='text/plain')
+        elif not _is_loopback(request.remote_addr):
+            # بدون رمز لا تُكشف المسارات وأزمنتها إلا لمن يتصل من الجهاز نفسه
+            return current_app.response_class('Forbidden', status=403, mimetype='text/plain')
+        return current_app.response_class(self.render(), mimetype='text/plain; version=0.0.4')
+
+    def render(self):
+        lines = []
+        with self._lock:
+            lines += [
+                '# HELP http_requests_total Requests by method, route and status.',
+                '# TYPE http_requests_total counter',
+            ]
+            for (method, route, status), count in sorted(self._requests.items()):
+                lines.append(f'http_requests_total{_labels(method=method, route=route, status=status)} {count}')
+            lines += _render_histogram('http_request_duration_seconds', 'Request latency.', self._durations)
+            lines += _render_histogram('http_response_size_bytes', 'Response body size.', self._sizes)
+            lines += [
+                '# HELP db_statements_total SQL statements executed by requests per route.',
+                '# TYPE db_statements_total counter',
+            ]
+            for (method, route), count in sorted(self._statements.items()):
+                lines.append(f'db_statements_total{_labels(method=method, route=route)} {count}')
+            lines += [
+                '# HELP db_duration_seconds_total Time spent in SQL statements per route.',
+                '# TYPE db_duration_seconds_total counter',
+            ]
+            for (method, route), seconds in sorted(self._db_seconds.items()):
+                lines.append(f'db_duration_seconds_total{_labels(method=method, route=route)} {seconds:.6f}')
+
+        stats = response_cache.stats()
+        lines += [
+            '# HELP response_cache_requests_total Response cache lookups by result.',
+            '# TYPE response_cache_requests_total counter',
+            f'response_cache_requests_total{{result="hit"}} {stats["hits"]}',
+            f'response_cache_requests_total{{result="miss"}} {stats["misses"]}',
+        ]
+        return '\n'.join(lines) + '\n'
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info['metrics_started'] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.pop('metrics_started', None)
+    if started is not None and has_request_context():
+        statements = g.get('metrics_statements')
+        if statements is not None:
+            statements.append((statement, time.perf_counter() - started))
+
+
+def _is_loopback(address):
+    try:
+        return ipaddress.ip_address(address or '').is_loopback
+    except ValueError:
+        return False
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels):
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + '}'
+
+
+def _render_histogram(name, description, histograms):
+    lines = [f'# HELP {name} {description}', f'# TYPE {name} histogram']
+    for (method, route), histogram in sorted(histograms.items()):
+        cumulative = 0
+        for bound, count in zip((*histogram.buckets, '+Inf'), histogram.counts):
+            cumulative += count
+            le = str(bound)
+            lines.append(f'{name}_bucket{_labels(method=method, route=route, le=le)} {cumulative}')
+        lines.append(f'{name}_sum{_labels(method=method, route=route)} {histogram.total:.6f}')
+        lines.append(f'{name}_count{_labels(method=method, route=route)} {histogram.count}')
+    return lines
+
+
+metrics = Metrics()
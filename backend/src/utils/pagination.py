@@ -0,0 +1,72 @@
+import base64
+import json
+from datetime import datetime
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def parse_limit(value, default=DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE):
+    # الحد الأقصى لحجم الصفحة يفرضه الخادم مهما طلب العميل
+    try:
+        limit = int(value) if value is not None else default
+    except (TypeError, ValueError):
+        raise ValueError('قيمة limit غير صحيحة')
+    if limit < 1:
+        raise ValueError('قيمة limit غير صحيحة')
+    return min(limit, maximum)
+
+
+def encode_cursor(values):
+    # المؤشر معتم بالنسبة للعميل: قيم مفتاح الترتيب لآخر صف في الصفحة
+    payload = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, types):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        if not isinstance(payload, list) or len(payload) != len(types):
+            raise ValueError
+        values = []
+        for value, kind in zip(payload, types):
+            if kind is datetime:
+                values.append(datetime.fromisoformat(value))
+            elif kind is bool:
+                values.append(bool(value))
+            else:
+                values.append(kind(value))
+        return values
+    except (ValueError, TypeError, UnicodeDecodeError, json.JSONDecodeError):
+        raise ValueError('مؤشر الصفحة غير صحيح')
+
+
+def keyset_page(query, sort_columns, cursor_types, cursor=None, limit=DEFAULT_PAGE_SIZE, row_key=None):
+    """ترقيم الصفحات بمفتاح الترتيب (keyset) بدلاً من OFFSET.
+
+    يجب أن تكون جميع أعمدة الترتيب تنازلية وأن يكون آخرها فريداً (مثل id)،
+    فتكون كلفة أي صفحة ثابتة مهما كان موقعها في الجدول.
+    row_key يستخرج قيم الترتيب من الصف عندما لا تكون سمات مباشرة عليه (أعمدة جدول مربوط).
+    """
+    from sqlalchemy import tuple_
+
+    if cursor:
+        values = decode_cursor(cursor, cursor_types)
+        query = query.filter(tuple_(*sort_columns) < tuple_(*values))
+
+    query = query.order_by(*[column.desc() for column in sort_columns])
+
+    # نجلب صفاً إضافياً لمعرفة وجود صفحة تالية دون استعلام COUNT
+    rows = query.limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    next_cursor = None
+    if has_more and rows:
+        last = rows[-1]
+        values = row_key(last) if row_key else [getattr(last, column.key) for column in sort_columns]
+        next_cursor = encode_cursor(values)
+
+    return rows, next_cursor
@@ -0,0 +1,83 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from werkzeug.security import generate_password_hash, check_password_hash
+
+
+def _pool_context():
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+
+class PasswordHasher:
+    """تشفير كلمات المرور والتحقق منها في مجمع عمليات محدود الحجم.
+
+    الخوارزمية وكلفتها تأتيان من PASSWORD_HASH_METHOD بصيغة Werkzeug
+    (مثل scrypt:32768:8:1 أو pbkdf2:sha256:600000)، والتجزئات القديمة
+    يعاد تشفيرها عند تسجيل الدخول الناجح إذا تغيرت هذه المعاملات.
+    """
+
+    def __init__(self, app=None):
+        self.method = 'scrypt'
+        self.workers = 0
+        self._executor = None
+        self._executor_pid = None
+        self._method_prefix = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('PASSWORD_HASH_METHOD', os.environ.get('PASSWORD_HASH_METHOD', 'scrypt'))
+        # 0 يعني التنفيذ داخل خيط الطلب نفسه دون مجمع عمليات. الافتراضي يقسم أنوية الجهاز
+        # على عمليات gunicorn (WEB_CONCURRENCY) فلا تتجاوز المجمعات مجتمعة عدد الأنوية؛
+        # مع الإعداد الافتراضي (2 × الأنوية + 1 عملية) يكون 0 لأن العمليات نفسها متوازية
+        web_workers = max(int(os.environ.get('WEB_CONCURRENCY', 1)), 1)
+        default_workers = min((os.cpu_count() or 1) // web_workers, 4)
+        app.config.setdefault('PASSWORD_HASH_WORKERS', int(os.environ.get('PASSWORD_HASH_WORKERS', default_workers)))
+        self.method = app.config['PASSWORD_HASH_METHOD']
+        self.workers = app.config['PASSWORD_HASH_WORKERS']
+        self._method_prefix = None
+        app.extensions['password_hasher'] = self
+
+    def _get_executor(self):
+        if self.workers <= 0:
+            return None
+        with self._lock:
+            # المجمع لا ينتقل عبر fork، فكل عملية عاملة تنشئ مجمعها الخاص. عملياته تبدأ بـ
+            # forkserver (أو spawn) لا بـ fork من عملية فيها خيوط قد تحمل أقفالاً لحظة النسخ
+            if self._executor is None or self._executor_pid != os.getpid():
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=_pool_context())
+                self._executor_pid = os.getpid()
+            return self._executor
+
+    def _run(self, func, *args):
+        executor = self._get_executor()
+        if executor is None:
+            return func(*args)
+        return executor.submit(func, *args).result()
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, password_hash, password):
+        return self._run(check_password_hash, password_hash, password)
+
+    def method_prefix(self):
+        # البادئة الكاملة للمعاملات الحالية بعد تطبيق القيم الافتراضية لـ Werkzeug
+        if self._method_prefix is None:
+            self._method_prefix = generate_password_hash('', self.method).split('$', 1)[0]
+        return self._method_prefix
+
+    def needs_rehash(self, password_hash):
+        return password_hash.split('$', 1)[0] != self.method_prefix()
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+
+password_hasher = PasswordHasher()
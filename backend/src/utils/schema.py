@@ -0,0 +1,25 @@
+from sqlalchemy import inspect, text
+from src.models.user import db
+
+
+def upgrade_schema():
+    # create_all لا يعدّل الجداول الموجودة مسبقاً، فنضيف الأعمدة الاختيارية والفهارس الناقصة
+    preparer = db.engine.dialect.identifier_preparer
+
+    # الفحص والتعديل على الاتصال نفسه حتى لا ينتظر اتصال ثانٍ قفل الكتابة الذي يحمله الأول
+    with db.engine.begin() as conn:
+        inspector = inspect(conn)
+        for table in db.metadata.sorted_tables:
+            existing = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing or not column.nullable:
+                    continue
+                column_type = column.type.compile(dialect=db.engine.dialect)
+                conn.execute(text(
+                    f'ALTER TABLE {preparer.quote(table.name)} '
+                    f'ADD COLUMN {preparer.quote(column.name)} {column_type}'
+                ))
+
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(db.engine, checkfirst=True)
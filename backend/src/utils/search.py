@@ -0,0 +1,130 @@
+import re
+from sqlalchemy import text
+from src.models.user import db
+
+# وزن الأعمدة في bm25 بنفس ترتيب أعمدة الجدول: الاسم ثم الوصف ثم العنوان
+BM25_WEIGHTS = (10.0, 1.0, 3.0)
+
+# bm25 يعيد قيمة سالبة (الأصغر أفضل)، فالضرب في معامل أكبر من 1 يقدّم الأماكن المميزة
+FEATURED_BOOST = 2.0
+
+# الحركات والتنوين والشدة والسكون والألف الخنجرية والتطويل
+_ARABIC_MARKS = re.compile('[\u0610-\u061a\u064b-\u065f\u0670\u06d6-\u06ed\u0640]')
+
+_ARABIC_LETTERS = str.maketrans({
+    'أ': 'ا',
+    'إ': 'ا',
+    'آ': 'ا',
+    'ٱ': 'ا',
+    'ى': 'ي',
+    'ئ': 'ي',
+    'ؤ': 'و',
+    'ة': 'ه',
+})
+
+# أداة التعريف في بداية الكلمة حتى تطابق "الأمل" البحث عن "أمل"
+_DEFINITE_ARTICLE = re.compile(r'\bال(?=\w{2,})')
+
+_TOKEN = re.compile(r'\w+', re.UNICODE)
+
+
+def normalize_text(value):
+    # توحيد أشكال الحروف العربية وإزالة التشكيل قبل الفهرسة وقبل البحث
+    if not value:
+        return ''
+    value = _ARABIC_MARKS.sub('', value).translate(_ARABIC_LETTERS)
+    return _DEFINITE_ARTICLE.sub('', value).lower()
+
+
+def build_match_query(q):
+    # كل كلمة تصبح عبارة بين علامتي تنصيص مع مطابقة البادئة، والكلمات مجتمعة بـ AND
+    tokens = _TOKEN.findall(normalize_text(q))
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def is_search_available():
+    return db.engine.dialect.name == 'sqlite'
+
+
+def ensure_search_index():
+    if not is_search_available():
+        return
+
+    exists = db.session.execute(text(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'place_fts'"
+    )).first()
+    if exists:
+        return
+
+    db.session.execute(text(
+        "CREATE VIRTUAL TABLE place_fts USING fts5("
+        "name, description, address, tokenize = 'unicode61 remove_diacritics 2')"
+    ))
+
+    # بناء الفهرس للأماكن الموجودة مسبقاً
+    rows = db.session.execute(text('SELECT id, name, description, address FROM place')).all()
+    if rows:
+        db.session.execute(
+            text('INSERT INTO place_fts (rowid, name, description, address) VALUES (:id, :name, :description, :address)'),
+            [_index_params(*row) for row in rows]
+        )
+    db.session.commit()
+
+
+def _index_params(place_id, name, description, address):
+    return {
+        'id': place_id,
+        'name': normalize_text(name),
+        'description': normalize_text(description),
+        'address': normalize_text(address),
+    }
+
+
+def index_place(place):
+    # يُستدعى داخل معاملة الكتابة نفسها قبل commit
+    if not is_search_available():
+        return
+    if place.id is None:
+        db.session.flush()
+    remove_place(place.id)
+    db.session.execute(
+        text('INSERT INTO place_fts (rowid, name, description, address) VALUES (:id, :name, :description, :address)'),
+        _index_params(place.id, place.name, place.description, place.address)
+    )
+
+
+def index_place_rows(rows):
+    # فهرسة دفعة كاملة بعملية executemany واحدة؛ كل صف يحتوي id وname وdescription وaddress
+    if not is_search_available() or not rows:
+        return
+    db.session.execute(
+        text('INSERT INTO place_fts (rowid, name, description, address) VALUES (:id, :name, :description, :address)'),
+        [_index_params(row['id'], row.get('name'), row.get('description'), row.get('address')) for row in rows]
+    )
+
+
+def remove_place(place_id):
+    if not is_search_available():
+        return
+    db.session.execute(text('DELETE FROM place_fts WHERE rowid = :id'), {'id': place_id})
+
+
+def search_place_ids(q, limit, category=None, status='approved'):
+    match = build_match_query(q)
+    if not match:
+        return []
+
+    weights = ', '.join(str(weight) for weight in BM25_WEIGHTS)
+    sql = (
+        f'SELECT place.id FROM place_fts JOIN place ON place.id = place_fts.rowid '
+        f'WHERE place_fts MATCH :match AND place.status = :status'
+    )
+    params = {'match': match, 'status': status, 'boost': FEATURED_BOOST, 'limit': limit}
+    if category:
+        sql += ' AND place.category = :category'
+        params['category'] = category
+    sql += (
+        f' ORDER BY bm25(place_fts, {weights}) * '
+        f'CASE WHEN place.is_featured THEN :boost ELSE 1.0 END, place.id DESC LIMIT :limit'
+    )
+    return [row[0] for row in db.session.execute(text(sql), params)]
@@ -0,0 +1,147 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+from datetime import datetime, timezone
+from flask import request
+from werkzeug.wsgi import wrap_file
+from src.utils.http import COMPRESSIBLE_MIMETYPES, brotli
+
+# ملفات Vite المبنية تحمل بصمة المحتوى في اسمها (assets/index-BxY1z2Ab.js) فلا تتغير أبداً؛
+# بقية الملفات (مثل apple-touch-icon.png) قد تُستبدل بنفس الاسم فلا تُخزَّن كثابتة
+HASHED_ASSET = re.compile(r'^assets/[^/]+-[A-Za-z0-9_-]{8}\.[A-Za-z0-9]+$')
+
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+
+# الامتدادات بترتيب التفضيل عند التفاوض على الترميز
+SIBLINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+class StaticAsset:
+    __slots__ = ('path', 'mimetype', 'etag', 'last_modified', 'immutable', 'variants')
+
+    def __init__(self, path, mimetype, etag, last_modified, immutable):
+        self.path = path
+        self.mimetype = mimetype
+        self.etag = etag
+        self.last_modified = last_modified
+        self.immutable = immutable
+        # الترميز -> (المسار على القرص، الحجم)؛ None للملف الأصلي
+        self.variants = {}
+
+
+class StaticManifest:
+    """فهرس في الذاكرة لملفات static يُبنى مرة عند الإقلاع.
+
+    يحفظ بصمة كل ملف ونسخه المضغوطة مسبقاً (.gz و.br بجانبه) فيُخدم الطلب
+    دون os.path.exists أو os.stat ودون ضغط أثناء الطلب.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self.assets = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        app.extensions['static_manifest'] = self
+        # فهرسة فقط دون الكتابة على القرص؛ النسخ المضغوطة ينشئها أمر build-static عند النشر
+        self.build()
+
+    def build(self, write_siblings=False):
+        """مسح مجلد static، مع إنشاء النسخ المضغوطة الناقصة أو القديمة عند write_siblings. يعيد عدد الملفات."""
+        folder = self.app.static_folder
+        assets = {}
+        if folder and os.path.isdir(folder):
+            for root, _, files in os.walk(folder):
+                for name in files:
+                    if name.endswith(('.gz', '.br', '.tmp')):
+                        continue
+                    path = os.path.join(root, name)
+                    relative = os.path.relpath(path, folder).replace(os.sep, '/')
+                    assets[relative] = self._load(path, relative, write_siblings)
+        self.assets = assets
+        return len(assets)
+
+    def _load(self, path, relative, write_siblings):
+        with open(path, 'rb') as source:
+            data = source.read()
+        stat = os.stat(path)
+        mimetype = mimetypes.guess_type(relative)[0] or 'application/octet-stream'
+        asset = StaticAsset(
+            path,
+            mimetype,
+            hashlib.sha1(data).hexdigest()[:20],
+            datetime.fromtimestamp(int(stat.st_mtime), tz=timezone.utc),
+            bool(HASHED_ASSET.match(relative)),
+        )
+        asset.variants[None] = (path, len(data))
+
+        if mimetype not in COMPRESSIBLE_MIMETYPES or len(data) < self.app.config.get('COMPRESS_MIN_SIZE', 1024):
+            return asset
+        for encoding, suffix in SIBLINGS:
+            if encoding == 'br' and brotli is None:
+                continue
+            sibling = path + suffix
+            if write_siblings and not _is_fresh(sibling, stat.st_mtime):
+                try:
+                    _write_sibling(sibling, encoding, data)
+                except OSError:
+                    self.app.logger.warning('Cannot write %s; serving %s uncompressed', sibling, relative)
+                    continue
+            if os.path.exists(sibling) and _is_fresh(sibling, stat.st_mtime):
+                asset.variants[encoding] = (sibling, os.path.getsize(sibling))
+        return asset
+
+    def get(self, path):
+        return self.assets.get(path)
+
+    def send(self, asset):
+        encodings = [encoding for encoding, _ in SIBLINGS if encoding in asset.variants]
+        encoding = request.accept_encodings.best_match(encodings) if encodings else None
+        path, size = asset.variants[encoding]
+
+        response = self.app.response_class(
+            wrap_file(request.environ, open(path, 'rb')),
+            mimetype=asset.mimetype,
+            direct_passthrough=True,
+        )
+        response.content_length = size
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        if encodings:
+            response.vary.add('Accept-Encoding')
+        response.set_etag(f'{asset.etag}-{encoding}' if encoding else asset.etag)
+        response.last_modified = asset.last_modified
+        if asset.immutable:
+            response.cache_control.public = True
+            response.cache_control.max_age = IMMUTABLE_MAX_AGE
+            response.cache_control.immutable = True
+        else:
+            # index.html وما شابهه يُعاد التحقق منه في كل مرة ليلتقط العميل البناء الجديد
+            response.cache_control.no_cache = True
+        return response.make_conditional(request)
+
+
+def _is_fresh(sibling, source_mtime):
+    try:
+        return os.stat(sibling).st_mtime >= source_mtime
+    except OSError:
+        return False
+
+
+def _write_sibling(sibling, encoding, data):
+    if encoding == 'br':
+        compressed = brotli.compress(data, quality=11)
+    else:
+        compressed = gzip.compress(data, compresslevel=9, mtime=0)
+    # الكتابة إلى ملف مؤقت ثم الاستبدال حتى لا تقرأ عملية أخرى ملفاً ناقصاً
+    temporary = f'{sibling}.{os.getpid()}.tmp'
+    with open(temporary, 'wb') as target:
+        target.write(compressed)
+    os.replace(temporary, sibling)
+
+
+static_manifest = StaticManifest()
@@ -0,0 +1,38 @@
+from flask import Response, request, stream_with_context
+from src.utils.json_provider import dumps_bytes
+
+YIELD_PER = 500
+
+# حجم الجزء المرسل تقريباً بالبايت
+CHUNK_SIZE = 64 * 1024
+
+
+def wants_stream():
+    return request.args.get('stream') == 'true'
+
+
+def stream_json_array(query, serialize=lambda row: row.to_dict()):
+    """يرسل نتائج الاستعلام كمصفوفة JSON على أجزاء أثناء قراءتها من قاعدة البيانات.
+
+    الذاكرة القصوى تعادل دفعة yield_per واحدة مهما كان عدد الصفوف.
+    """
+    def generate():
+        parts = [b'[']
+        size = 1
+        first = True
+        for row in query.yield_per(YIELD_PER):
+            item = dumps_bytes(serialize(row))
+            if not first:
+                parts.append(b',')
+                size += 1
+            parts.append(item)
+            size += len(item)
+            first = False
+            if size >= CHUNK_SIZE:
+                yield b''.join(parts)
+                parts = []
+                size = 0
+        parts.append(b']')
+        yield b''.join(parts)
+
+    return Response(stream_with_context(generate()), mimetype='application/json')
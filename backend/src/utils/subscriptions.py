@@ -0,0 +1,109 @@
+import os
+import threading
+from datetime import datetime
+from sqlalchemy import select, update, exists, and_
+from src.models.user import db, User
+from src.models.package import UserSubscription
+
+
+def sweep_expired_subscriptions(batch_size=500, now=None):
+    """إلغاء الاشتراكات المنتهية وتخفيض دور أصحابها بتحديثات جماعية على دفعات.
+
+    يعيد (عدد الاشتراكات الملغاة، عدد المستخدمين الذين خُفّض دورهم).
+    """
+    now = now or datetime.utcnow()
+    expired_total = 0
+    demoted_total = 0
+
+    while True:
+        rows = db.session.execute(
+            select(UserSubscription.id, UserSubscription.user_id).where(
+                UserSubscription.is_active == True,
+                UserSubscription.end_date < now
+            ).limit(batch_size)
+        ).all()
+        if not rows:
+            break
+
+        subscription_ids = [row.id for row in rows]
+        user_ids = {row.user_id for row in rows}
+
+        db.session.execute(
+            update(UserSubscription)
+            .where(UserSubscription.id.in_(subscription_ids))
+            .values(is_active=False)
+        )
+
+        # تخفيض الدور فقط لمن لم يعد لديه أي اشتراك ساري
+        still_active = exists().where(and_(
+            UserSubscription.user_id == User.id,
+            UserSubscription.is_active == True,
+            UserSubscription.end_date > now
+        ))
+        result = db.session.execute(
+            update(User)
+            .where(User.id.in_(user_ids), User.role == 'premium', ~still_active)
+            .values(role='user')
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+
+        expired_total += len(subscription_ids)
+        demoted_total += result.rowcount
+
+        if len(rows) < batch_size:
+            break
+
+    return expired_total, demoted_total
+
+
+class SubscriptionSweeper:
+    """خيط خلفي يشغّل sweep_expired_subscriptions كل فترة بدلاً من الكتابة داخل طلبات GET."""
+
+    def __init__(self, app=None):
+        self.app = None
+        self._thread = None
+        self._stop = threading.Event()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('SUBSCRIPTION_SWEEP_ENABLED', os.environ.get('SUBSCRIPTION_SWEEP_ENABLED', 'true') == 'true')
+        app.config.setdefault('SUBSCRIPTION_SWEEP_INTERVAL', int(os.environ.get('SUBSCRIPTION_SWEEP_INTERVAL', 60)))
+        app.config.setdefault('SUBSCRIPTION_SWEEP_BATCH_SIZE', int(os.environ.get('SUBSCRIPTION_SWEEP_BATCH_SIZE', 500)))
+        self.app = app
+        app.extensions['subscription_sweeper'] = self
+
+    def start(self):
+        if self._thread is not None or not self.app.config['SUBSCRIPTION_SWEEP_ENABLED']:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='subscription-sweeper', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def sweep(self):
+        with self.app.app_context():
+            try:
+                expired, demoted = sweep_expired_subscriptions(self.app.config['SUBSCRIPTION_SWEEP_BATCH_SIZE'])
+                if expired:
+                    self.app.logger.info('Expired %d subscriptions, demoted %d users', expired, demoted)
+            except Exception:
+                db.session.rollback()
+                self.app.logger.exception('Subscription sweep failed')
+            finally:
+                db.session.remove()
+
+    def _run(self):
+        interval = self.app.config['SUBSCRIPTION_SWEEP_INTERVAL']
+        while not self._stop.is_set():
+            self.sweep()
+            self._stop.wait(interval)
+
+
+subscription_sweeper = SubscriptionSweeper()
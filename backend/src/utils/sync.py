@@ -0,0 +1,122 @@
+from datetime import datetime, timedelta
+from sqlalchemy import tuple_
+from sqlalchemy.orm import joinedload
+from src.models.place import Place
+from src.models.package import Package
+from src.models.advertisement import Advertisement
+from src.models.tombstone import Tombstone
+from src.utils.pagination import encode_cursor, decode_cursor
+
+# الصفوف الأحدث من هذا الهامش لا تُعاد بعد: معاملة بدأت قبله قد لا تكون ثبّتت
+# صفوفها بعد، ولو أُعيدت الأحدث منها لتجاوزها المؤشر عند ظهورها لاحقاً
+SYNC_HORIZON_SECONDS = 5
+
+EPOCH = datetime(1970, 1, 1)
+
+# موضع كل مصدر (updated_at، id) ثم علامة التحميل الأول؛ expiry موضعه (end_date، id)
+FEEDS = ('place', 'package', 'advertisement', 'tombstone', 'expiry')
+CURSOR_TYPES = (datetime, int) * len(FEEDS) + (bool,)
+
+
+def _changed_rows(query, updated_column, id_column, position, horizon, limit):
+    # ترتيب تصاعدي بمفتاح (updated_at، id) عبر فهرس ix_*_updated
+    rows = query.filter(
+        tuple_(updated_column, id_column) > tuple_(*position),
+        updated_column < horizon
+    ).order_by(updated_column, id_column).limit(limit + 1).all()
+    return rows[:limit], len(rows) > limit
+
+
+def _next_position(rows, has_more, position, horizon, updated_attr):
+    if has_more:
+        last = rows[-1]
+        return (getattr(last, updated_attr), last.id)
+    # كل ما قبل الأفق أُعيد؛ الصفوف عند الأفق نفسه أو بعده تأتي في الطلب التالي
+    return max(tuple(position), (horizon, 0))
+
+
+def changes_since(cursor, limit):
+    """التغييرات منذ المؤشر: الصفوف المضافة أو المعدلة والمحذوفة مع مؤشر جديد.
+
+    بدون مؤشر يعاد الفهرس كاملاً (على صفحات) دون سجلات الحذف. الأماكن غير
+    المعتمدة والإعلانات الموقوفة أو المنتهية تُعاد ضمن deleted لأنها خرجت من الفهرس
+    العام، ومنها الإعلانات التي انتهت بمرور end_date دون أي تعديل. يرفع ValueError
+    لمؤشر غير صالح.
+    """
+    now = datetime.utcnow()
+    horizon = now - timedelta(seconds=SYNC_HORIZON_SECONDS)
+    if cursor:
+        values = decode_cursor(cursor, CURSOR_TYPES)
+        initial = values[-1]
+    else:
+        values, initial = [EPOCH, 0] * len(FEEDS), True
+    positions = {feed: tuple(values[index * 2:index * 2 + 2]) for index, feed in enumerate(FEEDS)}
+
+    result = {
+        'places': [], 'packages': [], 'advertisements': [],
+        'deleted': {'place': [], 'package': [], 'advertisement': []},
+    }
+    next_positions = {}
+    has_more = False
+
+    places, more = _changed_rows(
+        Place.query.options(joinedload(Place.owner)), Place.updated_at, Place.id,
+        positions['place'], horizon, limit
+    )
+    for place in places:
+        if place.status == 'approved':
+            result['places'].append(place.to_dict())
+        elif not initial:
+            result['deleted']['place'].append(place.id)
+    next_positions['place'] = _next_position(places, more, positions['place'], horizon, 'updated_at')
+    has_more |= more
+
+    packages, more = _changed_rows(
+        Package.query, Package.updated_at, Package.id, positions['package'], horizon, limit
+    )
+    result['packages'] = [package.to_dict() for package in packages]
+    next_positions['package'] = _next_position(packages, more, positions['package'], horizon, 'updated_at')
+    has_more |= more
+
+    advertisements, more = _changed_rows(
+        Advertisement.query.options(joinedload(Advertisement.place), joinedload(Advertisement.user)),
+        Advertisement.updated_at, Advertisement.id, positions['advertisement'], horizon, limit
+    )
+    for advertisement in advertisements:
+        # الإعلانات المجدولة تُرسل مع start_date ويعرضها العميل عند حلول موعدها
+        if advertisement.is_active and advertisement.end_date and advertisement.end_date >= now:
+            result['advertisements'].append(advertisement.to_dict())
+        elif not initial:
+            result['deleted']['advertisement'].append(advertisement.id)
+    next_positions['advertisement'] = _next_position(
+        advertisements, more, positions['advertisement'], horizon, 'updated_at'
+    )
+    has_more |= more
+
+    if initial:
+        # النسخة الكاملة لا تحتاج سجلات الحذف السابقة ولا الإعلانات المنتهية قبلها
+        next_positions['tombstone'] = max(positions['tombstone'], (horizon, 0))
+        next_positions['expiry'] = max(positions['expiry'], (horizon, 0))
+    else:
+        tombstones, more = _changed_rows(
+            Tombstone.query, Tombstone.deleted_at, Tombstone.id, positions['tombstone'], horizon, limit
+        )
+        for tombstone in tombstones:
+            result['deleted'].setdefault(tombstone.entity, []).append(tombstone.entity_id)
+        next_positions['tombstone'] = _next_position(tombstones, more, positions['tombstone'], horizon, 'deleted_at')
+        has_more |= more
+
+        # انتهاء الإعلان بمرور الوقت لا يغيّر updated_at، فتُقرأ الإعلانات التي عبر
+        # end_date الحالي لها الأفق منذ الطلب السابق (عبر ix_advertisement_active_window)
+        expired, more = _changed_rows(
+            Advertisement.query.filter(Advertisement.is_active == True),
+            Advertisement.end_date, Advertisement.id, positions['expiry'], horizon, limit
+        )
+        result['deleted']['advertisement'].extend(advertisement.id for advertisement in expired)
+        next_positions['expiry'] = _next_position(expired, more, positions['expiry'], horizon, 'end_date')
+        has_more |= more
+
+    values = [value for feed in FEEDS for value in next_positions[feed]]
+    result['cursor'] = encode_cursor(values + [initial and has_more])
+    result['has_more'] = has_more
+    return result
@@ -0,0 +1,183 @@
+import random
+from datetime import datetime, timedelta
+from sqlalchemy import func, insert
+from src.models.user import db, User
+from src.models.place import Place, PlaceStats
+from src.models.package import Package, UserSubscription
+from src.models.advertisement import Advertisement
+from src.utils.bulk import BATCH_SIZE, batched
+from src.utils.cache import response_cache
+from src.utils.geo import index_location_rows
+from src.utils.passwords import password_hasher
+from src.utils.search import index_place_rows
+from src.utils.trending import place_stats_rows
+
+# التوزيعات التقريبية لبيانات الإنتاج: (القيمة، الوزن)
+ROLES = (('user', 84), ('premium', 15), ('admin', 1))
+STATUSES = (('approved', 75), ('pending', 20), ('rejected', 5))
+CATEGORIES = (
+    ('restaurant', 30), ('shopping', 15), ('hotel', 10), ('entertainment', 10), ('pharmacy', 8),
+    ('gas_station', 8), ('bank', 7), ('other', 7), ('hospital', 5),
+)
+CATEGORY_NAMES = {
+    'restaurant': 'مطعم', 'shopping': 'مركز', 'hotel': 'فندق', 'entertainment': 'ملاهي',
+    'pharmacy': 'صيدلية', 'gas_station': 'محطة', 'bank': 'بنك', 'other': 'مؤسسة', 'hospital': 'مستشفى',
+}
+NAME_WORDS = ('الأمل', 'النخيل', 'الواحة', 'السلام', 'الريان', 'البحر', 'الشرق', 'الفيصلية', 'الياسمين', 'الروضة')
+STREETS = ('شارع الملك فهد', 'طريق الملك عبدالعزيز', 'شارع التحلية', 'طريق الأمير سلطان', 'شارع العليا')
+# مراكز المدن مع وزن كل مدينة
+CITIES = (
+    ((24.7136, 46.6753), 40), ((21.4858, 39.1925), 25), ((26.4207, 50.0888), 15),
+    ((21.3891, 39.8579), 10), ((24.4672, 39.6111), 10),
+)
+PACKAGES = (
+    ('الباقة الأساسية', 'ظهور مميز لمدة شهر', 99.0, 30),
+    ('الباقة الفضية', 'ظهور مميز وإعلانات لثلاثة أشهر', 249.0, 90),
+    ('الباقة الذهبية', 'ظهور مميز وإعلانات لمدة سنة', 799.0, 365),
+)
+
+DEFAULT_PASSWORD = 'password123'
+
+
+def _pick(rng, choices):
+    values, weights = zip(*choices)
+    return rng.choices(values, weights)[0]
+
+
+def _next_id(model):
+    return (db.session.query(func.max(model.id)).scalar() or 0) + 1
+
+
+def _insert(model, rows, batch_size):
+    for batch in batched(rows, batch_size):
+        db.session.execute(insert(model), batch)
+
+
+def generate_synthetic_data(users=100, places=1000, packages=3, subscriptions=None, advertisements=200,
+                            seed=42, batch_size=BATCH_SIZE):
+    """توليد بيانات تجريبية قابلة للتكرار بنفس البذرة وإدخالها بدفعات جماعية.
+
+    تُحدَّث فهارس البحث والمكان للأماكن الجديدة وتُرفع نسخ الذاكرة المؤقتة.
+    يعيد عدد الصفوف المضافة لكل جدول.
+    """
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    if subscriptions is None:
+        subscriptions = users // 3
+
+    # تجزئة كلمة المرور مرة واحدة لجميع المستخدمين؛ التجزئة لكل مستخدم تستغرق دقائق
+    password_hash = password_hasher.hash(DEFAULT_PASSWORD)
+    first_user = _next_id(User)
+    user_rows = []
+    for offset in range(users):
+        user_id = first_user + offset
+        created = now - timedelta(days=rng.uniform(0, 730))
+        user_rows.append({
+            'id': user_id, 'username': f'user{user_id}', 'email': f'user{user_id}@example.com',
+            'password_hash': password_hash, 'role': _pick(rng, ROLES),
+            'created_at': created, 'updated_at': created,
+        })
+    _insert(User, user_rows, batch_size)
+    user_ids = [row['id'] for row in user_rows] or [user.id for user in User.query.with_entities(User.id)]
+    premium_ids = [row['id'] for row in user_rows if row['role'] == 'premium'] or user_ids
+
+    first_package = _next_id(Package)
+    package_rows = []
+    for offset in range(packages):
+        name, description, price, duration = PACKAGES[offset % len(PACKAGES)]
+        if offset >= len(PACKAGES):
+            name = f'{name} {offset // len(PACKAGES) + 1}'
+        package_rows.append({
+            'id': first_package + offset, 'name': name, 'description': description,
+            'price': price, 'duration': duration, 'created_at': now, 'updated_at': now,
+        })
+    _insert(Package, package_rows, batch_size)
+    package_durations = {row['id']: row['duration'] for row in package_rows}
+
+    first_place = _next_id(Place)
+    place_rows = []
+    for offset in range(places):
+        place_id = first_place + offset
+        category = _pick(rng, CATEGORIES)
+        status = _pick(rng, STATUSES)
+        created = now - timedelta(days=rng.uniform(0, 365))
+        latitude = longitude = None
+        if rng.random() < 0.9:
+            latitude, longitude = _pick(rng, CITIES)
+            latitude += rng.gauss(0, 0.08)
+            longitude += rng.gauss(0, 0.08)
+        place_rows.append({
+            'id': place_id,
+            'name': f'{CATEGORY_NAMES[category]} {rng.choice(NAME_WORDS)} {place_id}',
+            'description': f'{CATEGORY_NAMES[category]} في حي {rng.choice(NAME_WORDS)} ' * rng.randint(1, 6),
+            'address': f'{rng.choice(STREETS)}، {rng.randint(1, 400)}',
+            'phone': f'05{rng.randint(10000000, 99999999)}',
+            'website': f'https://example.com/places/{place_id}' if rng.random() < 0.4 else None,
+            'category': category,
+            'user_id': rng.choice(user_ids),
+            'status': status,
+            'is_featured': status == 'approved' and rng.random() < 0.05,
+            'image_url': f'https://example.com/images/{place_id}.jpg' if rng.random() < 0.6 else None,
+            'latitude': latitude,
+            'longitude': longitude,
+            'created_at': created,
+            'updated_at': created + (now - created) * rng.random(),
+        })
+    _insert(Place, place_rows, batch_size)
+    _insert(PlaceStats, place_stats_rows([row['id'] for row in place_rows], now), batch_size)
+    for batch in batched(place_rows, batch_size):
+        index_place_rows(batch)
+        index_location_rows(batch)
+
+    subscription_rows = []
+    if package_durations:
+        for _ in range(subscriptions):
+            package_id = rng.choice(list(package_durations))
+            # نحو 70% سارية والباقي منتهية
+            start = now - timedelta(days=rng.uniform(0, package_durations[package_id] * (1 if rng.random() < 0.7 else 3)))
+            end = start + timedelta(days=package_durations[package_id])
+            subscription_rows.append({
+                'user_id': rng.choice(premium_ids), 'package_id': package_id, 'start_date': start,
+                'end_date': end, 'is_active': end > now, 'created_at': start,
+            })
+    _insert(UserSubscription, subscription_rows, batch_size)
+
+    approved_by_owner = {}
+    for row in place_rows:
+        if row['status'] == 'approved':
+            approved_by_owner.setdefault(row['user_id'], []).append(row['id'])
+    advertisement_rows = []
+    for _ in range(advertisements):
+        user_id = rng.choice(premium_ids)
+        owned = approved_by_owner.get(user_id)
+        # نافذة العرض: 60% سارية الآن، 20% منتهية، 20% مستقبلية
+        window = rng.random()
+        if window < 0.6:
+            start = now - timedelta(days=rng.uniform(0, 30))
+        elif window < 0.8:
+            start = now - timedelta(days=rng.uniform(60, 120))
+        else:
+            start = now + timedelta(days=rng.uniform(1, 30))
+        advertisement_rows.append({
+            'user_id': user_id,
+            'place_id': rng.choice(owned) if owned and rng.random() < 0.7 else None,
+            'title': f'عرض خاص من {rng.choice(NAME_WORDS)}',
+            'content': 'خصومات لفترة محدودة ' * rng.randint(1, 4),
+            'image_url': f'https://example.com/ads/{rng.randint(1, 10 ** 6)}.jpg' if rng.random() < 0.5 else None,
+            'start_date': start,
+            'end_date': start + timedelta(days=rng.uniform(7, 45)),
+            'is_active': rng.random() < 0.9,
+            'created_at': start,
+            'updated_at': start,
+        })
+    _insert(Advertisement, advertisement_rows, batch_size)
+
+    db.session.commit()
+    response_cache.bump('user', 'place', 'package', 'advertisement')
+    return {
+        'users': len(user_rows),
+        'places': len(place_rows),
+        'packages': len(package_rows),
+        'subscriptions': len(subscription_rows),
+        'advertisements': len(advertisement_rows),
+    }
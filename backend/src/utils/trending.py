@@ -0,0 +1,172 @@
+import atexit
+import math
+import os
+import threading
+import time
+from datetime import datetime
+from functools import wraps
+from flask import make_response
+from sqlalchemy import select, update, insert, exists, literal
+from src.models.user import db
+from src.models.place import Place, PlaceStats
+from src.utils.bulk import BATCH_SIZE, batched
+from src.utils.cache import response_cache
+
+
+def decayed_score(current, views, now, half_life_hours):
+    """إضافة views مشاهدة عند الزمن now إلى درجة رواج مخزنة بصيغة log2.
+
+    الدرجة هي log2(Σ n × 2^(t / نصف العمر)) (تناقص أمامي): المشاهدات الأقدم وزنها أقل
+    بنفس النسبة لكل الأماكن، فلا يلزم إعادة حساب الدرجات القديمة مع مرور الوقت.
+    """
+    added = now.timestamp() / 3600 / half_life_hours + math.log2(views)
+    if current is None:
+        return added
+    high, low = max(current, added), min(current, added)
+    return high + math.log2(1 + 2 ** (low - high))
+
+
+def place_stats_rows(place_ids, now=None):
+    # صف بدرجة صفرية لكل مكان جديد: ترتيب الرواج يضع الأماكن غير المشاهدة بعد المشاهدة، الأحدث أولاً
+    now = now or datetime.utcnow()
+    return [{'place_id': place_id, 'views': 0, 'trending_score': 0.0, 'updated_at': now} for place_id in place_ids]
+
+
+def ensure_place_stats():
+    """إنشاء صفوف place_stats الناقصة للأماكن الموجودة قبل إضافة الجدول. يعيد عدد الصفوف."""
+    missing = select(
+        Place.id, literal(0), literal(0.0), literal(datetime.utcnow())
+    ).where(~exists().where(PlaceStats.place_id == Place.id))
+    result = db.session.execute(
+        insert(PlaceStats).from_select(['place_id', 'views', 'trending_score', 'updated_at'], missing)
+    )
+    db.session.commit()
+    return result.rowcount
+
+
+def flush_place_views(counts, half_life_hours, now=None):
+    """كتابة عدادات المشاهدة المجمعة {place_id: views} بتحديث/إدخال جماعي لكل دفعة.
+
+    يعيد عدد الأماكن المحدثة؛ الأماكن المحذوفة منذ تسجيل المشاهدة تُتجاهل.
+    """
+    now = now or datetime.utcnow()
+    flushed = 0
+    for batch in batched(sorted(counts.items()), BATCH_SIZE):
+        ids = [place_id for place_id, _ in batch]
+        rows = db.session.execute(
+            select(Place.id, PlaceStats.views, PlaceStats.trending_score)
+            .outerjoin(PlaceStats, PlaceStats.place_id == Place.id)
+            .where(Place.id.in_(ids))
+            # PostgreSQL يرفض FOR UPDATE على الطرف القابل للقيمة NULL من outer join؛ قفل صفوف
+            # المكان يكفي لتسلسل الكتابات المتزامنة على إحصاءاته
+            .with_for_update(of=Place)
+        ).all()
+        existing = {row.id: row for row in rows}
+
+        updates, inserts = [], []
+        for place_id, views in batch:
+            row = existing.get(place_id)
+            if row is None:
+                continue
+            if row.views is None:
+                inserts.append({
+                    'place_id': place_id, 'views': views, 'updated_at': now,
+                    'trending_score': decayed_score(None, views, now, half_life_hours),
+                })
+            else:
+                updates.append({
+                    'place_id': place_id, 'views': row.views + views, 'updated_at': now,
+                    'trending_score': decayed_score(row.trending_score, views, now, half_life_hours),
+                })
+        if inserts:
+            db.session.execute(insert(PlaceStats), inserts)
+        if updates:
+            # تحديث جماعي بالمفتاح الأساسي (executemany)
+            db.session.execute(update(PlaceStats), updates)
+        flushed += len(inserts) + len(updates)
+    db.session.commit()
+    return flushed
+
+
+class PlaceViewCounter:
+    """تجميع مشاهدات صفحة المكان في الذاكرة وكتابتها كل فترة بدلاً من UPDATE لكل طلب."""
+
+    def __init__(self, app=None):
+        self.app = None
+        self._counts = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('VIEW_COUNTER_ENABLED', os.environ.get('VIEW_COUNTER_ENABLED', 'true') == 'true')
+        app.config.setdefault('VIEW_FLUSH_INTERVAL', float(os.environ.get('VIEW_FLUSH_INTERVAL', 60)))
+        app.config.setdefault('TRENDING_HALF_LIFE_HOURS', float(os.environ.get('TRENDING_HALF_LIFE_HOURS', 24)))
+        self.app = app
+        app.extensions['place_views'] = self
+
+    def record(self, place_id, views=1):
+        with self._lock:
+            self._counts[place_id] = self._counts.get(place_id, 0) + views
+
+    def counted(self, view):
+        # يُطبَّق فوق conditional لتُحسب طلبات 304 أيضاً
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            response = make_response(view(*args, **kwargs))
+            if self.app.config['VIEW_COUNTER_ENABLED'] and response.status_code in (200, 304):
+                self.record(kwargs['place_id'])
+            return response
+        return wrapper
+
+    def flush(self):
+        with self._lock:
+            counts, self._counts = self._counts, {}
+        if not counts:
+            return 0
+        with self.app.app_context():
+            try:
+                flushed = flush_place_views(counts, self.app.config['TRENDING_HALF_LIFE_HOURS'])
+            except Exception:
+                db.session.rollback()
+                # إعادة العدادات لتُكتب في الدورة التالية
+                with self._lock:
+                    for place_id, views in counts.items():
+                        self._counts[place_id] = self._counts.get(place_id, 0) + views
+                self.app.logger.exception('Flushing place views failed')
+                return 0
+            finally:
+                db.session.remove()
+            if flushed:
+                response_cache.bump('trending')
+            return flushed
+
+    def start(self):
+        if self._thread is not None or not self.app.config['VIEW_COUNTER_ENABLED']:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='place-view-flusher', daemon=True)
+        self._thread.start()
+        # كتابة ما تبقى في الذاكرة عند إيقاف العملية
+        atexit.register(self.stop)
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def _run(self):
+        interval = self.app.config['VIEW_FLUSH_INTERVAL']
+        while not self._stop.wait(interval):
+            started = time.perf_counter()
+            flushed = self.flush()
+            if flushed:
+                self.app.logger.debug('Flushed views for %d places in %.1f ms',
+                                      flushed, (time.perf_counter() - started) * 1000)
+
+
+place_views = PlaceViewCounter()
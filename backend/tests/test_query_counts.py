@@ -0,0 +1,141 @@
+"""عدد استعلامات SQL لنقاط القوائم لا يتغير مع عدد الصفوف (لا استعلام لكل صف).
+
+الاستخدام (من مجلد backend):
+    python -m pytest -q tests
+"""
+import os
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+from flask import has_request_context
+from sqlalchemy import event
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# عدد الصفوف في القياس الأول؛ القياس الثاني بعشرة أضعافه
+N = 30
+
+# القوائم العامة
+PUBLIC_URLS = ['/api/places/', '/api/places/?all=true', '/api/advertisements/']
+
+# قوائم المستخدم المسجل: كل اشتراك في باقة مختلفة وكل إعلان على مكان مختلف، فأي
+# تحميل كسول للعلاقات يظهر كاستعلام إضافي لكل صف
+OWNER_URLS = ['/api/packages/my-subscriptions', '/api/advertisements/my-ads', '/api/places/my-places']
+
+
+@pytest.fixture(scope='module')
+def app(tmp_path_factory):
+    database = tmp_path_factory.mktemp('db') / 'test.db'
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv('DATABASE_URL', f'sqlite:///{database}')
+        mp.setenv('PASSWORD_HASH_WORKERS', '0')
+        # الذاكرة المؤقتة تخفي الاستعلامات عند تكرار الطلب
+        mp.setenv('RESPONSE_CACHE_ENABLED', 'false')
+        mp.setenv('RESPONSE_CACHE_PATH', str(database.with_name('response_cache.db')))
+
+        from src.main import create_app, db
+        from src.utils.ad_index import active_ads
+        from src.utils.commands import init_database
+
+        app = create_app()
+        with app.app_context():
+            init_database(app)
+        # فحص ختم الإعلانات عند كل طلب فيعاد بناء الفهرس بعد كل بذر
+        mp.setattr(active_ads, 'check_interval', 0)
+        yield app
+        with app.app_context():
+            db.engine.dispose()
+
+
+@pytest.fixture(scope='module')
+def owner_id(app):
+    from src.models.user import db, User
+    with app.app_context():
+        user = User(username='query_count_owner', email='owner@example.com', role='premium', password_hash='-')
+        db.session.add(user)
+        db.session.commit()
+        return user.id
+
+
+def seed(app, users, places, advertisements):
+    from src.utils.synthetic import generate_synthetic_data
+    with app.app_context():
+        generate_synthetic_data(users=users, places=places, packages=0,
+                                advertisements=advertisements, seed=places)
+
+
+def seed_owner(app, user_id, count):
+    from src.models.user import db
+    from src.models.place import Place
+    from src.models.package import Package, UserSubscription
+    from src.models.advertisement import Advertisement
+
+    now = datetime.utcnow()
+    with app.app_context():
+        packages = [Package(name=f'package {i}', price=10, duration=30) for i in range(count)]
+        places = [Place(name=f'place {i}', category='restaurant', status='approved', user_id=user_id)
+                  for i in range(count)]
+        db.session.add_all(packages + places)
+        db.session.flush()
+        for package, place in zip(packages, places):
+            db.session.add(UserSubscription(user_id=user_id, package_id=package.id,
+                                            start_date=now, end_date=now + timedelta(days=30)))
+            db.session.add(Advertisement(user_id=user_id, place_id=place.id, title=place.name,
+                                         start_date=now, end_date=now + timedelta(days=30)))
+        db.session.commit()
+
+
+def count_statements(app, url, user_id=None):
+    from src.main import db
+
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if has_request_context():
+            statements.append(statement)
+
+    client = app.test_client()
+    if user_id is not None:
+        with client.session_transaction() as session:
+            session['user_id'] = user_id
+            session['user_role'] = 'premium'
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        response = client.get(url)
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+    assert response.status_code == 200, response.get_data(as_text=True)
+    data = response.get_json()
+    rows = data['places'] if isinstance(data, dict) else data
+    return len(statements), len(rows)
+
+
+def assert_constant(small, large):
+    for url in small:
+        (small_count, small_rows), (large_count, large_rows) = small[url], large[url]
+        assert large_rows >= small_rows, url
+        assert small_count == large_count, f'{url}: {small_count} statements for N rows, {large_count} for 10N'
+
+
+def test_list_endpoints_query_count_is_constant(app):
+    seed(app, users=N, places=N, advertisements=N)
+    small = {url: count_statements(app, url) for url in PUBLIC_URLS}
+
+    seed(app, users=9 * N, places=9 * N, advertisements=9 * N)
+    large = {url: count_statements(app, url) for url in PUBLIC_URLS}
+
+    assert_constant(small, large)
+
+
+def test_owner_lists_query_count_is_constant(app, owner_id):
+    seed_owner(app, owner_id, N)
+    small = {url: count_statements(app, url, owner_id) for url in OWNER_URLS}
+
+    seed_owner(app, owner_id, 9 * N)
+    large = {url: count_statements(app, url, owner_id) for url in OWNER_URLS}
+
+    assert large['/api/advertisements/my-ads'][1] == 10 * N
+    assert_constant(small, large)
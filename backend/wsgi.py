@@ -0,0 +1,7 @@
+"""نقطة دخول الإنتاج لخوادم WSGI متعددة العمليات.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+"""
+from src.main import create_app
+
+app = create_app()
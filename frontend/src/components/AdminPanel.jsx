@@ -4,6 +4,7 @@ import { useNavigate } from 'react-router-dom'
 import { Button } from '@/components/ui/button'
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '@/components/ui/card'
 import { Badge } from '@/components/ui/badge'
+import { Checkbox } from '@/components/ui/checkbox'
 import { Alert, AlertDescription } from '@/components/ui/alert'
 import { Tabs, TabsContent, TabsList, TabsTrigger } from '@/components/ui/tabs'
 import { 
@@ -18,7 +19,10 @@ import {
 
 const AdminPanel = () => {
   const [pendingPlaces, setPendingPlaces] = useState([])
+  const [nextCursor, setNextCursor] = useState(null)
+  const [selected, setSelected] = useState(new Set())
   const [loading, setLoading] = useState(true)
+  const [loadingMore, setLoadingMore] = useState(false)
   const [error, setError] = useState('')
   const [success, setSuccess] = useState('')
 
@@ -33,15 +37,21 @@ const AdminPanel = () => {
     fetchPendingPlaces()
   }, [user, navigate])
 
-  const fetchPendingPlaces = async () => {
+  const fetchPendingPlaces = async (cursor = null) => {
     try {
-      const response = await fetch('/api/places/pending', {
+      const params = new URLSearchParams({ limit: '50' })
+      if (cursor) {
+        params.set('cursor', cursor)
+      }
+      const response = await fetch(`/api/places/pending?${params}`, {
         credentials: 'include'
       })
       
       if (response.ok) {
         const data = await response.json()
-        setPendingPlaces(data)
+        // الصفحات التالية تُضاف إلى نهاية القائمة
+        setPendingPlaces(prev => cursor ? [...prev, ...data.places] : data.places)
+        setNextCursor(data.next_cursor)
       } else {
         setError('فشل في جلب الأماكن المعلقة')
       }
@@ -49,26 +59,45 @@ const AdminPanel = () => {
       setError('حدث خطأ في الاتصال')
     } finally {
       setLoading(false)
+      setLoadingMore(false)
     }
   }
 
-  const handlePlaceAction = async (placeId, action) => {
+  const loadMore = () => {
+    setLoadingMore(true)
+    fetchPendingPlaces(nextCursor)
+  }
+
+  // تطبيق الحالة أو التمييز على عدة أماكن في طلب واحد
+  const moderatePlaces = async (placeIds, changes) => {
     try {
-      const response = await fetch(`/api/places/${placeId}`, {
-        method: 'PUT',
+      const response = await fetch('/api/places/moderate', {
+        method: 'POST',
         headers: {
           'Content-Type': 'application/json'
         },
         credentials: 'include',
-        body: JSON.stringify({ status: action })
+        body: JSON.stringify({ ids: placeIds, ...changes })
       })
 
       const data = await response.json()
 
       if (response.ok) {
         setSuccess(data.message)
-        // إزالة المكان من القائمة
-        setPendingPlaces(prev => prev.filter(place => place.id !== placeId))
+        const handled = new Set(placeIds)
+        if (changes.status) {
+          // إزالة الأماكن التي تمت مراجعتها من القائمة
+          setPendingPlaces(prev => prev.filter(place => !handled.has(place.id)))
+        } else {
+          setPendingPlaces(prev => 
+            prev.map(place => 
+              handled.has(place.id) 
+                ? { ...place, is_featured: changes.is_featured }
+                : place
+            )
+          )
+        }
+        setSelected(prev => new Set([...prev].filter(id => !handled.has(id))))
         setTimeout(() => setSuccess(''), 3000)
       } else {
         setError(data.error)
@@ -80,38 +109,28 @@ const AdminPanel = () => {
     }
   }
 
-  const toggleFeatured = async (placeId, currentStatus) => {
-    try {
-      const response = await fetch(`/api/places/${placeId}`, {
-        method: 'PUT',
-        headers: {
-          'Content-Type': 'application/json'
-        },
-        credentials: 'include',
-        body: JSON.stringify({ is_featured: !currentStatus })
-      })
+  const handlePlaceAction = (placeId, action) => moderatePlaces([placeId], { status: action })
 
-      const data = await response.json()
+  const toggleFeatured = (placeId, currentStatus) => moderatePlaces([placeId], { is_featured: !currentStatus })
 
-      if (response.ok) {
-        setSuccess(data.message)
-        // تحديث الحالة في القائمة
-        setPendingPlaces(prev => 
-          prev.map(place => 
-            place.id === placeId 
-              ? { ...place, is_featured: !currentStatus }
-              : place
-          )
-        )
-        setTimeout(() => setSuccess(''), 3000)
+  const handleBulkAction = (action) => moderatePlaces([...selected], { status: action })
+
+  const toggleSelected = (placeId) => {
+    setSelected(prev => {
+      const next = new Set(prev)
+      if (next.has(placeId)) {
+        next.delete(placeId)
       } else {
-        setError(data.error)
-        setTimeout(() => setError(''), 3000)
+        next.add(placeId)
       }
-    } catch (error) {
-      setError('حدث خطأ في الاتصال')
-      setTimeout(() => setError(''), 3000)
-    }
+      return next
+    })
+  }
+
+  const allSelected = pendingPlaces.length > 0 && pendingPlaces.every(place => selected.has(place.id))
+
+  const toggleAll = () => {
+    setSelected(allSelected ? new Set() : new Set(pendingPlaces.map(place => place.id)))
   }
 
   if (!user || user.role !== 'admin') {
@@ -149,7 +168,7 @@ const AdminPanel = () => {
         <TabsList>
           <TabsTrigger value="pending" className="flex items-center space-x-2 space-x-reverse">
             <MapPin className="h-4 w-4" />
-            <span>الأماكن المعلقة ({pendingPlaces.length})</span>
+            <span>الأماكن المعلقة ({pendingPlaces.length}{nextCursor ? '+' : ''})</span>
           </TabsTrigger>
           <TabsTrigger value="users" className="flex items-center space-x-2 space-x-reverse">
             <Users className="h-4 w-4" />
@@ -178,10 +197,43 @@ const AdminPanel = () => {
                 </div>
               ) : (
                 <div className="space-y-4">
+                  <div className="flex items-center justify-between">
+                    <label className="flex items-center space-x-2 space-x-reverse text-sm text-gray-600">
+                      <Checkbox checked={allSelected} onCheckedChange={toggleAll} />
+                      <span>تحديد الكل ({selected.size} محدد)</span>
+                    </label>
+                    <div className="flex space-x-2 space-x-reverse">
+                      <Button
+                        size="sm"
+                        disabled={selected.size === 0}
+                        onClick={() => handleBulkAction('approved')}
+                        className="bg-green-600 hover:bg-green-700 flex items-center space-x-1 space-x-reverse"
+                      >
+                        <Check className="h-4 w-4" />
+                        <span>موافقة على المحدد</span>
+                      </Button>
+                      <Button
+                        size="sm"
+                        variant="destructive"
+                        disabled={selected.size === 0}
+                        onClick={() => handleBulkAction('rejected')}
+                        className="flex items-center space-x-1 space-x-reverse"
+                      >
+                        <X className="h-4 w-4" />
+                        <span>رفض المحدد</span>
+                      </Button>
+                    </div>
+                  </div>
+
                   {pendingPlaces.map(place => (
                     <Card key={place.id} className="border-l-4 border-l-yellow-400">
                       <CardContent className="pt-6">
                         <div className="flex justify-between items-start space-x-4 space-x-reverse">
+                          <Checkbox
+                            checked={selected.has(place.id)}
+                            onCheckedChange={() => toggleSelected(place.id)}
+                            className="mt-1"
+                          />
                           <div className="flex-1 space-y-2">
                             <div className="flex items-center space-x-2 space-x-reverse">
                               <h3 className="text-lg font-semibold">{place.name}</h3>
@@ -254,6 +306,14 @@ const AdminPanel = () => {
                       </CardContent>
                     </Card>
                   ))}
+
+                  {nextCursor && (
+                    <div className="text-center">
+                      <Button variant="outline" onClick={loadMore} disabled={loadingMore}>
+                        {loadingMore ? 'جاري التحميل...' : 'تحميل المزيد'}
+                      </Button>
+                    </div>
+                  )}
                 </div>
               )}
             </CardContent>
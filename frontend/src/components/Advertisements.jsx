@@ -8,6 +8,7 @@ import { Label } from '@/components/ui/label'
 import { Textarea } from '@/components/ui/textarea'
 import { Alert, AlertDescription } from '@/components/ui/alert'
 import { Tabs, TabsContent, TabsList, TabsTrigger } from '@/components/ui/tabs'
+import { fetchBatch } from '@/lib/api'
 import { 
   Megaphone, 
   Plus, 
@@ -16,6 +17,9 @@ import {
   Calendar
 } from 'lucide-react'
 
+// أقصى حجم صفحة يقبله الخادم
+const PLACES_PAGE_SIZE = 100
+
 const Advertisements = () => {
   const [advertisements, setAdvertisements] = useState([])
   const [myAds, setMyAds] = useState([])
@@ -45,29 +49,33 @@ const Advertisements = () => {
 
   const fetchData = async () => {
     try {
-      // جلب جميع الإعلانات
-      const adsResponse = await fetch('/api/advertisements')
-      if (adsResponse.ok) {
-        const adsData = await adsResponse.json()
-        setAdvertisements(adsData)
+      // جلب جميع الإعلانات وإعلانات المستخدم والصفحة الأولى من أماكنه المعتمدة في طلب واحد
+      const [adsResult, myAdsResult, placesResult] = await fetchBatch([
+        '/api/advertisements/',
+        '/api/advertisements/my-ads',
+        `/api/places/my-places?status=approved&limit=${PLACES_PAGE_SIZE}`
+      ])
+      if (adsResult.status === 200) {
+        setAdvertisements(adsResult.body)
       }
-
-      // جلب إعلانات المستخدم
-      const myAdsResponse = await fetch('/api/advertisements/my-ads', {
-        credentials: 'include'
-      })
-      if (myAdsResponse.ok) {
-        const myAdsData = await myAdsResponse.json()
-        setMyAds(myAdsData)
+      if (myAdsResult.status === 200) {
+        setMyAds(myAdsResult.body)
       }
-
-      // جلب أماكن المستخدم المعتمدة
-      const placesResponse = await fetch('/api/places?status=approved', {
-        credentials: 'include'
-      })
-      if (placesResponse.ok) {
-        const placesData = await placesResponse.json()
-        const myPlaces = placesData.filter(place => place.user_id === user.id)
+      if (placesResult.status === 200) {
+        // بقية صفحات الأماكن (إن وجدت) لقائمة اختيار المكان في النموذج
+        let { places: myPlaces, next_cursor: cursor } = placesResult.body
+        while (cursor) {
+          const response = await fetch(
+            `/api/places/my-places?status=approved&limit=${PLACES_PAGE_SIZE}&cursor=${cursor}`,
+            { credentials: 'include' }
+          )
+          if (!response.ok) {
+            break
+          }
+          const data = await response.json()
+          myPlaces = [...myPlaces, ...data.places]
+          cursor = data.next_cursor
+        }
         setUserPlaces(myPlaces)
       }
     } catch (error) {
@@ -319,6 +327,9 @@ const Advertisements = () => {
                                 </span>
                               </div>
                               <p>الحالة: {ad.is_active ? 'نشط' : 'غير نشط'}</p>
+                              {ad.stats && (
+                                <p>مرات الظهور: {ad.stats.impressions} · النقرات: {ad.stats.clicks}</p>
+                              )}
                             </div>
 
                             {ad.image_url && (
@@ -3,6 +3,7 @@ import { Link } from 'react-router-dom'
 import { Button } from '@/components/ui/button'
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '@/components/ui/card'
 import { Badge } from '@/components/ui/badge'
+import { fetchBatch } from '@/lib/api'
 import { 
   MapPin, 
   Star, 
@@ -13,6 +14,14 @@ import {
   TrendingUp
 } from 'lucide-react'
 
+// إشارات الظهور والنقر تُجمع في الخادم وتُكتب على دفعات
+const sendAdEvents = (events) => {
+  const body = JSON.stringify(events)
+  if (!navigator.sendBeacon || !navigator.sendBeacon('/api/advertisements/events', body)) {
+    fetch('/api/advertisements/events', { method: 'POST', body, keepalive: true }).catch(() => {})
+  }
+}
+
 const Home = () => {
   const [places, setPlaces] = useState([])
   const [advertisements, setAdvertisements] = useState([])
@@ -37,20 +46,25 @@ const Home = () => {
     fetchData()
   }, [])
 
+  useEffect(() => {
+    const shown = advertisements.slice(0, 3).map(ad => ad.id)
+    if (shown.length > 0) {
+      sendAdEvents({ impressions: shown })
+    }
+  }, [advertisements])
+
   const fetchData = async () => {
     try {
-      // جلب الأماكن المعتمدة
-      const placesResponse = await fetch('/api/places?status=approved')
-      if (placesResponse.ok) {
-        const placesData = await placesResponse.json()
-        setPlaces(placesData)
+      // جلب الأماكن المعتمدة والإعلانات النشطة في طلب واحد
+      const [placesResult, adsResult] = await fetchBatch([
+        '/api/places/?status=approved',
+        '/api/advertisements/'
+      ])
+      if (placesResult.status === 200) {
+        setPlaces(placesResult.body.places)
       }
-
-      // جلب الإعلانات النشطة
-      const adsResponse = await fetch('/api/advertisements')
-      if (adsResponse.ok) {
-        const adsData = await adsResponse.json()
-        setAdvertisements(adsData)
+      if (adsResult.status === 200) {
+        setAdvertisements(adsResult.body)
       }
     } catch (error) {
       console.error('Error fetching data:', error)
@@ -129,7 +143,11 @@ const Home = () => {
           </h2>
           <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6">
             {advertisements.slice(0, 3).map(ad => (
-              <Card key={ad.id} className="border-2 border-yellow-200 bg-yellow-50">
+              <Card 
+                key={ad.id} 
+                className="border-2 border-yellow-200 bg-yellow-50 cursor-pointer"
+                onClick={() => sendAdEvents({ clicks: [ad.id] })}
+              >
                 <CardHeader>
                   <CardTitle className="text-lg">{ad.title}</CardTitle>
                   <Badge variant="secondary" className="w-fit">إعلان مدفوع</Badge>
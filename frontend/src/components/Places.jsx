@@ -1,4 +1,4 @@
-import { useState, useEffect } from 'react'
+import { useState, useEffect, useRef } from 'react'
 import { Link } from 'react-router-dom'
 import { Button } from '@/components/ui/button'
 import { Card, CardContent, CardHeader, CardTitle } from '@/components/ui/card'
@@ -15,9 +15,13 @@ import {
 
 const Places = () => {
   const [places, setPlaces] = useState([])
+  const [nextCursor, setNextCursor] = useState(null)
   const [loading, setLoading] = useState(true)
+  const [loadingMore, setLoadingMore] = useState(false)
   const [searchTerm, setSearchTerm] = useState('')
   const [selectedCategory, setSelectedCategory] = useState('')
+  // تجاهل الاستجابات المتأخرة لفلتر سابق
+  const latestRequest = useRef(0)
 
   const categories = [
     { value: '', label: 'جميع الفئات' },
@@ -32,16 +36,41 @@ const Places = () => {
     { value: 'other', label: 'أخرى' }
   ]
 
+  // الفلترة في الخادم: تغيير الفئة أو نص البحث يعيد الجلب من الصفحة الأولى
   useEffect(() => {
-    fetchPlaces()
-  }, [])
+    const timer = setTimeout(() => fetchPlaces(), searchTerm ? 300 : 0)
+    return () => clearTimeout(timer)
+  }, [selectedCategory, searchTerm])
 
-  const fetchPlaces = async () => {
+  const fetchPlaces = async (cursor = null) => {
+    const requestId = ++latestRequest.current
     try {
-      const response = await fetch('/api/places?status=approved')
+      const query = searchTerm.trim()
+      const params = new URLSearchParams()
+      if (selectedCategory) {
+        params.set('category', selectedCategory)
+      }
+      let url
+      if (query) {
+        // البحث النصي يعيد أفضل النتائج ترتيباً دون ترقيم
+        params.set('q', query)
+        params.set('limit', '100')
+        url = `/api/places/search?${params}`
+      } else {
+        params.set('status', 'approved')
+        if (cursor) {
+          params.set('cursor', cursor)
+        }
+        url = `/api/places?${params}`
+      }
+      const response = await fetch(url)
+      if (requestId !== latestRequest.current) {
+        return
+      }
       if (response.ok) {
         const data = await response.json()
-        setPlaces(data)
+        setPlaces(prev => cursor ? [...prev, ...data.places] : data.places)
+        setNextCursor(data.next_cursor || null)
       }
     } catch (error) {
       console.error('Error fetching places:', error)
@@ -50,12 +79,11 @@ const Places = () => {
     }
   }
 
-  const filteredPlaces = places.filter(place => {
-    const matchesSearch = place.name.toLowerCase().includes(searchTerm.toLowerCase()) ||
-                         place.description.toLowerCase().includes(searchTerm.toLowerCase())
-    const matchesCategory = selectedCategory === '' || place.category === selectedCategory
-    return matchesSearch && matchesCategory
-  })
+  const loadMore = async () => {
+    setLoadingMore(true)
+    await fetchPlaces(nextCursor)
+    setLoadingMore(false)
+  }
 
   const getCategoryLabel = (category) => {
     const cat = categories.find(c => c.value === category)
@@ -117,11 +145,11 @@ const Places = () => {
 
       {/* عدد النتائج */}
       <div className="text-sm text-gray-600">
-        عرض {filteredPlaces.length} من أصل {places.length} مكان
+        عرض {places.length} مكان{nextCursor ? ' (يوجد المزيد)' : ''}
       </div>
 
       {/* قائمة الأماكن */}
-      {filteredPlaces.length === 0 ? (
+      {places.length === 0 ? (
         <div className="text-center py-12">
           <MapPin className="h-16 w-16 text-gray-300 mx-auto mb-4" />
           <h3 className="text-lg font-medium text-gray-900 mb-2">لا توجد أماكن</h3>
@@ -132,7 +160,7 @@ const Places = () => {
         </div>
       ) : (
         <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6">
-          {filteredPlaces.map(place => (
+          {places.map(place => (
             <Card key={place.id} className="hover:shadow-lg transition-shadow">
               <CardHeader>
                 <div className="flex justify-between items-start">
@@ -200,6 +228,14 @@ const Places = () => {
           ))}
         </div>
       )}
+
+      {nextCursor && (
+        <div className="flex justify-center mt-8">
+          <Button variant="outline" onClick={loadMore} disabled={loadingMore}>
+            {loadingMore ? 'جاري التحميل...' : 'عرض المزيد'}
+          </Button>
+        </div>
+      )}
     </div>
   )
 }
@@ -16,6 +16,8 @@ import {
 
 const Profile = () => {
   const [userPlaces, setUserPlaces] = useState([])
+  const [placesCursor, setPlacesCursor] = useState(null)
+  const [loadingMore, setLoadingMore] = useState(false)
   const [userSubscriptions, setUserSubscriptions] = useState([])
   const [loading, setLoading] = useState(true)
 
@@ -32,16 +34,8 @@ const Profile = () => {
 
   const fetchUserData = async () => {
     try {
-      // جلب أماكن المستخدم
-      const placesResponse = await fetch('/api/places', {
-        credentials: 'include'
-      })
-      if (placesResponse.ok) {
-        const placesData = await placesResponse.json()
-        // فلترة الأماكن التي أضافها المستخدم الحالي
-        const myPlaces = placesData.filter(place => place.user_id === user.id)
-        setUserPlaces(myPlaces)
-      }
+      // جلب الصفحة الأولى من أماكن المستخدم بكل حالاتها
+      await fetchUserPlaces()
 
       // جلب اشتراكات المستخدم
       const subscriptionsResponse = await fetch('/api/packages/my-subscriptions', {
@@ -58,6 +52,32 @@ const Profile = () => {
     }
   }
 
+  const fetchUserPlaces = async (cursor = null) => {
+    const params = new URLSearchParams()
+    if (cursor) {
+      params.set('cursor', cursor)
+    }
+    const response = await fetch(`/api/places/my-places?${params}`, {
+      credentials: 'include'
+    })
+    if (response.ok) {
+      const data = await response.json()
+      setUserPlaces(prev => cursor ? [...prev, ...data.places] : data.places)
+      setPlacesCursor(data.next_cursor || null)
+    }
+  }
+
+  const loadMorePlaces = async () => {
+    setLoadingMore(true)
+    try {
+      await fetchUserPlaces(placesCursor)
+    } catch (error) {
+      console.error('Error fetching user places:', error)
+    } finally {
+      setLoadingMore(false)
+    }
+  }
+
   const getStatusBadge = (status) => {
     const statusConfig = {
       pending: { label: 'في الانتظار', variant: 'secondary' },
@@ -134,7 +154,7 @@ const Profile = () => {
         <TabsList>
           <TabsTrigger value="places" className="flex items-center space-x-2 space-x-reverse">
             <MapPin className="h-4 w-4" />
-            <span>أماكني ({userPlaces.length})</span>
+            <span>أماكني ({userPlaces.length}{placesCursor ? '+' : ''})</span>
           </TabsTrigger>
           <TabsTrigger value="subscriptions" className="flex items-center space-x-2 space-x-reverse">
             <Package className="h-4 w-4" />
@@ -198,6 +218,13 @@ const Profile = () => {
                       </CardContent>
                     </Card>
                   ))}
+                  {placesCursor && (
+                    <div className="flex justify-center">
+                      <Button variant="outline" onClick={loadMorePlaces} disabled={loadingMore}>
+                        {loadingMore ? 'جاري التحميل...' : 'عرض المزيد'}
+                      </Button>
+                    </div>
+                  )}
                 </div>
               )}
             </CardContent>
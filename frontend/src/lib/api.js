@@ -0,0 +1,11 @@
+// جلب عدة مسارات GET في طلب واحد عبر /api/batch
+// يعيد مصفوفة من { path, status, etag, body } بنفس ترتيب المسارات
+export const fetchBatch = async (paths) => {
+  const query = new URLSearchParams(paths.map(path => ['path', path]))
+  const response = await fetch(`/api/batch/?${query}`, { credentials: 'include' })
+  if (!response.ok) {
+    throw new Error(`Batch request failed: ${response.status}`)
+  }
+  const data = await response.json()
+  return data.responses
+}